@@ -11,6 +11,7 @@ from py_stringmatching.tokenizer.whitespace_tokenizer import WhitespaceTokenizer
 from py_stringmatching.similarity_measure.affine import Affine
 from py_stringmatching.similarity_measure.bag_distance import BagDistance
 from py_stringmatching.similarity_measure.cosine import Cosine
+from py_stringmatching.similarity_measure.damerau_levenshtein import DamerauLevenshtein
 from py_stringmatching.similarity_measure.dice import Dice
 from py_stringmatching.similarity_measure.editex import Editex
 from py_stringmatching.similarity_measure.generalized_jaccard import GeneralizedJaccard
@@ -25,6 +26,17 @@ from py_stringmatching.similarity_measure.overlap_coefficient import OverlapCoef
 from py_stringmatching.similarity_measure.smith_waterman import SmithWaterman
 from py_stringmatching.similarity_measure.soft_tfidf import SoftTfIdf
 from py_stringmatching.similarity_measure.soundex import Soundex
+from py_stringmatching.similarity_measure.substitution_matrix import SubstitutionMatrix
 from py_stringmatching.similarity_measure.tfidf import TfIdf
 from py_stringmatching.similarity_measure.tversky_index import TverskyIndex
 from py_stringmatching.similarity_measure.partial_ratio import PartialRatio
+
+# Import indexes
+from py_stringmatching.index.bk_tree import BKTree
+from py_stringmatching.index.jaro_winkler_index import JaroWinklerIndex
+from py_stringmatching.index.multi_index_hashing import MultiIndexHashing
+from py_stringmatching.index.pass_join import PassJoin
+from py_stringmatching.index.qgram_index import QgramIndex
+from py_stringmatching.index.smith_waterman_index import SmithWatermanIndex
+from py_stringmatching.index.symmetric_delete_index import SymmetricDeleteIndex
+from py_stringmatching.index.trie import Trie
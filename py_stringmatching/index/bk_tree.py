@@ -0,0 +1,171 @@
+"""BK-tree index"""
+
+import numpy as np
+
+from py_stringmatching import utils
+from py_stringmatching.index.index import Index
+from py_stringmatching.similarity_measure.levenshtein import Levenshtein
+
+
+class BKTree(Index):
+    """Finds the strings within a given distance of a query string with a BK-tree.
+
+    A BK-tree (Burkhard-Keller tree) stores one string per node, and the children of a node by their distance to
+    it. By the triangle inequality, a string at distance d from a node is within max_dist of the query only if
+    abs(d - dist(query, node)) <= max_dist, so all the other subtrees of the node can be skipped. The number of
+    distances computed by a query is then usually a small fraction of the number of strings, and it can be checked
+    with get_num_evaluations and get_num_saved_evaluations.
+
+    Args:
+        strings (list): Strings to index.
+        measure (SequenceSimilarityMeasure): Distance measure, whose get_raw_score is used as the distance
+                                             (defaults to Levenshtein()).
+
+    Attributes:
+        measure (SequenceSimilarityMeasure): An attribute to store the distance measure.
+
+    Note:
+        The results are exact only if the raw score of the measure is a metric, i.e. it is symmetric and satisfies
+        the triangle inequality. This is the case of Levenshtein (with equal insertion and deletion costs),
+        unrestricted DamerauLevenshtein, HammingDistance (with strings of equal length) and BagDistance. Editex
+        does not satisfy the triangle inequality in general, so some strings within max_dist may be missed with
+        it.
+
+    References:
+        * W. A. Burkhard, R. M. Keller. Some approaches to best-match file searching. 1973.
+    """
+
+    def __init__(self, strings, measure=None):
+        super(BKTree, self).__init__(strings)
+
+        self.measure = Levenshtein() if measure is None else measure
+        self._root = None
+        for position, string in enumerate(self.strings):
+            self._insert(position, string)
+        self._flatten()
+
+    def query(self, query_string, max_dist):
+        """Finds the indexed strings within max_dist of a query string.
+
+        Args:
+            query_string (str): Query string.
+            max_dist (int): Maximum distance of interest.
+
+        Returns:
+            A list of (position, distance) tuples, where position is the position of the matching string in the
+            indexed list, sorted by distance and then by position.
+
+        Raises:
+            TypeError : If the query is not a string.
+            ValueError : If max_dist is negative.
+
+        Examples:
+            >>> bk_tree = BKTree(['book', 'books', 'cake', 'boo', 'cape', 'cart'])
+            >>> bk_tree.query('bo', 2)
+            [(3, 1), (0, 2)]
+            >>> bk_tree.query('cate', 1)
+            [(2, 1), (4, 1)]
+            >>> bk_tree.query('cate', 0)
+            []
+            >>> bk_tree.get_num_saved_evaluations()
+            3
+        """
+
+        # input validations
+        utils.tok_check_for_none(query_string)
+        utils.sim_check_max_dist(max_dist)
+
+        # convert input to unicode.
+        query_string = utils.convert_to_unicode(query_string)
+
+        utils.tok_check_for_string_input(query_string)
+
+        self.num_evaluations = 0
+        matches = []
+        if len(self._node_strings) == 0:
+            return matches
+
+        # the tree is searched level by level: the measures with a compiled
+        # batch kernel score all the nodes of a level in one call, and the
+        # children to visit are selected with array operations
+        nodes = np.zeros(1, dtype=np.int64)
+        while len(nodes) > 0:
+            dists = self._get_dists(query_string, nodes, max_dist)
+            self.num_evaluations += len(nodes)
+            for node, dist in zip(nodes[dists <= max_dist].tolist(), dists[dists <= max_dist].tolist()):
+                matches.extend((position, dist) for position in self._node_positions[node])
+
+            starts = self._child_offsets[nodes]
+            counts = self._child_offsets[nodes + 1] - starts
+            edges = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            parent_dists = np.repeat(dists, counts)
+            child_dists = self._child_dists[edges]
+            nodes = self._child_nodes[edges[(parent_dists - max_dist <= child_dists) &
+                                            (child_dists <= parent_dists + max_dist)]]
+
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+    def get_measure(self):
+        """Gets the distance measure.
+
+        Returns:
+            The distance measure.
+        """
+        return self.measure
+
+    def _get_dists(self, query_string, nodes, max_dist):
+        # distances of the query to the strings of the nodes. The batch
+        # kernel of Levenshtein is bounded by the largest distance that can
+        # still lead to a child or a match, the distances over the bound
+        # being reported as bound + 1.
+        strings = [self._node_strings[node] for node in nodes.tolist()]
+        if isinstance(self.measure, Levenshtein):
+            bound = self._max_child_dists[nodes].max() + max_dist
+            if self.measure._has_unit_costs():
+                bound = int(bound)
+            return self.measure.get_raw_scores(query_string, strings, bound)
+        return np.array([self.measure.get_raw_score(query_string, string) for string in strings])
+
+    def _flatten(self):
+        # Numbers the nodes in breadth-first order, and stores their strings
+        # and positions by number, with the children of node i at
+        # _child_nodes[_child_offsets[i]:_child_offsets[i + 1]] and their
+        # distances to it in _child_dists. The children are appended to the
+        # queue while it is iterated over, after all the nodes of its level.
+        self._node_strings, self._node_positions = [], []
+        child_counts, child_nodes, child_dists = [], [], []
+        queue = [] if self._root is None else [self._root]
+        for string, positions, children in queue:
+            self._node_strings.append(string)
+            self._node_positions.append(positions)
+            child_counts.append(len(children))
+            for child_dist, child in children.items():
+                child_nodes.append(len(queue))
+                child_dists.append(child_dist)
+                queue.append(child)
+        self._child_offsets = np.concatenate(([0], np.cumsum(child_counts, dtype=np.int64))).astype(np.int64)
+        self._child_nodes = np.array(child_nodes, dtype=np.int64)
+        self._child_dists = np.array(child_dists, dtype=np.float64)
+        self._max_child_dists = np.array([max(children) if children else 0 for _, _, children in queue],
+                                         dtype=np.float64)
+
+    def _insert(self, position, string):
+        # a node is a (string, positions, children) tuple, where positions
+        # holds the positions of all the copies of the string
+        node = (string, [position], {})
+        if self._root is None:
+            self._root = node
+            return
+
+        parent = self._root
+        while True:
+            if string == parent[0]:
+                parent[1].append(position)
+                return
+            dist = self.measure.get_raw_score(string, parent[0])
+            child = parent[2].get(dist)
+            if child is None:
+                parent[2][dist] = node
+                return
+            parent = child
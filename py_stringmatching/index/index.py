@@ -0,0 +1,55 @@
+"""Index"""
+
+from py_stringmatching import utils
+
+
+class Index(object):
+    """The root class for string indexes.
+
+    An index is built once from a list of strings and then queried for the strings that are similar to a query
+    string. The strings are referred to by their position in that list.
+
+    Args:
+        strings (list): Strings to index.
+
+    Attributes:
+        strings (list): An attribute to store the indexed strings, converted to unicode.
+        num_evaluations (int): An attribute to store the number of scores computed by the last query.
+    """
+
+    def __init__(self, strings):
+        # input validations
+        utils.tok_check_for_none(strings)
+
+        self.strings = [utils.convert_to_unicode(string) for string in strings]
+
+        utils.tok_check_for_string_input(*self.strings)
+
+        self.num_evaluations = 0
+
+    def __len__(self):
+        return len(self.strings)
+
+    def get_strings(self):
+        """Gets the indexed strings.
+
+        Returns:
+            The list of indexed strings.
+        """
+        return self.strings
+
+    def get_num_evaluations(self):
+        """Gets the number of scores computed by the last query.
+
+        Returns:
+            The number of score computations (int).
+        """
+        return self.num_evaluations
+
+    def get_num_saved_evaluations(self):
+        """Gets the number of score computations the last query saved compared to a scan of all the strings.
+
+        Returns:
+            The number of saved score computations (int).
+        """
+        return len(self.strings) - self.num_evaluations
@@ -0,0 +1,217 @@
+"""Jaro-Winkler index"""
+
+from bisect import bisect_left, bisect_right
+import heapq
+
+import numpy as np
+
+from py_stringmatching import utils
+from py_stringmatching.index.index import Index
+from py_stringmatching.similarity_measure.cython.cython_jaro_winkler import jaro_winkler_batch
+
+
+class JaroWinklerIndex(Index):
+    """Finds the strings most similar to a query string under Jaro-Winkler, visiting them by prefix and length.
+
+    The strings are grouped by length and, within a length, sorted by their first 4 characters, the prefix that
+    Jaro-Winkler rewards. For a query, the strings of a length L that share exactly k prefix characters with it
+    form two slices of one sorted list, and their Jaro-Winkler similarity is bounded from their length alone:
+    with at most min(len(query), L) common characters, the Jaro score is at most
+    (min(len(query), L) / len(query) + min(len(query), L) / L + 1) / 3 (and at most 1 - 1 / (3 * L) if the lengths
+    are equal but the prefixes differ), to which the prefix bonus of k characters is added. The groups are visited
+    in decreasing order of that bound, their strings are scored with the compiled Jaro-Winkler kernel, and the
+    search stops once no remaining group can reach the threshold: min_sim for a range query, the k-th best score
+    found so far for a top-k query.
+
+    Args:
+        strings (list): Strings to index.
+        prefix_weight (float): Weight to give to the prefix (defaults to 0.1).
+
+    Attributes:
+        prefix_weight (float): An attribute to store the prefix weight.
+    """
+
+    def __init__(self, strings, prefix_weight=0.1):
+        super(JaroWinklerIndex, self).__init__(strings)
+
+        self.prefix_weight = prefix_weight
+
+        entries_by_length = {}
+        for position, string in enumerate(self.strings):
+            entries_by_length.setdefault(len(string), []).append((string[:4], position))
+
+        # for each length, the prefixes in sorted order with the strings and
+        # their positions, so that the strings sharing a prefix are a slice
+        self._buckets = {}
+        for length, entries in entries_by_length.items():
+            entries.sort()
+            self._buckets[length] = ([prefix for prefix, _ in entries],
+                                     [self.strings[position] for _, position in entries],
+                                     np.array([position for _, position in entries], dtype=np.int64))
+
+    def query(self, query_string, min_sim):
+        """Finds the indexed strings whose Jaro-Winkler similarity to a query string is at least min_sim.
+
+        Args:
+            query_string (str): Query string.
+            min_sim (float): Minimum similarity of interest.
+
+        Returns:
+            A list of (position, similarity) tuples, where position is the position of the matching string in the
+            indexed list, sorted by decreasing similarity and then by position.
+
+        Raises:
+            TypeError : If the query is not a string.
+
+        Examples:
+            >>> index = JaroWinklerIndex(['MARTHA', 'MARHTA', 'DWAYNE', 'DUANE', 'DIXON', 'DICKSONX'])
+            >>> [(position, round(sim, 4)) for position, sim in index.query('MARTH', 0.9)]
+            [(0, 0.9667), (1, 0.9144)]
+        """
+
+        # input validations
+        utils.tok_check_for_none(query_string)
+
+        # convert input to unicode.
+        query_string = utils.convert_to_unicode(query_string)
+
+        utils.tok_check_for_string_input(query_string)
+
+        self.num_evaluations = 0
+        matches = []
+        for bound, strings, positions in self._get_groups(query_string):
+            if bound < min_sim - _TOLERANCE:
+                break
+            sims = self._score(query_string, strings, min_sim)
+            selected = sims >= min_sim
+            matches.extend(zip(positions[selected].tolist(), sims[selected].tolist()))
+
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches
+
+    def top_k(self, query_string, k):
+        """Finds the k indexed strings with the highest Jaro-Winkler similarity to a query string.
+
+        Args:
+            query_string (str): Query string.
+            k (int): Number of strings to find.
+
+        Returns:
+            A list of at most k (position, similarity) tuples, where position is the position of the string in the
+            indexed list, sorted by decreasing similarity and then by position. Among strings of equal similarity,
+            the ones with the lowest positions are kept.
+
+        Raises:
+            TypeError : If the query is not a string.
+            ValueError : If k is negative.
+
+        Examples:
+            >>> index = JaroWinklerIndex(['MARTHA', 'MARHTA', 'DWAYNE', 'DUANE', 'DIXON', 'DICKSONX'])
+            >>> [(position, round(sim, 4)) for position, sim in index.top_k('DWANE', 2)]
+            [(2, 0.9611), (3, 0.88)]
+        """
+
+        # input validations
+        utils.tok_check_for_none(query_string)
+        if k < 0:
+            raise ValueError('k should be greater than or equal to zero')
+
+        # convert input to unicode.
+        query_string = utils.convert_to_unicode(query_string)
+
+        utils.tok_check_for_string_input(query_string)
+
+        self.num_evaluations = 0
+        if k == 0:
+            return []
+
+        # min-heap of the k best (similarity, -position) found so far, its
+        # root being the k-th best
+        best = []
+        for bound, strings, positions in self._get_groups(query_string):
+            min_sim = best[0][0] if len(best) == k else None
+            if min_sim is not None and bound < min_sim - _TOLERANCE:
+                break
+            sims = self._score(query_string, strings, min_sim)
+            if min_sim is not None:
+                selected = sims >= min_sim
+                positions = positions[selected]
+                sims = sims[selected]
+            for position, sim in zip(positions.tolist(), sims.tolist()):
+                if len(best) < k:
+                    heapq.heappush(best, (sim, -position))
+                elif (sim, -position) > best[0]:
+                    heapq.heapreplace(best, (sim, -position))
+
+        return [(-negated_position, sim) for sim, negated_position in sorted(best, reverse=True)]
+
+    def get_prefix_weight(self):
+        """Gets the prefix weight.
+
+        Returns:
+            The prefix weight (float).
+        """
+        return self.prefix_weight
+
+    def _get_groups(self, query_string):
+        # Yields (bound, strings, positions) for the groups of strings of the
+        # same length sharing the same number of prefix characters with the
+        # query, in decreasing order of bound. The strings of a group are only
+        # gathered when it is reached.
+        query_len = len(query_string)
+        groups = []
+        for length, (prefixes, _, _) in self._buckets.items():
+            max_prefix_len = min(4, query_len, length)
+            # slices[i] holds the strings sharing the first i characters of
+            # the query
+            slices = [_get_prefix_slice(prefixes, query_string[:prefix_len])
+                      for prefix_len in range(max_prefix_len + 1)]
+            for prefix_len in range(max_prefix_len + 1):
+                start, end = slices[prefix_len]
+                if start == end:
+                    break
+                inner_start, inner_end = slices[prefix_len + 1] if prefix_len < max_prefix_len else (end, end)
+                if inner_end - inner_start < end - start:
+                    groups.append((self._get_bound(query_len, length, prefix_len, prefix_len == max_prefix_len),
+                                   length, start, end, inner_start, inner_end))
+
+        groups.sort(key=lambda group: -group[0])
+        for bound, length, start, end, inner_start, inner_end in groups:
+            _, strings, positions = self._buckets[length]
+            yield (bound, strings[start:inner_start] + strings[inner_end:end],
+                   np.concatenate((positions[start:inner_start], positions[inner_end:end])))
+
+    def _get_bound(self, query_len, length, prefix_len, full_prefix):
+        # upper bound on the Jaro-Winkler similarity of the query and a string
+        # of the given length sharing exactly prefix_len prefix characters
+        if query_len == 0 or length == 0:
+            return 0.0
+        common_len = float(min(query_len, length))
+        jaro_bound = (common_len / query_len + common_len / length + 1) / 3
+        if query_len == length and not full_prefix:
+            # the strings differ, so they have a missing or transposed character
+            jaro_bound = min(jaro_bound, 1 - 1 / (3.0 * length))
+        prefix_bonus = prefix_len * self.prefix_weight
+        return max(jaro_bound + prefix_bonus * (1 - jaro_bound), prefix_bonus)
+
+    def _score(self, query_string, strings, min_sim):
+        self.num_evaluations += len(strings)
+        if len(query_string) == 0:
+            return np.zeros(len(strings), dtype=np.float64)
+        return jaro_winkler_batch(query_string, strings, self.prefix_weight, min_sim)
+
+
+# The similarities are computed in single precision, the bounds are compared
+# with this tolerance so that they never prune a string rounded up to the
+# threshold.
+_TOLERANCE = 1e-6
+
+_MAX_CHAR = '\U0010ffff'
+
+
+def _get_prefix_slice(prefixes, prefix):
+    # (start, end) of the sorted prefixes, of at most 4 characters, that
+    # start with prefix
+    start = bisect_left(prefixes, prefix)
+    end = bisect_right(prefixes, prefix + _MAX_CHAR * (4 - len(prefix)), start)
+    return start, end
@@ -0,0 +1,255 @@
+"""Multi-index hashing index"""
+
+import itertools
+import math
+
+import numpy as np
+
+from py_stringmatching import utils
+from py_stringmatching.index.index import Index
+from py_stringmatching.similarity_measure.hamming_distance import HammingDistance
+
+
+class MultiIndexHashing(Index):
+    """Finds the strings within a given Hamming distance of a query string with multi-index hashing.
+
+    All the indexed strings are codes of the same length, such as postcodes, identifiers or binary fingerprints.
+    Each code is split into num_substrings consecutive substrings, and each substring has its own hash table,
+    mapping its values to the positions of the codes holding them. Two codes within distance max_dist differ in at
+    most max_dist // num_substrings positions of at least one of their substrings, by the pigeonhole principle. A
+    query therefore looks up, in each table, all the values within that distance of its own substring, and the
+    codes it finds are verified with HammingDistance. The values looked up only vary a substring position with the
+    characters found at that position in the indexed codes. Their number grows exponentially with max_dist, and
+    when it exceeds the number of indexed codes, the query scans all the codes instead.
+
+    The hash tables are kept as sorted NumPy arrays, so that an index of many codes stays compact, and can be saved
+    to a file with save and loaded back with load without being built again.
+
+    Args:
+        strings (list): Strings to index, all of the same length.
+        num_substrings (int): Number of substrings each code is split into (defaults to None, which picks about
+                              one substring per log2(len(strings)) bits of information in a code, as suggested by
+                              Norouzi et al.).
+
+    Attributes:
+        num_substrings (int): An attribute to store the number of substrings.
+
+    Raises:
+        ValueError : If the strings are not all of the same length or if num_substrings is not greater than zero.
+
+    References:
+        * M. Norouzi, A. Punjani, D. J. Fleet. Fast search in Hamming space with multi-index hashing. 2012.
+    """
+
+    def __init__(self, strings, num_substrings=None):
+        super(MultiIndexHashing, self).__init__(strings)
+
+        if num_substrings is not None and num_substrings < 1:
+            raise ValueError('num_substrings should be greater than zero')
+
+        lengths = set(len(string) for string in self.strings)
+        if len(lengths) > 1:
+            raise ValueError('The strings to index should all be of the same length')
+        self._length = lengths.pop() if lengths else 0
+        self._codes = np.array(self.strings, dtype='U%d' % max(1, self._length))
+
+        if num_substrings is None:
+            num_substrings = self._get_default_num_substrings()
+        self.num_substrings = max(1, min(num_substrings, self._length))
+
+        # for each substring, its distinct values in sorted order, and the
+        # positions of the codes holding the value keys[i] at
+        # positions[offsets[i]:offsets[i + 1]]
+        self._tables = []
+        for start, end in self._get_bounds():
+            values = self._get_substrings(start, end)
+            keys, inverse = np.unique(values, return_inverse=True)
+            positions = np.argsort(inverse, kind='stable').astype(np.int64)
+            offsets = np.concatenate(([0], np.cumsum(np.bincount(inverse, minlength=len(keys))))).astype(np.int64)
+            self._tables.append((keys, offsets, positions))
+        self._set_alphabets()
+
+    def query(self, query_string, max_dist):
+        """Finds the indexed strings within Hamming distance max_dist of a query string.
+
+        Args:
+            query_string (str): Query string.
+            max_dist (int): Maximum distance of interest.
+
+        Returns:
+            A list of (position, distance) tuples, where position is the position of the matching string in the
+            indexed list, sorted by distance and then by position. It is empty if the query is not of the length of
+            the indexed strings.
+
+        Raises:
+            TypeError : If the query is not a string.
+            ValueError : If max_dist is negative.
+
+        Examples:
+            >>> index = MultiIndexHashing(['10110100', '10110111', '00001111', '10010100'], num_substrings=2)
+            >>> index.query('10110101', 1)
+            [(0, 1), (1, 1)]
+            >>> index.get_num_evaluations()
+            2
+            >>> index.query('10110101', 2)
+            [(0, 1), (1, 1), (3, 2)]
+        """
+
+        # input validations
+        utils.tok_check_for_none(query_string)
+        utils.sim_check_max_dist(max_dist)
+
+        # convert input to unicode.
+        query_string = utils.convert_to_unicode(query_string)
+
+        utils.tok_check_for_string_input(query_string)
+
+        self.num_evaluations = 0
+        if len(self.strings) == 0 or len(query_string) != self._length:
+            return []
+
+        radius = int(max_dist) // self.num_substrings
+        num_variants = sum(_count_variants(query_string[start:end], alphabets, radius)
+                           for (start, end), alphabets in zip(self._get_bounds(), self._alphabets))
+        if num_variants > len(self.strings):
+            # the number of variants grows exponentially with the radius, past
+            # the number of codes a scan of all of them is cheaper
+            candidates = np.arange(len(self.strings))
+        else:
+            candidates = self._get_candidates(query_string, radius)
+
+        self.num_evaluations = len(candidates)
+        if len(candidates) == 0:
+            return []
+        distances = HammingDistance().get_raw_scores(query_string, self._codes[candidates])
+
+        matches = [(position, dist) for position, dist in zip(candidates.tolist(), distances.tolist())
+                   if dist <= max_dist]
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+    def get_num_substrings(self):
+        """Gets the number of substrings each code is split into.
+
+        Returns:
+            The number of substrings (int).
+        """
+        return self.num_substrings
+
+    def save(self, file_path):
+        """Saves the index to a file, in the NumPy .npz format.
+
+        Args:
+            file_path (str or file): Path of the file, or file object, to write.
+
+        Returns:
+            True.
+        """
+        arrays = {'codes': self._codes, 'num_substrings': np.array(self.num_substrings)}
+        for table_id, (keys, offsets, positions) in enumerate(self._tables):
+            arrays['keys_%d' % table_id] = keys
+            arrays['offsets_%d' % table_id] = offsets
+            arrays['positions_%d' % table_id] = positions
+        np.savez(file_path, **arrays)
+        return True
+
+    @classmethod
+    def load(cls, file_path):
+        """Loads an index saved with save.
+
+        Args:
+            file_path (str or file): Path of the file, or file object, to read.
+
+        Returns:
+            The loaded index (MultiIndexHashing).
+
+        Examples:
+            >>> import io
+            >>> index = MultiIndexHashing(['10110100', '10110111', '00001111', '10010100'], num_substrings=2)
+            >>> saved = io.BytesIO()
+            >>> index.save(saved)
+            True
+            >>> _ = saved.seek(0)
+            >>> MultiIndexHashing.load(saved).query('10110101', 1)
+            [(0, 1), (1, 1)]
+        """
+        index = cls.__new__(cls)
+        with np.load(file_path, allow_pickle=False) as arrays:
+            index._codes = arrays['codes']
+            index.num_substrings = int(arrays['num_substrings'])
+            index._tables = [(arrays['keys_%d' % table_id], arrays['offsets_%d' % table_id],
+                              arrays['positions_%d' % table_id]) for table_id in range(index.num_substrings)]
+        index.strings = index._codes.tolist()
+        index.num_evaluations = 0
+        index._length = len(index.strings[0]) if index.strings else 0
+        index._set_alphabets()
+        return index
+
+    def _get_candidates(self, query_string, radius):
+        # positions of the codes that have a substring within radius of the
+        # substring of the query, found by looking up all its variants
+        found = []
+        for (start, end), (keys, offsets, positions), alphabets in zip(self._get_bounds(), self._tables,
+                                                                       self._alphabets):
+            variants = np.array(_get_variants(query_string[start:end], alphabets, radius), dtype=keys.dtype)
+            indices = np.minimum(np.searchsorted(keys, variants), len(keys) - 1)
+            indices = indices[keys[indices] == variants]
+            found.extend(positions[offsets[index]:offsets[index + 1]] for index in indices.tolist())
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def _get_default_num_substrings(self):
+        # log2(len(strings)) bits per substring, the characters of a code
+        # carrying log2 of the size of their alphabet
+        if len(self.strings) < 2 or self._length == 0:
+            return 1
+        alphabet_size = len(np.unique(self._codes.view(np.uint32)))
+        bits = self._length * math.log(max(2, alphabet_size), 2)
+        return int(round(bits / math.log(len(self.strings), 2)))
+
+    def _get_bounds(self):
+        # start and end of each substring, their lengths differing by at most one
+        return [(self._length * i // self.num_substrings, self._length * (i + 1) // self.num_substrings)
+                for i in range(self.num_substrings)]
+
+    def _get_substrings(self, start, end):
+        # the substrings of all the codes, as a fixed-width NumPy array
+        if start == end:
+            return np.zeros(len(self._codes), dtype='U1')
+        codes = self._codes.view(np.uint32).reshape(len(self._codes), -1)
+        return np.ascontiguousarray(codes[:, start:end]).view('U%d' % (end - start)).reshape(-1)
+
+    def _set_alphabets(self):
+        # the characters found at each position of each substring
+        self._alphabets = []
+        for (start, end), (keys, _, _) in zip(self._get_bounds(), self._tables):
+            chars = keys.view(np.uint32).reshape(len(keys), keys.dtype.itemsize // 4)
+            self._alphabets.append([[chr(code) for code in np.unique(chars[:, i]).tolist()]
+                                    for i in range(end - start)])
+
+
+def _count_variants(substring, alphabets, radius):
+    # number of variants _get_variants would generate, counted[k] being the
+    # number of those with k changes among the positions seen so far
+    counts = [1] + [0] * radius
+    for i, char in enumerate(substring):
+        num_choices = len(alphabets[i]) - (char in alphabets[i])
+        for num_changes in range(radius, 0, -1):
+            counts[num_changes] += counts[num_changes - 1] * num_choices
+    return sum(counts)
+
+
+def _get_variants(substring, alphabets, radius):
+    # all the strings made of the characters of alphabets that differ from
+    # substring in at most radius positions
+    variants = []
+    for num_changes in range(min(radius, len(substring)) + 1):
+        for changed in itertools.combinations(range(len(substring)), num_changes):
+            choices = [[char for char in alphabets[i] if char != substring[i]] for i in changed]
+            for chars in itertools.product(*choices):
+                variant = list(substring)
+                for i, char in zip(changed, chars):
+                    variant[i] = char
+                variants.append(''.join(variant))
+    return variants
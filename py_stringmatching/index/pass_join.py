@@ -0,0 +1,206 @@
+"""Pass-Join index"""
+
+from py_stringmatching import utils
+from py_stringmatching.index.index import Index
+from py_stringmatching.similarity_measure.cython.cython_levenshtein import levenshtein_batch
+
+
+class PassJoin(Index):
+    """Finds the pairs of strings within a given Levenshtein distance with the Pass-Join partition scheme.
+
+    Each indexed string is split into max_dist + 1 segments. Since max_dist edits can touch at most max_dist of
+    them, a string within max_dist of another one contains one of its segments unchanged, close to its original
+    position. The segments are indexed by string length, segment number and content, and the candidates of a
+    probe string are found by looking up a few of its substrings (chosen with the multi-match-aware method).
+    The candidates are verified with the compiled Levenshtein kernel, bounded by max_dist.
+
+    The index supports a self-join of the indexed strings, a join with another list of strings, and single
+    queries. The joins are generators, so that the result pairs are streamed as they are found.
+
+    Args:
+        strings (list): Strings to index.
+        max_dist (int): Maximum distance of interest.
+
+    Attributes:
+        max_dist (int): An attribute to store the maximum distance of interest.
+
+    References:
+        * G. Li, D. Deng, J. Wang, J. Feng. Pass-Join: A partition-based method for similarity joins. VLDB 2011.
+    """
+
+    def __init__(self, strings, max_dist):
+        super(PassJoin, self).__init__(strings)
+
+        utils.sim_check_max_dist(max_dist)
+        self.max_dist = max_dist
+        self._num_pairs = len(self.strings)
+
+        # Strings with at most max_dist characters can not be split into
+        # max_dist + 1 non-empty segments, they are kept by length and are
+        # candidates for every probe string of a close enough length.
+        self._short_strings = {}
+        self._segments = {}
+        for position, string in enumerate(self.strings):
+            string_len = len(string)
+            if string_len <= max_dist:
+                self._short_strings.setdefault(string_len, []).append(position)
+                continue
+            segments = self._segments.get(string_len)
+            if segments is None:
+                segments = self._segments[string_len] = [{} for _ in range(max_dist + 1)]
+            for segment_index, (start, segment_len) in enumerate(self._get_partition(string_len)):
+                segments[segment_index].setdefault(string[start:start + segment_len], []).append(position)
+
+    def self_join(self):
+        """Finds the pairs of indexed strings within max_dist of each other.
+
+        Returns:
+            A generator of (position1, position2, distance) tuples, with position1 < position2, one per pair.
+
+        Examples:
+            >>> pass_join = PassJoin(['book', 'books', 'cake', 'boo', 'cape', 'cart'], 1)
+            >>> sorted(pass_join.self_join())
+            [(0, 1, 1), (0, 3, 1), (2, 4, 1)]
+        """
+        self.num_evaluations = 0
+        self._num_pairs = len(self.strings) * (len(self.strings) - 1) // 2
+        for position, string in enumerate(self.strings):
+            # Each pair is found from its longer string, or from its later
+            # string if both have the same length.
+            for other_position, dist in self._probe(string, len(string) - self.max_dist, len(string),
+                                                    position):
+                yield (other_position, position, dist) if other_position < position else \
+                    (position, other_position, dist)
+
+    def join(self, strings):
+        """Finds the pairs made of an indexed string and a given string that are within max_dist of each other.
+
+        Args:
+            strings (list): Strings to join with the indexed strings.
+
+        Returns:
+            A generator of (position1, position2, distance) tuples, where position1 is the position of a string in
+            the indexed list and position2 the position of a string in the given list.
+
+        Raises:
+            TypeError : If one of the given strings is not a string.
+
+        Examples:
+            >>> pass_join = PassJoin(['book', 'cake'], 1)
+            >>> list(pass_join.join(['books', 'bake', 'cape']))
+            [(0, 0, 1), (1, 1, 1), (1, 2, 1)]
+        """
+        utils.tok_check_for_none(strings)
+
+        self.num_evaluations = 0
+        self._num_pairs = 0
+        for other_position, string in enumerate(strings):
+            string = utils.convert_to_unicode(string)
+            utils.tok_check_for_string_input(string)
+
+            self._num_pairs += len(self.strings)
+            for position, dist in self._probe(string, len(string) - self.max_dist, len(string) + self.max_dist):
+                yield position, other_position, dist
+
+    def query(self, query_string):
+        """Finds the indexed strings within max_dist of a query string.
+
+        Args:
+            query_string (str): Query string.
+
+        Returns:
+            A list of (position, distance) tuples, where position is the position of the matching string in the
+            indexed list, sorted by distance and then by position.
+
+        Raises:
+            TypeError : If the query is not a string.
+
+        Examples:
+            >>> pass_join = PassJoin(['book', 'books', 'cake', 'boo', 'cape', 'cart'], 2)
+            >>> pass_join.query('bo')
+            [(3, 1), (0, 2)]
+        """
+
+        # input validations
+        utils.tok_check_for_none(query_string)
+
+        # convert input to unicode.
+        query_string = utils.convert_to_unicode(query_string)
+
+        utils.tok_check_for_string_input(query_string)
+
+        self.num_evaluations = 0
+        self._num_pairs = len(self.strings)
+        matches = list(self._probe(query_string, len(query_string) - self.max_dist,
+                                   len(query_string) + self.max_dist))
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+    def get_max_dist(self):
+        """Gets the maximum distance of interest.
+
+        Returns:
+            The max_dist of the index (int).
+        """
+        return self.max_dist
+
+    def get_num_saved_evaluations(self):
+        """Gets the number of score computations the last query or join saved compared to scoring all the pairs.
+
+        Returns:
+            The number of saved score computations (int).
+        """
+        return self._num_pairs - self.num_evaluations
+
+    def _get_partition(self, string_len):
+        # (start, length) of the max_dist + 1 segments of a string, the
+        # last string_len % (max_dist + 1) segments being one character longer
+        num_segments = self.max_dist + 1
+        segment_len = string_len // num_segments
+        num_short_segments = num_segments - string_len % num_segments
+        partition = []
+        start = 0
+        for segment_index in range(num_segments):
+            length = segment_len if segment_index < num_short_segments else segment_len + 1
+            partition.append((start, length))
+            start += length
+        return partition
+
+    def _probe(self, string, min_len, max_len, position=None):
+        # Yields the (position, distance) of the indexed strings whose
+        # length is in [min_len, max_len] and which are within max_dist of
+        # string. If position is given, the strings of the same length are
+        # only considered up to that position.
+        string_len = len(string)
+        candidates = set()
+        for other_len in range(max(min_len, 0), max_len + 1):
+            short_strings = self._short_strings.get(other_len)
+            if short_strings is not None:
+                candidates.update(short_strings)
+
+            segments = self._segments.get(other_len)
+            if segments is None:
+                continue
+            len_diff = string_len - other_len
+            for segment_index, (start, segment_len) in enumerate(self._get_partition(other_len)):
+                # multi-match-aware substring selection
+                low = max(start - segment_index, start + len_diff - (self.max_dist - segment_index), 0)
+                high = min(start + segment_index, start + len_diff + (self.max_dist - segment_index),
+                           string_len - segment_len)
+                index = segments[segment_index]
+                for substring_start in range(low, high + 1):
+                    positions = index.get(string[substring_start:substring_start + segment_len])
+                    if positions is not None:
+                        candidates.update(positions)
+
+        candidates = sorted(candidates)
+        if position is not None:
+            candidates = [candidate for candidate in candidates
+                          if len(self.strings[candidate]) < string_len or candidate < position]
+
+        self.num_evaluations += len(candidates)
+        distances = levenshtein_batch(string, [self.strings[candidate] for candidate in candidates],
+                                      self.max_dist)
+        for candidate, dist in zip(candidates, distances):
+            if dist <= self.max_dist:
+                yield candidate, int(dist)
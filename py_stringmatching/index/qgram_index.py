@@ -0,0 +1,159 @@
+"""Q-gram index"""
+
+import numpy as np
+
+from py_stringmatching import utils
+from py_stringmatching.index.index import Index
+from py_stringmatching.similarity_measure.cython.cython_levenshtein import levenshtein_batch
+from py_stringmatching.tokenizer.qgram_tokenizer import QgramTokenizer
+
+
+class QgramIndex(Index):
+    """Finds the strings within a given Levenshtein distance of a query string with positional q-gram filters.
+
+    The strings are split into q-grams with a QgramTokenizer, and an inverted list of the (string, position)
+    occurrences of each q-gram is built, sorted by string length. Since an edit operation destroys at most q
+    q-grams and shifts the others by at most one position, a string t within distance k of the query s must
+    satisfy the following filters:
+
+    * Length filter: abs(len(s) - len(t)) <= k.
+    * Position filter: only the common q-grams whose positions differ by at most k are counted.
+    * Count filter: s and t share at least max(G(s), G(t)) - k * q q-grams, where G is the number of q-grams of a
+      string (len(s) - q + 1 without padding).
+
+    The candidates passing all the filters are verified with the compiled Levenshtein kernel. Unlike the tree
+    based indexes, the work per query depends on the q-grams of the query rather than on the edit distance DP, so
+    this index handles long strings well.
+
+    Args:
+        strings (list): Strings to index.
+        qval (int): Length of the q-grams (defaults to 2).
+        padding (boolean): A flag to indicate whether the strings should be padded before being split into
+                           q-grams (defaults to True).
+
+    References:
+        * L. Gravano, P. G. Ipeirotis, H. V. Jagadish, N. Koudas, S. Muthukrishnan, D. Srivastava. Approximate
+          string joins in a database (almost) for free. VLDB 2001.
+    """
+
+    def __init__(self, strings, qval=2, padding=True):
+        super(QgramIndex, self).__init__(strings)
+
+        self._tokenizer = QgramTokenizer(qval=qval, padding=padding)
+        self._lengths = np.array([len(string) for string in self.strings], dtype=np.int64)
+
+        postings = {}
+        self._positions_by_length = {}
+        for position, string in enumerate(self.strings):
+            self._positions_by_length.setdefault(len(string), []).append(position)
+            for qgram_position, qgram in enumerate(self._tokenizer.tokenize(string)):
+                postings.setdefault(qgram, []).append((len(string), position, qgram_position))
+
+        # each inverted list is kept as three arrays sorted by string length,
+        # so that the length filter is a slice of the list
+        self._inverted_lists = {}
+        for qgram, occurrences in postings.items():
+            occurrences.sort()
+            self._inverted_lists[qgram] = tuple(np.array(values, dtype=np.int64) for values in zip(*occurrences))
+        self._positions_by_length = dict((length, np.array(positions, dtype=np.int64))
+                                         for length, positions in self._positions_by_length.items())
+
+    def query(self, query_string, max_dist):
+        """Finds the indexed strings within max_dist of a query string.
+
+        Args:
+            query_string (str): Query string.
+            max_dist (int): Maximum distance of interest.
+
+        Returns:
+            A list of (position, distance) tuples, where position is the position of the matching string in the
+            indexed list, sorted by distance and then by position.
+
+        Raises:
+            TypeError : If the query is not a string.
+            ValueError : If max_dist is negative.
+
+        Examples:
+            >>> index = QgramIndex(['book', 'books', 'cake', 'boo', 'cape', 'cart'])
+            >>> index.query('bo', 2)
+            [(3, 1), (0, 2)]
+            >>> index.query('cate', 1)
+            [(2, 1), (4, 1)]
+        """
+
+        # input validations
+        utils.tok_check_for_none(query_string)
+        utils.sim_check_max_dist(max_dist)
+
+        # convert input to unicode.
+        query_string = utils.convert_to_unicode(query_string)
+
+        utils.tok_check_for_string_input(query_string)
+
+        qval = self._tokenizer.get_qval()
+        query_len = len(query_string)
+        min_len = query_len - max_dist
+        max_len = query_len + max_dist
+        qgrams = self._tokenizer.tokenize(query_string)
+
+        # common q-grams, under the length and position filters
+        common_positions = []
+        for qgram_position, qgram in enumerate(qgrams):
+            inverted_list = self._inverted_lists.get(qgram)
+            if inverted_list is None:
+                continue
+            lengths, positions, qgram_positions = inverted_list
+            start = np.searchsorted(lengths, min_len, side='left')
+            end = np.searchsorted(lengths, max_len, side='right')
+            if start == end:
+                continue
+            close = np.abs(qgram_positions[start:end] - qgram_position) <= max_dist
+            common_positions.append(positions[start:end][close])
+
+        # count filter
+        candidates = []
+        if common_positions:
+            positions, counts = np.unique(np.concatenate(common_positions), return_counts=True)
+            min_counts = (np.maximum(len(qgrams), self._get_num_qgrams(self._lengths[positions])) -
+                          max_dist * qval)
+            candidates.append(positions[counts >= min_counts])
+
+        # the count filter can not discard the strings that are short enough
+        # to share no q-gram with the query
+        for length in range(max(min_len, 0), max_len + 1):
+            if (length in self._positions_by_length and
+                    max(len(qgrams), self._get_num_qgrams(length)) <= max_dist * qval):
+                candidates.append(self._positions_by_length[length])
+
+        candidates = np.unique(np.concatenate(candidates)) if candidates else []
+        self.num_evaluations = len(candidates)
+        distances = levenshtein_batch(query_string, [self.strings[candidate] for candidate in candidates],
+                                      max_dist)
+
+        matches = [(int(candidate), int(dist)) for candidate, dist in zip(candidates, distances)
+                   if dist <= max_dist]
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+    def get_qval(self):
+        """Gets the length of the q-grams.
+
+        Returns:
+            The length of the q-grams (int).
+        """
+        return self._tokenizer.get_qval()
+
+    def get_padding(self):
+        """Gets the value of the padding flag.
+
+        Returns:
+            The Boolean value of the padding flag.
+        """
+        return self._tokenizer.get_padding()
+
+    def _get_num_qgrams(self, length):
+        # number of q-grams of a string of the given length (or array of lengths)
+        qval = self._tokenizer.get_qval()
+        if self._tokenizer.get_padding():
+            return length + qval - 1
+        return np.maximum(length - qval + 1, 0)
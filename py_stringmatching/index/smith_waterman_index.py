@@ -0,0 +1,190 @@
+"""Smith-Waterman index"""
+
+import numpy as np
+
+from py_stringmatching import utils
+from py_stringmatching.index.index import Index
+from py_stringmatching.similarity_measure.cython.cython_smith_waterman import smith_waterman_banded
+from py_stringmatching.similarity_measure.cython.cython_utils import cython_sim_ident
+
+
+class SmithWatermanIndex(Index):
+    """Finds the best local alignments of a query string in long indexed strings, with seed-and-extend.
+
+    The k-mers (substrings of k characters) of the indexed strings are stored once in inverted lists with their
+    offsets. For a query, the k-mers it shares exactly with an indexed string are the seeds: a seed found at offset i
+    of the query and offset j of the string lies on the diagonal j - i of their dynamic programming matrix. The
+    diagonals of the seeds of a string are merged into clusters when their bands overlap, and the Smith-Waterman
+    dynamic programming is only computed, by a compiled kernel, on the cells within band diagonals of a cluster, in
+    the window of the string it covers. The indexed strings without any seed are not scored at all.
+
+    This is a heuristic, as in BLAST: an alignment is found if it contains at least one seed and stays within band
+    diagonals of the seeds, and it then scores as in SmithWaterman. The alignments without k identical consecutive
+    characters in common with the query, or drifting further from their seeds by insertions and deletions, are
+    missed.
+
+    Args:
+        strings (list): Strings to index.
+        k (int): Length of the seeds (defaults to 8).
+        band (int): Number of diagonals computed on each side of the diagonals of the seeds (defaults to 8).
+        gap_cost (float): Cost of gap (defaults to 1.0).
+        sim_func (function or SubstitutionMatrix): Similarity function to give a score for the correspondence between
+                             the characters (defaults to an identity function, which returns 1 if the two characters
+                             are the same and 0 otherwise).
+
+    Attributes:
+        k (int): An attribute to store the length of the seeds.
+        band (int): An attribute to store the number of diagonals on each side of the seeds.
+        gap_cost (float): An attribute to store the gap cost.
+        sim_func (function): An attribute to store the similarity function.
+
+    Raises:
+        ValueError : If k is not greater than zero or if band is negative.
+    """
+
+    def __init__(self, strings, k=8, band=8, gap_cost=1.0, sim_func=cython_sim_ident):
+        super(SmithWatermanIndex, self).__init__(strings)
+
+        if k < 1:
+            raise ValueError('k should be greater than zero')
+        utils.sim_check_band(band, None)
+
+        self.k = k
+        self.band = band
+        self.gap_cost = gap_cost
+        self.sim_func = sim_func
+
+        postings = {}
+        for position, string in enumerate(self.strings):
+            for offset in range(len(string) - k + 1):
+                postings.setdefault(string[offset:offset + k], []).append((position, offset))
+
+        # for each k-mer, the positions of the strings holding it and its
+        # offsets in them
+        self._postings = {}
+        for kmer, entries in postings.items():
+            entries = np.array(entries, dtype=np.int64)
+            self._postings[kmer] = (entries[:, 0], entries[:, 1])
+
+    def query(self, query_string, min_score=None):
+        """Finds the best local alignment of a query string in each indexed string sharing a seed with it.
+
+        Args:
+            query_string (str): Query string.
+            min_score (float): Minimum score of interest. If it is given, the strings whose best alignment scores
+                               less are left out (defaults to None).
+
+        Returns:
+            A list of (position, score, end) tuples, where position is the position of the matching string in the
+            indexed list, score is the Smith-Waterman score of its best local alignment with the query, and end is
+            the offset in the string just after the last character of that alignment. If several alignments have the
+            best score, the one ending first is reported. The list is sorted by decreasing score and then by position.
+
+        Raises:
+            TypeError : If the query is not a string.
+
+        Examples:
+            >>> index = SmithWatermanIndex(['the quick brown fox jumps over the lazy dog', 'a lazy cat'], k=4)
+            >>> index.query('jumped over')
+            [(0, 8.0, 30)]
+            >>> index.query('the lazy')
+            [(0, 8.0, 39), (1, 5.0, 6)]
+        """
+
+        # input validations
+        utils.tok_check_for_none(query_string)
+
+        # convert input to unicode.
+        query_string = utils.convert_to_unicode(query_string)
+
+        utils.tok_check_for_string_input(query_string)
+
+        self.num_evaluations = 0
+        matches = []
+        for position, clusters in self._get_clusters(query_string):
+            self.num_evaluations += 1
+            best_score, best_end = 0.0, 0
+            for first_diagonal, last_diagonal in clusters:
+                score, end = self._extend(query_string, self.strings[position], first_diagonal, last_diagonal)
+                if score > best_score or (score == best_score and end < best_end):
+                    best_score, best_end = score, end
+            if min_score is None or best_score >= min_score:
+                matches.append((position, best_score, best_end))
+
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches
+
+    def get_k(self):
+        """Gets the length of the seeds.
+
+        Returns:
+            The length of the seeds (int).
+        """
+        return self.k
+
+    def get_band(self):
+        """Gets the number of diagonals computed on each side of the seeds.
+
+        Returns:
+            The band (int).
+        """
+        return self.band
+
+    def get_gap_cost(self):
+        """Gets the gap cost.
+
+        Returns:
+            The gap cost (float).
+        """
+        return self.gap_cost
+
+    def get_sim_func(self):
+        """Gets the similarity function.
+
+        Returns:
+            The similarity function (function).
+        """
+        return self.sim_func
+
+    def _get_clusters(self, query_string):
+        # Yields (position, clusters) for the indexed strings sharing a seed
+        # with the query, in order of position, where clusters is the list of
+        # (first_diagonal, last_diagonal) ranges of the merged seed diagonals.
+        positions, diagonals = [], []
+        for offset in range(len(query_string) - self.k + 1):
+            entries = self._postings.get(query_string[offset:offset + self.k])
+            if entries is not None:
+                positions.append(entries[0])
+                diagonals.append(entries[1] - offset)
+        if len(positions) == 0:
+            return
+
+        seeds = np.unique(np.stack((np.concatenate(positions), np.concatenate(diagonals)), axis=1), axis=0)
+        # the bands of two diagonals overlap or touch when they are at most
+        # 2 * band + 1 apart
+        breaks = np.flatnonzero((seeds[1:, 0] != seeds[:-1, 0]) |
+                                (seeds[1:, 1] - seeds[:-1, 1] > 2 * self.band + 1)) + 1
+        starts = np.concatenate(([0], breaks))
+        ends = np.concatenate((breaks, [len(seeds)])) - 1
+
+        current_position, clusters = None, []
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            position = int(seeds[start, 0])
+            if position != current_position:
+                if clusters:
+                    yield current_position, clusters
+                current_position, clusters = position, []
+            clusters.append((int(seeds[start, 1]), int(seeds[end, 1])))
+        yield current_position, clusters
+
+    def _extend(self, query_string, string, first_diagonal, last_diagonal):
+        # Smith-Waterman score of the query and the window of the string
+        # covered by the band around the diagonals, with the offset of the end
+        # of the best alignment in the string
+        diag_lo = first_diagonal - self.band
+        diag_hi = last_diagonal + self.band
+        window_start = max(0, diag_lo)
+        window_end = min(len(string), diag_hi + len(query_string))
+        score, _, end = smith_waterman_banded(query_string, string[window_start:window_end], self.gap_cost,
+                                              self.sim_func, diag_lo - window_start, diag_hi - window_start)
+        return score, window_start + end
@@ -0,0 +1,131 @@
+"""Symmetric delete index"""
+
+from py_stringmatching import utils
+from py_stringmatching.index.index import Index
+from py_stringmatching.similarity_measure.cython.cython_levenshtein import levenshtein_batch
+
+
+class SymmetricDeleteIndex(Index):
+    """Finds the strings within a small Levenshtein distance of a query string with the symmetric delete method.
+
+    Two strings are within Levenshtein distance k only if deleting at most k characters from each of them yields a
+    common string. The index maps every string obtained by deleting up to max_dist characters from an indexed
+    string to that string. A query generates the deletes of the query string, looks them up, and verifies the
+    strings it finds with the compiled Levenshtein kernel. A query is thus mostly a few hash lookups, at the cost
+    of an index whose size grows quickly with max_dist and the length of the strings, so it is meant for small
+    distances (1 or 2).
+
+    Args:
+        strings (list): Strings to index.
+        max_dist (int): Largest distance that can be queried (defaults to 2).
+
+    Attributes:
+        max_dist (int): An attribute to store the largest distance that can be queried.
+
+    References:
+        * W. Garbe. SymSpell: 1 million times faster spelling correction through symmetric delete. 2012.
+    """
+
+    def __init__(self, strings, max_dist=2):
+        super(SymmetricDeleteIndex, self).__init__(strings)
+
+        utils.sim_check_max_dist(max_dist)
+        self.max_dist = max_dist
+
+        # the deletes are generated once per distinct string
+        self._terms = []
+        self._positions = []
+        term_ids = {}
+        for position, string in enumerate(self.strings):
+            term_id = term_ids.get(string)
+            if term_id is None:
+                term_id = term_ids[string] = len(self._terms)
+                self._terms.append(string)
+                self._positions.append([])
+            self._positions[term_id].append(position)
+
+        self._deletes = {}
+        for term_id, term in enumerate(self._terms):
+            for variant in _get_deletes(term, max_dist):
+                term_ids = self._deletes.get(variant)
+                if term_ids is None:
+                    self._deletes[variant] = [term_id]
+                else:
+                    term_ids.append(term_id)
+
+    def query(self, query_string, max_dist=None):
+        """Finds the indexed strings within max_dist of a query string.
+
+        Args:
+            query_string (str): Query string.
+            max_dist (int): Maximum distance of interest (defaults to None, which means the max_dist of the index).
+
+        Returns:
+            A list of (position, distance) tuples, where position is the position of the matching string in the
+            indexed list, sorted by distance and then by position.
+
+        Raises:
+            TypeError : If the query is not a string.
+            ValueError : If max_dist is negative or larger than the max_dist of the index.
+
+        Examples:
+            >>> index = SymmetricDeleteIndex(['book', 'books', 'cake', 'boo', 'cape', 'cart'])
+            >>> index.query('bo')
+            [(3, 1), (0, 2)]
+            >>> index.query('cate', 1)
+            [(2, 1), (4, 1)]
+        """
+
+        # input validations
+        utils.tok_check_for_none(query_string)
+        utils.sim_check_max_dist(max_dist)
+
+        if max_dist is None:
+            max_dist = self.max_dist
+        elif max_dist > self.max_dist:
+            raise ValueError('max_dist should be less than or equal to the max_dist of the index')
+
+        # convert input to unicode.
+        query_string = utils.convert_to_unicode(query_string)
+
+        utils.tok_check_for_string_input(query_string)
+
+        candidate_ids = set()
+        for variant in _get_deletes(query_string, max_dist):
+            term_ids = self._deletes.get(variant)
+            if term_ids is not None:
+                candidate_ids.update(term_ids)
+
+        # the deletes of an indexed string may go deeper than max_dist,
+        # so the candidates are filtered by length before being verified
+        query_len = len(query_string)
+        candidate_ids = [term_id for term_id in candidate_ids
+                         if abs(len(self._terms[term_id]) - query_len) <= max_dist]
+        self.num_evaluations = len(candidate_ids)
+        distances = levenshtein_batch(query_string, [self._terms[term_id] for term_id in candidate_ids], max_dist)
+
+        matches = []
+        for term_id, dist in zip(candidate_ids, distances):
+            if dist <= max_dist:
+                matches.extend((position, int(dist)) for position in self._positions[term_id])
+
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+    def get_max_dist(self):
+        """Gets the largest distance that can be queried.
+
+        Returns:
+            The max_dist of the index (int).
+        """
+        return self.max_dist
+
+
+def _get_deletes(string, max_dist):
+    # all the distinct strings obtained by deleting up to max_dist characters
+    deletes = {string}
+    level = deletes
+    for _ in range(min(max_dist, len(string))):
+        level = {variant[:i] + variant[i + 1:] for variant in level for i in range(len(variant))}
+        deletes |= level
+    return deletes
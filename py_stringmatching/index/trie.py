@@ -0,0 +1,120 @@
+"""Trie index"""
+
+import numpy as np
+
+from py_stringmatching import utils
+from py_stringmatching.index.index import Index
+from py_stringmatching.similarity_measure.cython.cython_trie import trie_levenshtein_search
+
+
+class Trie(Index):
+    """Finds the strings within a given Levenshtein distance of a query string by searching a trie.
+
+    The distinct strings are stored in a trie, where the strings sharing a prefix share the nodes of that prefix,
+    so that the index stays small on collections with many common prefixes. The trie is kept as flat arrays of
+    nodes in preorder. A query walks the trie and computes one row of the Levenshtein dynamic programming matrix
+    per node, from the row of its parent, so the rows of a common prefix are computed only once. A subtree is
+    skipped as soon as the minimum of the row of its root exceeds max_dist, since then no string below it can be
+    within max_dist of the query.
+
+    Args:
+        strings (list): Strings to index.
+
+    References:
+        * K. U. Schulz, S. Mihov. Fast string correction with Levenshtein automata. 2002.
+    """
+
+    def __init__(self, strings):
+        super(Trie, self).__init__(strings)
+
+        self._positions = {}
+        for position, string in enumerate(self.strings):
+            self._positions.setdefault(string, []).append(position)
+        self._terms = sorted(self._positions)
+
+        # In sorted order, the strings sharing a prefix are contiguous, so
+        # the nodes are created in preorder: each string only adds the nodes
+        # that follow its longest common prefix with the previous string.
+        labels = [0]
+        depths = [0]
+        ends = [0]
+        terms = [-1]
+        path = [0]
+        previous = ''
+        for term_id, term in enumerate(self._terms):
+            common_len = 0
+            max_common_len = min(len(term), len(previous))
+            while common_len < max_common_len and term[common_len] == previous[common_len]:
+                common_len += 1
+            for node in path[common_len + 1:]:
+                ends[node] = len(labels)
+            del path[common_len + 1:]
+            for char in term[common_len:]:
+                path.append(len(labels))
+                labels.append(ord(char))
+                depths.append(len(path) - 1)
+                ends.append(0)
+                terms.append(-1)
+            terms[path[-1]] = term_id
+            previous = term
+        for node in path:
+            ends[node] = len(labels)
+
+        self._labels = np.array(labels, dtype=np.uint32)
+        self._depths = np.array(depths, dtype=np.int32)
+        self._ends = np.array(ends, dtype=np.int32)
+        self._node_terms = np.array(terms, dtype=np.int32)
+        self._max_depth = max(depths)
+
+    def query(self, query_string, max_dist):
+        """Finds the indexed strings within max_dist of a query string.
+
+        Args:
+            query_string (str): Query string.
+            max_dist (int): Maximum distance of interest.
+
+        Returns:
+            A list of (position, distance) tuples, where position is the position of the matching string in the
+            indexed list, sorted by distance and then by position.
+
+        Raises:
+            TypeError : If the query is not a string.
+            ValueError : If max_dist is negative.
+
+        Examples:
+            >>> trie = Trie(['book', 'books', 'cake', 'boo', 'cape', 'cart'])
+            >>> trie.query('bo', 2)
+            [(3, 1), (0, 2)]
+            >>> trie.query('cate', 1)
+            [(2, 1), (4, 1)]
+            >>> trie.get_num_nodes()
+            14
+        """
+
+        # input validations
+        utils.tok_check_for_none(query_string)
+        utils.sim_check_max_dist(max_dist)
+
+        # convert input to unicode.
+        query_string = utils.convert_to_unicode(query_string)
+
+        utils.tok_check_for_string_input(query_string)
+
+        term_matches, self.num_evaluations = trie_levenshtein_search(
+            self._labels, self._depths, self._ends, self._node_terms, self._max_depth, query_string,
+            min(max_dist, len(query_string) + self._max_depth))
+
+        matches = []
+        for term_id, dist in term_matches:
+            matches.extend((position, dist) for position in self._positions[self._terms[term_id]])
+
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+    def get_num_nodes(self):
+        """Gets the number of nodes of the trie, including its root.
+
+        Returns:
+            The number of nodes (int).
+        """
+        return len(self._labels)
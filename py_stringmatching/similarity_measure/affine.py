@@ -3,7 +3,7 @@ from py_stringmatching import utils
 from six.moves import xrange
 from py_stringmatching.similarity_measure.sequence_similarity_measure import \
                                                     SequenceSimilarityMeasure
-from py_stringmatching.similarity_measure.cython.cython_affine import affine
+from py_stringmatching.similarity_measure.cython.cython_affine import affine, affine_banded
 from py_stringmatching.similarity_measure.cython.cython_utils import cython_sim_ident
 
 class Affine(SequenceSimilarityMeasure):
@@ -15,8 +15,13 @@ class Affine(SequenceSimilarityMeasure):
     Args:
         gap_start (float): Cost for the gap at the start (defaults to 1).
         gap_continuation (float): Cost for the gap continuation (defaults to 0.5).
-        sim_func (function): Function computing similarity score between two characters, which are represented as strings (defaults
-                             to an identity function, which returns 1 if the two characters are the same and returns 0 otherwise). 
+        sim_func (function or SubstitutionMatrix): Function computing similarity score between two characters,
+                                                   which are represented as strings (defaults to an identity function,
+                                                   which returns 1 if the two characters are the same and returns 0
+                                                   otherwise). A function is called once per distinct pair of
+                                                   characters of the two strings, while the scores of a
+                                                   SubstitutionMatrix are read from the three DP matrices without
+                                                   any Python call.
 
     Attributes:
         gap_start (float): An attribute to store the gap cost at the start.
@@ -30,14 +35,17 @@ class Affine(SequenceSimilarityMeasure):
         self.sim_func = sim_func
         super(Affine, self).__init__()
 
-    def get_raw_score(self, string1, string2):
+    def get_raw_score(self, string1, string2, min_score=None):
         """Computes the affine gap score between two strings. This score can be outside the range [0,1].
         
         Args:
             string1,string2 (str) : Input strings.
+            min_score (float): Minimum score of interest (defaults to None). If given, the computation stops as soon as
+                               no alignment can reach min_score, given the best score of a pair of characters, and
+                               -inf is returned for the scores below min_score.
 
         Returns:
-            Affine gap score betwen the two input strings (float).
+            Affine gap score betwen the two input strings (float), or -inf if it is below min_score.
 
         Raises:
             TypeError : If the inputs are not strings or if one of the inputs is None.
@@ -46,6 +54,8 @@ class Affine(SequenceSimilarityMeasure):
             >>> aff = Affine()
             >>> aff.get_raw_score('dva', 'deeva')
             1.5
+            >>> aff.get_raw_score('dva', 'deeva', min_score=2)
+            -inf
             >>> aff = Affine(gap_start=2, gap_continuation=0.5)
             >>> aff.get_raw_score('dva', 'deeve')
             -0.5
@@ -64,9 +74,61 @@ class Affine(SequenceSimilarityMeasure):
 
         # if one of the strings is empty return 0
         if utils.sim_check_for_empty(string1, string2):
-            return 0
+            return 0 if min_score is None or min_score <= 0 else float('-inf')
 
-        return affine(string1, string2, self.gap_start, self.gap_continuation, self.sim_func)
+        return affine(string1, string2, self.gap_start, self.gap_continuation, self.sim_func, min_score)
+
+    def get_banded_raw_score(self, string1, string2, band=None, min_score=None):
+        """Computes the affine gap score between two strings over a band around the diagonal of the DP matrices.
+
+        For strings of similar lengths, the best alignment rarely strays far from the diagonal. Only the cells (i, j)
+        with min(0, d) - band <= j - i <= max(0, d) + band, where d = len(string2) - len(string1), are computed, that
+        is O(len(string1) * band) cells instead of len(string1) * len(string2). An alignment leaving the band needs at
+        least abs(d) + 2 * (band + 1) gap characters, which bounds its score given the gap costs and the best score of
+        a pair of characters. If the score within the band reaches that bound, no alignment leaving the band can score
+        higher, and the score is reported as exact.
+
+        Args:
+            string1,string2 (str) : Input strings.
+            band (int): Number of diagonals computed beyond those between the two corners of the DP matrices, on each
+                        side (defaults to None).
+            min_score (float): Minimum score of interest (defaults to None). If no band is given, the narrowest band
+                               that can not cut off an alignment scoring min_score or more is used, so that the score
+                               is exact whenever it is at least min_score. If neither band nor min_score is given, the
+                               whole DP matrices are computed.
+
+        Returns:
+            A tuple (score, exact), where score is the best affine gap score of the alignments within the band (float)
+            and exact is True if it is the affine gap score of the two strings (bool).
+
+        Raises:
+            TypeError : If the inputs are not strings or if one of the inputs is None.
+            ValueError : If band is negative, or if both band and min_score are given.
+
+        Examples:
+            >>> aff = Affine()
+            >>> aff.get_banded_raw_score('dva', 'deeva', band=0)
+            (1.5, True)
+            >>> aff = Affine(gap_continuation=0.2, sim_func=lambda s1, s2: (int(1 if s1 == s2 else 0)))
+            >>> score, exact = aff.get_banded_raw_score('AAAGAATTCA', 'AAATCA', min_score=4)
+            >>> round(score, 4), exact
+            (4.4, True)
+        """
+        # input validations
+        utils.sim_check_for_none(string1, string2)
+        utils.sim_check_band(band, min_score)
+
+        # convert input to unicode.
+        string1 = utils.convert_to_unicode(string1)
+        string2 = utils.convert_to_unicode(string2)
+
+        utils.tok_check_for_string_input(string1, string2)
+
+        # if one of the strings is empty return 0
+        if utils.sim_check_for_empty(string1, string2):
+            return 0, True
+
+        return affine_banded(string1, string2, self.gap_start, self.gap_continuation, self.sim_func, band, min_score)
 
     def get_gap_start(self):
         """Get gap start cost.
@@ -114,7 +176,8 @@ class Affine(SequenceSimilarityMeasure):
         """Set similarity function.
 
         Args:
-            sim_func (function): Function computing similarity score between two characters, represented as strings.
+            sim_func (function or SubstitutionMatrix): Function computing similarity score between two characters,
+                                                       represented as strings.
         """
         self.sim_func = sim_func
         return True
@@ -1,44 +1,381 @@
 
 import numpy as np
-from py_stringmatching.similarity_measure.cython.cython_utils import float_max_two
-from py_stringmatching.similarity_measure.cython.cython_utils import float_max_three
+from libc.math cimport INFINITY
+from libc.stdlib cimport malloc, free
+from py_stringmatching.similarity_measure.cython.cython_utils import cython_sim_ident
+from py_stringmatching.similarity_measure.cython.cython_utils cimport c_float_max_two, c_float_max_three
+from py_stringmatching.similarity_measure.cython.cython_substitution cimport SubstitutionTable
+from py_stringmatching.similarity_measure.cython.cython_unicode cimport \
+    ucs_t, Py_UCS1, Py_UCS2, PyUnicode_KIND, PyUnicode_DATA, PyUnicode_READ, \
+    PyUnicode_1BYTE_KIND, PyUnicode_2BYTE_KIND
 
 
 
-def affine(unicode string1, unicode string2, float main_gap_start, float main_gap_continuation, sim_func ):
+def affine(unicode string1, unicode string2, float main_gap_start, float main_gap_continuation, sim_func,
+           min_score=None):
+    """Computes the affine gap score.
 
+    Args:
+        string1,string2 (unicode): Input unicode strings, not empty.
+        main_gap_start, main_gap_continuation (float): Gap costs.
+        sim_func (function): Similarity function.
+        min_score (float): Minimum score of interest (defaults to None). If given, the DP stops as soon as the
+                           score is known to be below min_score.
+    Returns:
+        The affine gap score (float), or -inf if it is below min_score.
+    """
+
+    cdef int kind1 = PyUnicode_KIND(string1)
+    cdef void* data1 = PyUnicode_DATA(string1)
+    cdef int kind2 = PyUnicode_KIND(string2)
+    cdef void* data2 = PyUnicode_DATA(string2)
+    cdef SubstitutionTable table
+
+    # Only two rows of each DP matrix are kept, and they span the shorter
+    # string: the DP of the swapped strings is the transposed matrices, with x
+    # and y trading places, whose cells hold exactly the same values.
+    if min_score is not None:
+        table = SubstitutionTable(sim_func, string1, string2)
+        if len(string2) > len(string1):
+            return _affine_bounded(table.offsets2, len(string2), table.offsets1, len(string1), table.scores,
+                                   main_gap_start, main_gap_continuation, table.max_score, min_score)
+        return _affine_bounded(table.offsets1, len(string1), table.offsets2, len(string2), table.scores,
+                               main_gap_start, main_gap_continuation, table.max_score, min_score)
+
+    if sim_func is not cython_sim_ident:
+        # the scores of the character pairs are looked up in a table, so that
+        # sim_func is not called on every cell
+        table = SubstitutionTable(sim_func, string1, string2)
+        if len(string2) > len(string1):
+            return _affine(table.offsets2, len(string2), table.offsets1, len(string1), table.scores,
+                           main_gap_start, main_gap_continuation)
+        return _affine(table.offsets1, len(string1), table.offsets2, len(string2), table.scores,
+                       main_gap_start, main_gap_continuation)
+
+    if len(string2) > len(string1):
+        string1, string2 = string2, string1
+        kind2 = kind1
+        data2 = data1
+
+    # with the identity function, the characters are compared directly in the
+    # string buffers, specialized on the code unit width of string2
+    if kind2 == PyUnicode_1BYTE_KIND:
+        return _affine_ident(string1, <Py_UCS1*>data2, len(string2), main_gap_start, main_gap_continuation)
+    elif kind2 == PyUnicode_2BYTE_KIND:
+        return _affine_ident(string1, <Py_UCS2*>data2, len(string2), main_gap_start, main_gap_continuation)
+    return _affine_ident(string1, <Py_UCS4*>data2, len(string2), main_gap_start, main_gap_continuation)
+
+
+def affine_banded(unicode string1, unicode string2, float main_gap_start, float main_gap_continuation, sim_func,
+                  band=None, min_score=None):
+    """Computes the affine gap score over a band of the DP matrices.
+
+    Only the cells (i, j) with min(0, d) - band <= j - i <= max(0, d) + band,
+    where d = len(string2) - len(string1), are computed. An alignment
+    leaving the band has at least abs(d) + 2 * (band + 1) gap characters,
+    which bounds its score given the best score of a pair of characters: if
+    the score within the band reaches that bound, it is the affine gap score.
+    If no band is given, the narrowest band whose bound is below min_score
+    is used, so that the score is exact as soon as it reaches min_score.
+
+    Args:
+        string1,string2 (unicode): Input unicode strings, not empty.
+        main_gap_start, main_gap_continuation (float): Gap costs.
+        sim_func (function): Similarity function.
+        band (int): Width of the band (defaults to None).
+        min_score (float): Minimum score of interest, from which the band is derived if it is not given
+                           (defaults to None, for the whole matrices).
+    Returns:
+        A tuple (score, exact) of the best score of the alignments within the band (float) and whether no
+        alignment leaving the band can score higher (bool).
+    """
+    cdef SubstitutionTable table = SubstitutionTable(sim_func, string1, string2)
+    cdef Py_ssize_t len_str1 = len(string1), len_str2 = len(string2)
+    cdef Py_ssize_t max_len = len_str1 if len_str1 > len_str2 else len_str2
+    cdef Py_ssize_t width = max_len
+    cdef double score = 0.0, bound = 0.0
+
+    if band is not None:
+        width = band if band < max_len else max_len
+    elif min_score is not None:
+        width = 0
+        while width < max_len and _get_outside_bound(len_str1, len_str2, width, table.max_score, main_gap_start,
+                                                      main_gap_continuation) >= min_score:
+            width += 1
+
+    score = _affine_banded(table.offsets1, len_str1, table.offsets2, len_str2, table.scores, main_gap_start,
+                           main_gap_continuation, width)
+    bound = _get_outside_bound(len_str1, len_str2, width, table.max_score, main_gap_start, main_gap_continuation)
+    return score, score >= bound
+
+
+cdef double _affine(Py_ssize_t* offsets1, int len_str1, Py_ssize_t* offsets2, int len_str2, double* scores,
+                    float main_gap_start, float main_gap_continuation) except? -1:
+    # the score of the i-th character of the first string and the j-th
+    # character of the second one is scores[offsets1[i] + offsets2[j]], see
+    # SubstitutionTable
     cdef float gap_start = - main_gap_start
     cdef float gap_continuation = - main_gap_continuation
-    cdef int len_str1 = len(string1)
-    cdef int len_str2 = len(string2)
     cdef int i=0, j=0
-    cdef double[:, :] m = np.zeros((len_str1 + 1, len_str2 + 1), dtype=np.double)
-    cdef double[:, :] x = np.zeros((len_str1 + 1, len_str2 + 1), dtype=np.double)
-    cdef double[:, :] y = np.zeros((len_str1 + 1, len_str2 + 1), dtype=np.double)
-
-    # DP initialization
-    for i from 1 <= i < (len_str1+1):
-        m[i, 0] = -float(np.inf)
-        x[i, 0] = gap_start + (i-1) * gap_continuation
-        y[i, 0] = -float(np.inf)
-    #
-    # # DP initialization
-    for j from 1 <= j < (len_str2+1):
-        m[0, j] = -float(np.inf)
-        x[0, j] = -float(np.inf)
-        y[0, j] = gap_start + (j-1) * gap_continuation
+    cdef double* rows = _affine_alloc(len_str2)
+    cdef double* m_prev = rows
+    cdef double* x_prev = rows + (len_str2 + 1)
+    cdef double* y_prev = rows + 2 * (len_str2 + 1)
+    cdef double* m_curr = rows + 3 * (len_str2 + 1)
+    cdef double* x_curr = rows + 4 * (len_str2 + 1)
+    cdef double* y_curr = rows + 5 * (len_str2 + 1)
+    cdef double* tmp
+    cdef double* row_scores
+    cdef double score = 0.0
 
+    _affine_init(m_prev, x_prev, y_prev, len_str2, gap_start, gap_continuation)
 
-    # affine gap calculation using DP
+    # affine gap calculation using DP, the maxima being taken in single
+    # precision by c_float_max_two and c_float_max_three
     for i from 1 <= i < (len_str1 + 1):
+        row_scores = scores + offsets1[i-1]
+        m_curr[0] = -INFINITY
+        x_curr[0] = gap_start + (i-1) * gap_continuation
+        y_curr[0] = -INFINITY
         for j from 1 <= j < (len_str2 + 1):
             # best score between x_1....x_i and y_1....y_j
                 # given that x_i is aligned to y_j
-            m[i, j] = (sim_func(string1[i-1], string2[j-1]) + float_max_three(m[i-1][j-1],
-                                                                       x[i-1][j-1], y[i-1][j-1]))
+            m_curr[j] = (row_scores[offsets2[j-1]] + c_float_max_three(m_prev[j-1], x_prev[j-1], y_prev[j-1]))
             # the best score given that x_i is aligned to a gap
-            x[i, j] = float_max_two((gap_start + m[i-1, j]), (gap_continuation+ x[i-1, j]))
+            x_curr[j] = c_float_max_two((gap_start + m_prev[j]), (gap_continuation+ x_prev[j]))
             # the best score given that y_j is aligned to a gap
-            y[i, j] = float_max_two((gap_start+ m[i, j-1]), (gap_continuation + y[i, j-1]))
+            y_curr[j] = c_float_max_two((gap_start+ m_curr[j-1]), (gap_continuation + y_curr[j-1]))
+        tmp = m_prev; m_prev = m_curr; m_curr = tmp
+        tmp = x_prev; x_prev = x_curr; x_curr = tmp
+        tmp = y_prev; y_prev = y_curr; y_curr = tmp
+
+    score = c_float_max_three(m_prev[len_str2], x_prev[len_str2], y_prev[len_str2])
+    free(rows)
+    return score
+
+
+cdef double _affine_ident(unicode string1, ucs_t* string2, int len_str2, float main_gap_start,
+                          float main_gap_continuation) except? -1:
+    cdef int kind1 = PyUnicode_KIND(string1)
+    cdef void* data1 = PyUnicode_DATA(string1)
+    cdef float gap_start = - main_gap_start
+    cdef float gap_continuation = - main_gap_continuation
+    cdef int len_str1 = len(string1)
+    cdef int i=0, j=0
+    cdef double* rows = _affine_alloc(len_str2)
+    cdef double* m_prev = rows
+    cdef double* x_prev = rows + (len_str2 + 1)
+    cdef double* y_prev = rows + 2 * (len_str2 + 1)
+    cdef double* m_curr = rows + 3 * (len_str2 + 1)
+    cdef double* x_curr = rows + 4 * (len_str2 + 1)
+    cdef double* y_curr = rows + 5 * (len_str2 + 1)
+    cdef double* tmp
+    cdef Py_UCS4 ch
+
+    try:
+        _affine_init(m_prev, x_prev, y_prev, len_str2, gap_start, gap_continuation)
+
+        # affine gap calculation using DP
+        for i from 1 <= i < (len_str1 + 1):
+            ch = PyUnicode_READ(kind1, data1, i-1)
+            m_curr[0] = -INFINITY
+            x_curr[0] = gap_start + (i-1) * gap_continuation
+            y_curr[0] = -INFINITY
+            for j from 1 <= j < (len_str2 + 1):
+                # best score between x_1....x_i and y_1....y_j
+                    # given that x_i is aligned to y_j (the maximum is added
+                    # in double precision, like the scores of a table)
+                m_curr[j] = ((1 if ch == string2[j-1] else 0) + <double> c_float_max_three(m_prev[j-1],
+                                                                                        x_prev[j-1], y_prev[j-1]))
+                # the best score given that x_i is aligned to a gap
+                x_curr[j] = c_float_max_two((gap_start + m_prev[j]), (gap_continuation+ x_prev[j]))
+                # the best score given that y_j is aligned to a gap
+                y_curr[j] = c_float_max_two((gap_start+ m_curr[j-1]), (gap_continuation + y_curr[j-1]))
+            tmp = m_prev; m_prev = m_curr; m_curr = tmp
+            tmp = x_prev; x_prev = x_curr; x_curr = tmp
+            tmp = y_prev; y_prev = y_curr; y_curr = tmp
+
+        return c_float_max_three(m_prev[len_str2], x_prev[len_str2], y_prev[len_str2])
+    finally:
+        free(rows)
+
+
+cdef double _affine_bounded(Py_ssize_t* offsets1, Py_ssize_t len_str1, Py_ssize_t* offsets2, Py_ssize_t len_str2,
+                            double* scores, float main_gap_start, float main_gap_continuation, double max_score,
+                            double min_score) except? -1:
+    # The same DP as _affine on the offsets of a SubstitutionTable, which
+    # stops as soon as no cell of the current rows can lead to a score of
+    # min_score, and returns -INFINITY for the scores below min_score.
+    cdef float gap_start = - main_gap_start
+    cdef float gap_continuation = - main_gap_continuation
+    cdef double min_cost = main_gap_start if main_gap_start < main_gap_continuation else main_gap_continuation
+    # the maxima are rounded to single precision, which the bounds do not
+    # follow, so they are only trusted up to a rounding error per cell of an
+    # alignment, on values of at most about the total of the costs and scores
+    cdef double threshold = min_score - 1e-6 * (len_str1 + len_str2 + 1) * (
+        abs(min_score) + (len_str1 + len_str2) * (abs(main_gap_start) + abs(main_gap_continuation) + abs(max_score))
+        + 1)
+    cdef Py_ssize_t i = 0, j = 0
+    cdef double* rows = _affine_alloc(len_str2)
+    cdef double* m_prev = rows
+    cdef double* x_prev = rows + (len_str2 + 1)
+    cdef double* y_prev = rows + 2 * (len_str2 + 1)
+    cdef double* m_curr = rows + 3 * (len_str2 + 1)
+    cdef double* x_curr = rows + 4 * (len_str2 + 1)
+    cdef double* y_curr = rows + 5 * (len_str2 + 1)
+    cdef double* tmp
+    cdef double sim_score = 0.0, score = 0.0
+
+    _affine_init(m_prev, x_prev, y_prev, len_str2, gap_start, gap_continuation)
+
+    # affine gap calculation using DP, checking the bound before each row
+    for i in range(1, len_str1 + 1):
+        if not _can_reach(m_prev, x_prev, y_prev, len_str1 - i + 1, len_str2, (i - 1) * len_str2 // len_str1,
+                          max_score, min_cost, threshold):
+            free(rows)
+            return -INFINITY
+        m_curr[0] = -INFINITY
+        x_curr[0] = gap_start + (i-1) * gap_continuation
+        y_curr[0] = -INFINITY
+        for j in range(1, len_str2 + 1):
+            if scores == NULL:
+                sim_score = 1 if offsets1[i-1] == offsets2[j-1] else 0
+            else:
+                sim_score = scores[offsets1[i-1] + offsets2[j-1]]
+            m_curr[j] = (sim_score + c_float_max_three(m_prev[j-1], x_prev[j-1], y_prev[j-1]))
+            x_curr[j] = c_float_max_two((gap_start + m_prev[j]), (gap_continuation+ x_prev[j]))
+            y_curr[j] = c_float_max_two((gap_start+ m_curr[j-1]), (gap_continuation + y_curr[j-1]))
+        tmp = m_prev; m_prev = m_curr; m_curr = tmp
+        tmp = x_prev; x_prev = x_curr; x_curr = tmp
+        tmp = y_prev; y_prev = y_curr; y_curr = tmp
+
+    score = c_float_max_three(m_prev[len_str2], x_prev[len_str2], y_prev[len_str2])
+    free(rows)
+    return score if score >= min_score else -INFINITY
+
+
+cdef bint _can_reach(double* m, double* x, double* y, Py_ssize_t num_rows, Py_ssize_t len_str2, Py_ssize_t start,
+                     double max_score, double min_cost, double threshold) nogil:
+    # Whether an alignment through one of the cells of a row, with num_rows
+    # rows left below it, can score threshold or more. From the j-th cell,
+    # the rest of the alignment has at most min(num_rows, len_str2 - j)
+    # pairs and at least abs(num_rows - len_str2 + j) gap characters, each
+    # costing at least min_cost, and its bound is linear in the number of
+    # pairs, so it is largest at one end of their range. The cells are
+    # visited from the start-th one.
+    cdef Py_ssize_t j = 0, k = 0, num_cols = 0, num_pairs = 0, num_gaps = 0
+    cdef double cell = 0.0
+    for k in range(len_str2 + 1):
+        # from the cell on the main diagonal, where a good alignment usually is
+        j = start + k if start + k <= len_str2 else len_str2 - k
+        num_cols = len_str2 - j
+        num_pairs = num_rows if num_rows < num_cols else num_cols
+        num_gaps = num_rows + num_cols - 2 * num_pairs
+        cell = max(m[j], x[j], y[j])
+        if cell + max(num_pairs * max_score - num_gaps * min_cost,
+                      -((num_rows + num_cols) * min_cost)) >= threshold:
+            return True
+    return False
+
+
+cdef double _affine_banded(Py_ssize_t* offsets1, Py_ssize_t len_str1, Py_ssize_t* offsets2, Py_ssize_t len_str2,
+                           double* scores, float main_gap_start, float main_gap_continuation,
+                           Py_ssize_t band) except? -1:
+    # the scores are those of a SubstitutionTable. The cells left of and
+    # right of the band in a row are set to -INFINITY, so that the cells of
+    # the next row never take their values.
+    cdef float gap_start = - main_gap_start
+    cdef float gap_continuation = - main_gap_continuation
+    cdef Py_ssize_t i = 0, j = 0, j_lo = 0, j_hi = 0
+    cdef Py_ssize_t diag_lo = (len_str2 - len_str1 if len_str2 < len_str1 else 0) - band
+    cdef Py_ssize_t diag_hi = (len_str2 - len_str1 if len_str2 > len_str1 else 0) + band
+    cdef double* rows = _affine_alloc(len_str2 + 1)
+    cdef double* m_prev = rows
+    cdef double* x_prev = rows + (len_str2 + 2)
+    cdef double* y_prev = rows + 2 * (len_str2 + 2)
+    cdef double* m_curr = rows + 3 * (len_str2 + 2)
+    cdef double* x_curr = rows + 4 * (len_str2 + 2)
+    cdef double* y_curr = rows + 5 * (len_str2 + 2)
+    cdef double* tmp
+    cdef double sim_score = 0.0, score = 0.0
+
+    # DP initialization of the first row, within the band
+    j_hi = diag_hi if diag_hi < len_str2 else len_str2
+    _affine_init(m_prev, x_prev, y_prev, j_hi, gap_start, gap_continuation)
+    m_prev[j_hi + 1] = x_prev[j_hi + 1] = y_prev[j_hi + 1] = -INFINITY
+
+    # affine gap calculation using DP, within the band
+    for i in range(1, len_str1 + 1):
+        j_lo = i + diag_lo if i + diag_lo > 0 else 0
+        j_hi = i + diag_hi if i + diag_hi < len_str2 else len_str2
+        if j_lo == 0:
+            m_curr[0] = -INFINITY
+            x_curr[0] = gap_start + (i-1) * gap_continuation
+            y_curr[0] = -INFINITY
+            j_lo = 1
+        else:
+            m_curr[j_lo-1] = x_curr[j_lo-1] = y_curr[j_lo-1] = -INFINITY
+        for j in range(j_lo, j_hi + 1):
+            if scores == NULL:
+                sim_score = 1 if offsets1[i-1] == offsets2[j-1] else 0
+            else:
+                sim_score = scores[offsets1[i-1] + offsets2[j-1]]
+            m_curr[j] = (sim_score + c_float_max_three(m_prev[j-1], x_prev[j-1], y_prev[j-1]))
+            x_curr[j] = c_float_max_two((gap_start + m_prev[j]), (gap_continuation+ x_prev[j]))
+            y_curr[j] = c_float_max_two((gap_start+ m_curr[j-1]), (gap_continuation + y_curr[j-1]))
+        m_curr[j_hi+1] = x_curr[j_hi+1] = y_curr[j_hi+1] = -INFINITY
+        tmp = m_prev; m_prev = m_curr; m_curr = tmp
+        tmp = x_prev; x_prev = x_curr; x_curr = tmp
+        tmp = y_prev; y_prev = y_curr; y_curr = tmp
+
+    score = c_float_max_three(m_prev[len_str2], x_prev[len_str2], y_prev[len_str2])
+    free(rows)
+    return score
+
+
+cdef double _get_outside_bound(Py_ssize_t len_str1, Py_ssize_t len_str2, Py_ssize_t band, double max_score,
+                               float main_gap_start, float main_gap_continuation):
+    # Upper bound on the score of the alignments leaving the band. Such an
+    # alignment has num_gaps >= abs(len_str2 - len_str1) + 2 * (band + 1) gap
+    # characters, costing at least num_gaps * min(gap start, gap
+    # continuation), plus the difference if the gap start costs more, and
+    # (len_str1 + len_str2 - num_gaps) / 2 aligned pairs. Its bound is linear
+    # in num_gaps, so it is largest at one end of the range of num_gaps. The
+    # maxima of the DP are rounded to single precision, so an alignment
+    # scoring the bound exactly can come out slightly above it: the bound is
+    # raised by the rounding margin by which the threshold of _affine_bounded
+    # is lowered.
+    cdef Py_ssize_t num_gaps = (len_str2 - len_str1 if len_str2 > len_str1 else len_str1 - len_str2) + 2 * (band + 1)
+    cdef Py_ssize_t total = len_str1 + len_str2
+    cdef double min_cost = main_gap_start if main_gap_start < main_gap_continuation else main_gap_continuation
+    cdef double extra_cost = main_gap_start - main_gap_continuation if main_gap_start > main_gap_continuation else 0
+    cdef double bound = 0.0
+    if len_str1 == 0 or len_str2 == 0 or num_gaps > total:
+        return -INFINITY
+    bound = max((total - num_gaps) / 2.0 * max_score - num_gaps * min_cost - extra_cost,
+                -(total * min_cost) - extra_cost)
+    return bound + 1e-6 * (total + 1) * (
+        abs(bound) + total * (abs(main_gap_start) + abs(main_gap_continuation) + abs(max_score)) + 1)
+
+
+cdef double* _affine_alloc(int len_str2) except NULL:
+    # one block for the previous and current rows of m, x and y
+    cdef double* rows = <double*> malloc(6 * (len_str2 + 1) * sizeof(double))
+    if rows == NULL:
+        raise MemoryError()
+    return rows
+
+
+cdef void _affine_init(double* m, double* x, double* y, int len_str2, float gap_start,
+                       float gap_continuation):
+    cdef int j=0
+
+    # DP initialization of the first row
+    m[0] = 0
+    x[0] = 0
+    y[0] = 0
+    for j from 1 <= j < (len_str2+1):
+        m[j] = -INFINITY
+        x[j] = -INFINITY
+        y[j] = gap_start + (j-1) * gap_continuation
 
-    return float_max_three(m[len_str1, len_str2], x[len_str1, len_str2], y[len_str1, len_str2])
@@ -0,0 +1,278 @@
+# cython: boundscheck=False
+# cython: wraparound=False
+
+from __future__ import division
+from libc.stdint cimport uint64_t
+from libc.stdlib cimport malloc, calloc, free
+
+from py_stringmatching.similarity_measure.cython.cython_pattern_match cimport \
+    PatternMatchVector, pm_clear, pm_insert, pm_get
+from py_stringmatching.similarity_measure.cython.cython_unicode cimport \
+    ucs_t, Py_UCS1, Py_UCS2, PyUnicode_KIND, PyUnicode_DATA, PyUnicode_READ, \
+    PyUnicode_1BYTE_KIND, PyUnicode_2BYTE_KIND
+
+
+def osa(unicode string1, unicode string2, double ins_cost=1, double del_cost=1,
+        double sub_cost=1, double trans_cost=1):
+    """Computes the optimal string alignment distance between two strings.
+
+    The optimal string alignment (or restricted Damerau-Levenshtein) distance
+    extends the Levenshtein distance with the transposition of two adjacent
+    characters, under the condition that no substring is edited more than once.
+    With unit costs and a shorter string of at most 64 characters, the
+    distance is computed with the bit-parallel algorithm of Hyyro; otherwise
+    with three rows of the DP matrix.
+
+    Args:
+        string1, string2 (unicode): Input unicode strings.
+        ins_cost, del_cost, sub_cost, trans_cost (float): Costs of inserting a
+            character of string2, deleting a character of string1,
+            substituting a character and transposing two adjacent characters.
+
+    Returns:
+        Optimal string alignment distance (float).
+
+    References:
+        * H. Hyyro. A bit-vector algorithm for computing Levenshtein and Damerau edit distances. 2003.
+    """
+    cdef Py_ssize_t len_str1 = len(string1), len_str2 = len(string2)
+    cdef Py_ssize_t prefix = 0, suffix = 0
+    cdef int kind1 = PyUnicode_KIND(string1), kind2 = PyUnicode_KIND(string2)
+    cdef void* data1 = PyUnicode_DATA(string1)
+    cdef void* data2 = PyUnicode_DATA(string2)
+
+    if ins_cost == 1 and del_cost == 1 and sub_cost == 1 and trans_cost == 1:
+        # strip the common prefix and suffix, they never contribute to the distance
+        while (prefix < len_str1 and prefix < len_str2 and
+               PyUnicode_READ(kind1, data1, prefix) == PyUnicode_READ(kind2, data2, prefix)):
+            prefix += 1
+        while (suffix < len_str1 - prefix and suffix < len_str2 - prefix and
+               PyUnicode_READ(kind1, data1, len_str1 - suffix - 1) ==
+               PyUnicode_READ(kind2, data2, len_str2 - suffix - 1)):
+            suffix += 1
+        len_str1 -= prefix + suffix
+        len_str2 -= prefix + suffix
+
+        # with unit costs the distance is symmetric, so the shorter string is
+        # used as the pattern
+        if len_str1 > len_str2:
+            string1, string2 = string2, string1
+            len_str1, len_str2 = len_str2, len_str1
+            kind1, kind2 = kind2, kind1
+            data1, data2 = data2, data1
+
+        if len_str1 == 0:
+            return len_str2
+        if len_str1 <= 64:
+            if kind2 == PyUnicode_1BYTE_KIND:
+                return _osa_hyrroe2003(string1, prefix, len_str1, <Py_UCS1*>data2 + prefix, len_str2)
+            elif kind2 == PyUnicode_2BYTE_KIND:
+                return _osa_hyrroe2003(string1, prefix, len_str1, <Py_UCS2*>data2 + prefix, len_str2)
+            return _osa_hyrroe2003(string1, prefix, len_str1, <Py_UCS4*>data2 + prefix, len_str2)
+
+    if kind2 == PyUnicode_1BYTE_KIND:
+        return _osa(string1, prefix, len_str1, <Py_UCS1*>data2 + prefix, len_str2,
+                    ins_cost, del_cost, sub_cost, trans_cost)
+    elif kind2 == PyUnicode_2BYTE_KIND:
+        return _osa(string1, prefix, len_str1, <Py_UCS2*>data2 + prefix, len_str2,
+                    ins_cost, del_cost, sub_cost, trans_cost)
+    return _osa(string1, prefix, len_str1, <Py_UCS4*>data2 + prefix, len_str2,
+                ins_cost, del_cost, sub_cost, trans_cost)
+
+
+def damerau_levenshtein(unicode string1, unicode string2, double ins_cost=1, double del_cost=1,
+                        double sub_cost=1, double trans_cost=1):
+    """Computes the Damerau-Levenshtein distance between two strings.
+
+    Unlike the optimal string alignment distance, characters may be edited
+    again after a transposition. The distance is computed with the algorithm
+    of Lowrance and Wagner, which needs the full DP matrix, and is exact as
+    long as 2 * trans_cost >= ins_cost + del_cost.
+
+    Args:
+        string1, string2 (unicode): Input unicode strings.
+        ins_cost, del_cost, sub_cost, trans_cost (float): Costs of inserting a
+            character of string2, deleting a character of string1,
+            substituting a character and transposing two adjacent characters.
+
+    Returns:
+        Damerau-Levenshtein distance (float).
+
+    References:
+        * R. Lowrance, R. A. Wagner. An extension of the string-to-string correction problem. 1975.
+    """
+    cdef Py_ssize_t len_str1 = len(string1), len_str2 = len(string2)
+    cdef Py_ssize_t i = 0
+    cdef int* codes1
+    cdef int* codes2
+    cdef dict alphabet = {}
+
+    if len_str1 == 0:
+        return len_str2 * ins_cost
+    if len_str2 == 0:
+        return len_str1 * del_cost
+
+    # Number the distinct characters of string1, so that the last row in
+    # which a character occurs can be kept in a plain array. Characters of
+    # string2 that do not occur in string1 get -1.
+    codes1 = <int*> malloc(len_str1 * sizeof(int))
+    codes2 = <int*> malloc(len_str2 * sizeof(int))
+    if codes1 == NULL or codes2 == NULL:
+        free(codes1)
+        free(codes2)
+        raise MemoryError()
+    try:
+        for i in range(len_str1):
+            codes1[i] = alphabet.setdefault(string1[i], len(alphabet))
+        for i in range(len_str2):
+            codes2[i] = alphabet.get(string2[i], -1)
+        return _damerau_levenshtein(codes1, len_str1, codes2, len_str2, len(alphabet),
+                                    ins_cost, del_cost, sub_cost, trans_cost)
+    finally:
+        free(codes1)
+        free(codes2)
+
+
+cdef double _osa_hyrroe2003(unicode pattern, Py_ssize_t offset, Py_ssize_t len_pattern,
+                            ucs_t* text, Py_ssize_t len_text):
+    # unit cost version, len_pattern must be in [1, 64]. This is the
+    # Levenshtein kernel plus the transposition vector tr, which marks the
+    # positions where the previous text character matched one position later.
+    cdef PatternMatchVector pm
+    cdef int kind = PyUnicode_KIND(pattern)
+    cdef void* data = PyUnicode_DATA(pattern)
+    cdef uint64_t vp = ~(<uint64_t>0), vn = 0, d0 = 0, pm_j_old = 0
+    cdef uint64_t pm_j, tr, hp, hn
+    cdef uint64_t last = (<uint64_t>1) << (len_pattern - 1)
+    cdef Py_ssize_t dist = len_pattern
+    cdef Py_ssize_t i = 0, j = 0
+
+    pm_clear(&pm)
+    for i in range(len_pattern):
+        pm_insert(&pm, PyUnicode_READ(kind, data, offset + i), (<uint64_t>1) << i)
+
+    for j in range(len_text):
+        pm_j = pm_get(&pm, text[j])
+        tr = (((~d0) & pm_j) << 1) & pm_j_old
+        d0 = (((pm_j & vp) + vp) ^ vp) | pm_j | vn
+        d0 = d0 | tr
+        hp = vn | ~(d0 | vp)
+        hn = d0 & vp
+        if hp & last:
+            dist += 1
+        if hn & last:
+            dist -= 1
+        hp = (hp << 1) | 1
+        hn = hn << 1
+        vp = hn | ~(d0 | hp)
+        vn = hp & d0
+        pm_j_old = pm_j
+
+    return dist
+
+
+cdef double _osa(unicode string1, Py_ssize_t offset, Py_ssize_t len_str1, ucs_t* string2,
+                 Py_ssize_t len_str2, double ins_cost, double del_cost, double sub_cost,
+                 double trans_cost) except? -1:
+    # three rows of the DP matrix: the current one and the two previous ones,
+    # the rows follow string1 and the columns string2
+    cdef int kind1 = PyUnicode_KIND(string1)
+    cdef void* data1 = PyUnicode_DATA(string1)
+    cdef double* prev2 = <double*> malloc((len_str2 + 1) * sizeof(double))
+    cdef double* prev = <double*> malloc((len_str2 + 1) * sizeof(double))
+    cdef double* curr = <double*> malloc((len_str2 + 1) * sizeof(double))
+    cdef double* tmp
+    cdef double value = 0
+    cdef Py_ssize_t i = 0, j = 0
+    cdef Py_UCS4 ch = 0, prev_ch = 0
+
+    if prev2 == NULL or prev == NULL or curr == NULL:
+        free(prev2)
+        free(prev)
+        free(curr)
+        raise MemoryError()
+
+    for j in range(len_str2 + 1):
+        prev[j] = j * ins_cost
+
+    for i in range(1, len_str1 + 1):
+        prev_ch = ch
+        ch = PyUnicode_READ(kind1, data1, offset + i - 1)
+        curr[0] = i * del_cost
+        for j in range(1, len_str2 + 1):
+            value = prev[j - 1] + (0 if string2[j - 1] == ch else sub_cost)
+            if prev[j] + del_cost < value:
+                value = prev[j] + del_cost
+            if curr[j - 1] + ins_cost < value:
+                value = curr[j - 1] + ins_cost
+            if (i > 1 and j > 1 and string2[j - 2] == ch and string2[j - 1] == prev_ch and
+                    prev2[j - 2] + trans_cost < value):
+                value = prev2[j - 2] + trans_cost
+            curr[j] = value
+
+        tmp = prev2
+        prev2 = prev
+        prev = curr
+        curr = tmp
+
+    value = prev[len_str2]
+    free(prev2)
+    free(prev)
+    free(curr)
+    return value
+
+
+cdef double _damerau_levenshtein(int* codes1, Py_ssize_t len_str1, int* codes2, Py_ssize_t len_str2,
+                                 Py_ssize_t alphabet_size, double ins_cost, double del_cost,
+                                 double sub_cost, double trans_cost) except? -1:
+    # The matrix has an extra leading row and column holding a value larger
+    # than any distance, so that transpositions with no earlier occurrence
+    # of a character are never chosen.
+    cdef Py_ssize_t width = len_str2 + 2
+    cdef double* d_mat = <double*> malloc((len_str1 + 2) * width * sizeof(double))
+    cdef Py_ssize_t* last_row = <Py_ssize_t*> calloc(alphabet_size, sizeof(Py_ssize_t))
+    cdef double max_dist = len_str1 * del_cost + len_str2 * ins_cost + 1
+    cdef double value = 0, cost = 0
+    cdef Py_ssize_t i = 0, j = 0, i1 = 0, j1 = 0, last_col = 0
+
+    if d_mat == NULL or last_row == NULL:
+        free(d_mat)
+        free(last_row)
+        raise MemoryError()
+
+    for i in range(len_str1 + 2):
+        d_mat[i * width] = max_dist
+    for j in range(width):
+        d_mat[j] = max_dist
+    for i in range(len_str1 + 1):
+        d_mat[(i + 1) * width + 1] = i * del_cost
+    for j in range(len_str2 + 1):
+        d_mat[width + j + 1] = j * ins_cost
+
+    for i in range(1, len_str1 + 1):
+        last_col = 0
+        for j in range(1, len_str2 + 1):
+            i1 = last_row[codes2[j - 1]] if codes2[j - 1] >= 0 else 0
+            j1 = last_col
+            if codes1[i - 1] == codes2[j - 1]:
+                cost = 0
+                last_col = j
+            else:
+                cost = sub_cost
+
+            value = d_mat[i * width + j] + cost
+            if d_mat[(i + 1) * width + j] + ins_cost < value:
+                value = d_mat[(i + 1) * width + j] + ins_cost
+            if d_mat[i * width + j + 1] + del_cost < value:
+                value = d_mat[i * width + j + 1] + del_cost
+            cost = (d_mat[i1 * width + j1] + (i - i1 - 1) * del_cost + trans_cost +
+                    (j - j1 - 1) * ins_cost)
+            if cost < value:
+                value = cost
+            d_mat[(i + 1) * width + j + 1] = value
+        last_row[codes1[i - 1]] = i
+
+    value = d_mat[(len_str1 + 1) * width + len_str2 + 1]
+    free(d_mat)
+    free(last_row)
+    return value
@@ -0,0 +1,330 @@
+# cython: boundscheck=False
+# cython: wraparound=False
+
+import unicodedata
+
+import numpy as np
+from libc.math cimport INFINITY
+from libc.stdlib cimport malloc, free, qsort
+from libc.string cimport memcpy
+
+from py_stringmatching.similarity_measure.cython.cython_unicode cimport \
+    PyUnicode_KIND, PyUnicode_DATA, PyUnicode_READ
+
+
+# Editex letter group of each ASCII code point, -1 for the characters that
+# are in no group. C, J, P and S are only in their last group of Zobel and
+# Dart's table, as in the original pure Python implementation, while H and W
+# are in no group.
+cdef int _GROUPS[128]
+
+
+cdef void _init_groups():
+    cdef int i = 0
+    for i in range(128):
+        _GROUPS[i] = -1
+    for letters, group in [('AEIOUY', 0), ('B', 1), ('KQ', 2), ('DT', 3), ('LR', 4), ('MN', 5), ('G', 6),
+                           ('FPV', 7), ('XZ', 8), ('CJS', 9)]:
+        for letter in letters:
+            _GROUPS[ord(letter)] = group
+
+
+_init_groups()
+
+
+cdef class EditexCodes:
+    """Characters of a normalized string with their Editex letter groups and deletion costs.
+
+    The deletion cost of a character depends on the character before it
+    (a space for the first one), so it is computed once per string rather
+    than for each cell of the DP matrix. The sums of the smallest deletion
+    costs, which bound the distances, are only computed when needed.
+    """
+
+    cdef Py_UCS4* chars
+    cdef int* groups
+    cdef double* del_costs
+    cdef double* del_cost_sums
+    cdef Py_ssize_t length
+
+    def __cinit__(self, unicode string, double match_cost, double group_cost, double mismatch_cost):
+        cdef int kind = PyUnicode_KIND(string)
+        cdef void* data = PyUnicode_DATA(string)
+        cdef Py_ssize_t i = 0
+        cdef Py_UCS4 prev_char = u' '
+        cdef int prev_group = -1
+
+        self.length = len(string)
+        self.chars = <Py_UCS4*> malloc((self.length + 1) * sizeof(Py_UCS4))
+        self.groups = <int*> malloc((self.length + 1) * sizeof(int))
+        self.del_costs = <double*> malloc((self.length + 1) * sizeof(double))
+        if self.chars == NULL or self.groups == NULL or self.del_costs == NULL:
+            raise MemoryError()
+
+        for i in range(self.length):
+            self.chars[i] = PyUnicode_READ(kind, data, i)
+            self.groups[i] = _GROUPS[self.chars[i]] if self.chars[i] < 128 else -1
+            # d(a, b) of Zobel & Dart, a being the previous character
+            if prev_char != self.chars[i] and (prev_char == u'H' or prev_char == u'W'):
+                self.del_costs[i] = group_cost
+            else:
+                self.del_costs[i] = _replace_cost(prev_char, prev_group, self.chars[i], self.groups[i],
+                                                  match_cost, group_cost, mismatch_cost)
+            prev_char = self.chars[i]
+            prev_group = self.groups[i]
+
+    def __dealloc__(self):
+        free(self.chars)
+        free(self.groups)
+        free(self.del_costs)
+        free(self.del_cost_sums)
+
+    cdef double* get_del_cost_sums(self) except NULL:
+        # del_cost_sums[c] is the sum of the c smallest deletion costs
+        cdef Py_ssize_t i = 0
+        if self.del_cost_sums == NULL:
+            self.del_cost_sums = <double*> malloc((self.length + 1) * sizeof(double))
+            if self.del_cost_sums == NULL:
+                raise MemoryError()
+            memcpy(self.del_cost_sums + 1, self.del_costs, self.length * sizeof(double))
+            qsort(self.del_cost_sums + 1, self.length, sizeof(double), _compare_doubles)
+            self.del_cost_sums[0] = 0
+            for i in range(1, self.length + 1):
+                self.del_cost_sums[i] += self.del_cost_sums[i - 1]
+        return self.del_cost_sums
+
+
+def editex(unicode string1, unicode string2, double match_cost, double group_cost, double mismatch_cost,
+           bint local, max_dist=None):
+    """Computes the Editex distance between two strings.
+
+    The strings are uppercased and NFKD normalized, and the sharp s is
+    converted to SS, before the distance is computed.
+
+    If max_dist is given and the costs are not negative, pairs whose lengths
+    alone imply a distance over max_dist are rejected right away, only the
+    diagonal band of the DP matrix that a path within max_dist can cross is
+    computed, and the computation stops as soon as a whole row exceeds
+    max_dist.
+
+    Args:
+        string1, string2 (unicode): Input unicode strings.
+        match_cost, group_cost, mismatch_cost (float): Editex costs.
+        local (bool): Whether to compute the local variant.
+        max_dist (float): Maximum distance of interest (defaults to None, which
+                          means unbounded).
+
+    Returns:
+        Editex distance (float). If max_dist is given and the distance exceeds
+        it, max_dist + 1 is returned instead.
+    """
+    cdef double bound = -1 if max_dist is None else max_dist
+    return _bounded_editex(EditexCodes(_normalize(string1), match_cost, group_cost, mismatch_cost),
+                           EditexCodes(_normalize(string2), match_cost, group_cost, mismatch_cost),
+                           match_cost, group_cost, mismatch_cost, local, bound)
+
+
+def editex_batch(unicode query, candidates, double match_cost, double group_cost, double mismatch_cost,
+                 bint local, max_dist=None):
+    """Computes the Editex distances between a query and many candidates.
+
+    The query is normalized and its letter groups and deletion costs are
+    computed once, and reused for every candidate.
+
+    Args:
+        query (unicode): Input unicode string.
+        candidates (sequence): Candidate strings (unicode, or utf-8 encoded bytes).
+        match_cost, group_cost, mismatch_cost (float): Editex costs.
+        local (bool): Whether to compute the local variant, the query being
+                      the first string.
+        max_dist (float): Maximum distance of interest (defaults to None, which
+                          means unbounded).
+
+    Returns:
+        Editex distances (NumPy float64 array), where distances over max_dist
+        are reported as max_dist + 1.
+
+    Raises:
+        TypeError : If one of the candidates is not a string.
+    """
+    cdef Py_ssize_t num_candidates = len(candidates)
+    cdef Py_ssize_t i = 0
+    cdef double bound = -1 if max_dist is None else max_dist
+    cdef double[:] scores = np.empty(num_candidates, dtype=np.float64)
+    cdef EditexCodes query_codes = EditexCodes(_normalize(query), match_cost, group_cost, mismatch_cost)
+    cdef unicode candidate
+
+    for i in range(num_candidates):
+        candidate = _as_unicode(candidates[i])
+        if candidate == query:
+            scores[i] = 0
+        else:
+            scores[i] = _bounded_editex(query_codes,
+                                        EditexCodes(_normalize(candidate), match_cost, group_cost, mismatch_cost),
+                                        match_cost, group_cost, mismatch_cost, local, bound)
+
+    return np.asarray(scores)
+
+
+cdef inline unicode _normalize(unicode string):
+    return unicodedata.normalize(u'NFKD', string.upper()).replace(u'\xdf', u'SS')
+
+
+cdef inline unicode _as_unicode(object string):
+    if isinstance(string, unicode):
+        return <unicode>string
+    if isinstance(string, bytes):
+        return (<bytes>string).decode('utf-8')
+    raise TypeError('Candidates are expected to be strings')
+
+
+cdef double _bounded_editex(EditexCodes codes1, EditexCodes codes2, double match_cost, double group_cost,
+                            double mismatch_cost, bint local, double max_dist) except? -1:
+    # A negative max_dist means unbounded. The bounds rely on the costs of a
+    # path never decreasing, so they are only used with non-negative costs.
+    cdef Py_ssize_t len1 = codes1.length, len2 = codes2.length
+    cdef Py_ssize_t diag_lo = -len1, diag_hi = len2
+    cdef bint prune = max_dist >= 0 and match_cost >= 0 and group_cost >= 0 and mismatch_cost >= 0
+    cdef double score = 0.0
+    # the bounds are compared with a small tolerance, as they do not add the
+    # costs in the same order as the DP
+    cdef double limit = max_dist * (1 + 1e-9) + 1e-9
+    cdef double* sums1
+    cdef double* sums2
+
+    if len1 == 0 or len2 == 0:
+        score = (len1 + len2) * mismatch_cost
+    else:
+        if prune:
+            sums2 = codes2.get_del_cost_sums()
+            if local:
+                # the characters of the first string before the alignment are
+                # skipped at no cost, only the insertions are bounded
+                if len2 > len1 and sums2[len2 - len1] > limit:
+                    return max_dist + 1
+            else:
+                sums1 = codes1.get_del_cost_sums()
+                if _get_diagonal_bound(sums1, sums2, len2 - len1, len2 - len1) > limit:
+                    return max_dist + 1
+                diag_lo = min(0, len2 - len1)
+                while diag_lo > -len1 and _get_diagonal_bound(sums1, sums2, len2 - len1, diag_lo - 1) <= limit:
+                    diag_lo -= 1
+                diag_hi = max(0, len2 - len1)
+                while diag_hi < len2 and _get_diagonal_bound(sums1, sums2, len2 - len1, diag_hi + 1) <= limit:
+                    diag_hi += 1
+        score = _editex(codes1, codes2, match_cost, group_cost, mismatch_cost, local,
+                        max_dist if prune else -1, diag_lo, diag_hi)
+
+    if max_dist >= 0 and score > max_dist:
+        return max_dist + 1
+    return score
+
+
+cdef inline double _get_diagonal_bound(double* sums1, double* sums2, Py_ssize_t len_diff, Py_ssize_t diagonal):
+    # Lower bound of the distance along the paths that cross a diagonal
+    # (j - i) of the DP matrix and end on diagonal len_diff: they delete at
+    # least num_dels characters of the first string and insert num_ins
+    # characters of the second one, at their smallest deletion costs.
+    cdef Py_ssize_t num_dels = max(0, -diagonal) + max(0, diagonal - len_diff)
+    cdef Py_ssize_t num_ins = max(0, diagonal) + max(0, len_diff - diagonal)
+    return sums1[num_dels] + sums2[num_ins]
+
+
+cdef double _editex(EditexCodes codes1, EditexCodes codes2, double match_cost, double group_cost,
+                    double mismatch_cost, bint local, double max_dist, Py_ssize_t diag_lo,
+                    Py_ssize_t diag_hi) except? -1:
+    # two rows of the DP matrix, spanning the second string. In the local
+    # variant, the first column is 0. Only the cells on diagonals diag_lo to
+    # diag_hi (j - i) are computed, the others being infinite. A negative
+    # max_dist means unbounded, otherwise the computation stops when a whole
+    # row exceeds it, returning max_dist + 1.
+    cdef Py_ssize_t i = 0, j = 0, first = 0, last = 0
+    cdef Py_ssize_t len1 = codes1.length, len2 = codes2.length
+    cdef double del_cost1 = 0.0, score = 0.0, row_min = 0.0
+    cdef double* prev_row
+    cdef double* curr_row
+    cdef double* tmp_row
+    cdef Py_UCS4 char1
+    cdef int group1 = 0
+
+    if len2 - len1 < diag_lo or len2 - len1 > diag_hi:
+        return max_dist + 1
+
+    prev_row = <double*> malloc((len2 + 1) * sizeof(double))
+    curr_row = <double*> malloc((len2 + 1) * sizeof(double))
+    if prev_row == NULL or curr_row == NULL:
+        free(prev_row)
+        free(curr_row)
+        raise MemoryError()
+
+    last = _min_index(len2, diag_hi)
+    prev_row[0] = 0
+    for j in range(1, last + 1):
+        prev_row[j] = prev_row[j - 1] + codes2.del_costs[j - 1]
+    if last < len2:
+        prev_row[last + 1] = INFINITY
+
+    with nogil:
+        for i in range(1, len1 + 1):
+            del_cost1 = codes1.del_costs[i - 1]
+            char1 = codes1.chars[i - 1]
+            group1 = codes1.groups[i - 1]
+            first = i + diag_lo
+            last = _min_index(len2, i + diag_hi)
+            if first <= 0:
+                curr_row[0] = 0 if local else prev_row[0] + del_cost1
+                first = 1
+            else:
+                curr_row[first - 1] = INFINITY
+            row_min = curr_row[first - 1]
+            for j in range(first, last + 1):
+                curr_row[j] = _min_three(prev_row[j] + del_cost1,
+                                         curr_row[j - 1] + codes2.del_costs[j - 1],
+                                         prev_row[j - 1] + _replace_cost(char1, group1, codes2.chars[j - 1],
+                                                                         codes2.groups[j - 1], match_cost,
+                                                                         group_cost, mismatch_cost))
+                row_min = _min_two(row_min, curr_row[j])
+            if last < len2:
+                curr_row[last + 1] = INFINITY
+            if max_dist >= 0 and row_min > max_dist:
+                break
+            tmp_row = prev_row
+            prev_row = curr_row
+            curr_row = tmp_row
+
+    score = max_dist + 1 if max_dist >= 0 and row_min > max_dist else prev_row[len2]
+    free(prev_row)
+    free(curr_row)
+    return score
+
+
+cdef inline double _replace_cost(Py_UCS4 char1, int group1, Py_UCS4 char2, int group2, double match_cost,
+                                 double group_cost, double mismatch_cost) nogil:
+    # r(a, b) of Zobel & Dart
+    if char1 == char2:
+        return match_cost
+    if group1 >= 0 and group1 == group2:
+        return group_cost
+    return mismatch_cost
+
+
+cdef inline double _min_two(double a, double b) nogil:
+    return a if a <= b else b
+
+
+cdef inline Py_ssize_t _min_index(Py_ssize_t a, Py_ssize_t b) nogil:
+    return a if a <= b else b
+
+
+cdef int _compare_doubles(const void* a, const void* b) noexcept nogil:
+    cdef double x = (<double*> a)[0], y = (<double*> b)[0]
+    return (x > y) - (x < y)
+
+
+cdef inline double _min_three(double a, double b, double c) nogil:
+    cdef double min_value = a
+    if b < min_value:
+        min_value = b
+    if c < min_value:
+        min_value = c
+    return min_value
@@ -0,0 +1,18 @@
+from libc.stdint cimport uint64_t
+
+from py_stringmatching.similarity_measure.cython.cython_pattern_match cimport PatternMatchVector
+
+
+cdef float jaro_score(unicode string1, unicode string2, Py_ssize_t min_common=*) except? -1
+cdef Py_ssize_t jaro_common_bound(unicode string1, unicode string2)
+cdef unicode as_unicode(object string)
+
+
+cdef class JaroPattern:
+    cdef unicode pattern
+    cdef Py_ssize_t words
+    cdef PatternMatchVector* blocks
+    cdef uint64_t* flags
+    cdef Py_UCS4* matched
+
+    cdef float score(self, unicode string1, Py_ssize_t min_common) except? -1
@@ -1,61 +1,247 @@
+# cython: boundscheck=False
+# cython: wraparound=False
 
-from py_stringmatching.similarity_measure.cython.cython_utils import int_max_two
 import numpy as np
 cimport numpy as np
+from libc.stdint cimport uint64_t
+from libc.stdlib cimport malloc, calloc, free
+from libc.string cimport memset
+
+from py_stringmatching.similarity_measure.cython.cython_pattern_match cimport \
+    PatternMatchVector, pm_clear, pm_insert, pm_get
+from py_stringmatching.similarity_measure.cython.cython_unicode cimport \
+    PyUnicode_KIND, PyUnicode_DATA, PyUnicode_READ
 
 
 #Cython functions to compute the Jaro score
 def jaro(unicode string1, unicode string2):
     """Computes the Jaro score between two strings.
+
+    The characters of string2 are encoded as match bit vectors, so that the
+    first unmatched occurrence of a character of string1 within the match
+    window is found with a few word operations: a single 64-bit word held on
+    the stack if string2 has at most 64 characters, blocks of words otherwise.
+    The matching is the same greedy one as the scan of the window, so the
+    score is unchanged.
+
         Args:
             string1,string2 (str): Input strings.
         Returns:
             Jaro distance score (float).
     """
+    return jaro_score(string1, string2)
 
 
-    cdef int len_str1 = len(string1), len_str2 = len(string2)
-    cdef int max_len = int_max_two(len_str1, len_str2)
-    cdef int search_range = (max_len // 2) - 1
+def jaro_batch(unicode query, candidates):
+    """Computes the Jaro scores between a query and many candidates.
 
-    if search_range < 0:
-        search_range = 0
+    The match vectors of the query are built once and reused for every
+    candidate, and the candidates are processed in a single compiled loop.
+    The Jaro score is symmetric, so the query is used as the pattern.
+
+    Args:
+        query (unicode): Input unicode string.
+        candidates (sequence): Candidate strings (unicode, or utf-8 encoded bytes).
 
-    # populating numpy arrays of length as each string with zeros
-    cdef int[:] flags_s1 = np.zeros(len_str1, dtype=np.int32)
-    cdef int[:] flags_s2 = np.zeros(len_str2, dtype=np.int32)
+    Returns:
+        Jaro scores (NumPy float64 array), 0.0 for the empty strings.
 
-    cdef int common_chars = 0, low = 0, high = 0, i = 0, j = 0
+    Raises:
+        TypeError : If one of the candidates is not a string.
+    """
+    cdef Py_ssize_t num_candidates = len(candidates)
+    cdef Py_ssize_t i = 0
+    cdef double[:] scores = np.empty(num_candidates, dtype=np.float64)
+    cdef JaroPattern pattern = JaroPattern(query)
+    cdef unicode candidate
+
+    for i in range(num_candidates):
+        candidate = as_unicode(candidates[i])
+        if len(query) == 0 or len(candidate) == 0:
+            scores[i] = 0.0
+        else:
+            scores[i] = pattern.score(candidate, 0)
+
+    return np.asarray(scores)
+
+
+cdef float jaro_score(unicode string1, unicode string2, Py_ssize_t min_common=0) except? -1:
+    # C level entry point, also used by the Jaro-Winkler kernel. If the pair
+    # can not have min_common common characters, the scan is stopped and 0 is
+    # returned.
+    cdef int kind2 = PyUnicode_KIND(string2)
+    cdef void* data2 = PyUnicode_DATA(string2)
+    cdef Py_ssize_t len_str2 = len(string2)
+    cdef Py_ssize_t words = (len_str2 + 63) // 64
+    cdef PatternMatchVector pm_word
+    cdef uint64_t flags_word = 0
+    cdef Py_UCS4 matched_word[64]
+    cdef PatternMatchVector* pm
+    cdef uint64_t* flags_s2
+    cdef Py_UCS4* matched1
+    cdef Py_ssize_t j = 0
+
+    if len_str2 <= 64:
+        pm_clear(&pm_word)
+        for j in range(len_str2):
+            pm_insert(&pm_word, PyUnicode_READ(kind2, data2, j), (<uint64_t>1) << j)
+        return _jaro_pm(string1, string2, &pm_word, &flags_word, matched_word, min_common)
+
+    pm = <PatternMatchVector*> calloc(words, sizeof(PatternMatchVector))
+    flags_s2 = <uint64_t*> calloc(words, sizeof(uint64_t))
+    matched1 = <Py_UCS4*> malloc(len_str2 * sizeof(Py_UCS4))
+    try:
+        if pm == NULL or flags_s2 == NULL or matched1 == NULL:
+            raise MemoryError()
+        for j in range(len_str2):
+            pm_insert(&pm[j // 64], PyUnicode_READ(kind2, data2, j), (<uint64_t>1) << (j % 64))
+        return _jaro_pm(string1, string2, pm, flags_s2, matched1, min_common)
+    finally:
+        free(pm)
+        free(flags_s2)
+        free(matched1)
+
+
+cdef Py_ssize_t jaro_common_bound(unicode string1, unicode string2):
+    # Upper bound on the number of common characters of the two strings: the
+    # size of the intersection of their character multisets. Characters above
+    # Latin-1 are not told apart, which keeps the bound valid.
+    cdef int kind1 = PyUnicode_KIND(string1), kind2 = PyUnicode_KIND(string2)
+    cdef void* data1 = PyUnicode_DATA(string1)
+    cdef void* data2 = PyUnicode_DATA(string2)
+    cdef Py_ssize_t counts[256]
+    cdef Py_ssize_t other1 = 0, other2 = 0, bound = 0, i = 0
+    cdef Py_UCS4 ch
+
+    memset(counts, 0, sizeof(counts))
+    for i in range(len(string1)):
+        ch = PyUnicode_READ(kind1, data1, i)
+        if ch < 256:
+            counts[ch] += 1
+        else:
+            other1 += 1
+    for i in range(len(string2)):
+        ch = PyUnicode_READ(kind2, data2, i)
+        if ch < 256:
+            if counts[ch] > 0:
+                counts[ch] -= 1
+                bound += 1
+        else:
+            other2 += 1
+    return bound + (other1 if other1 < other2 else other2)
+
+
+cdef unicode as_unicode(object string):
+    if isinstance(string, unicode):
+        return <unicode>string
+    if isinstance(string, bytes):
+        return (<bytes>string).decode('utf-8')
+    raise TypeError('Candidates are expected to be strings')
+
+
+cdef class JaroPattern:
+    # Match vectors of a string used as string2 of many Jaro computations,
+    # one PatternMatchVector per 64 characters, with the buffers of the scan.
+
+    def __cinit__(self, unicode pattern):
+        cdef int kind = PyUnicode_KIND(pattern)
+        cdef void* data = PyUnicode_DATA(pattern)
+        cdef Py_ssize_t i = 0
+        self.pattern = pattern
+        self.words = (len(pattern) + 63) // 64
+        if self.words == 0:
+            self.words = 1
+        self.blocks = <PatternMatchVector*> calloc(self.words, sizeof(PatternMatchVector))
+        self.flags = <uint64_t*> malloc(self.words * sizeof(uint64_t))
+        self.matched = <Py_UCS4*> malloc((len(pattern) + 1) * sizeof(Py_UCS4))
+        if self.blocks == NULL or self.flags == NULL or self.matched == NULL:
+            raise MemoryError()
+        for i in range(len(pattern)):
+            pm_insert(&self.blocks[i // 64], PyUnicode_READ(kind, data, i), (<uint64_t>1) << (i % 64))
+
+    def __dealloc__(self):
+        free(self.blocks)
+        free(self.flags)
+        free(self.matched)
+
+    cdef float score(self, unicode string1, Py_ssize_t min_common) except? -1:
+        # Jaro score of string1 and the pattern, see jaro_score for min_common
+        memset(self.flags, 0, self.words * sizeof(uint64_t))
+        return _jaro_pm(string1, self.pattern, self.blocks, self.flags, self.matched, min_common)
+
+
+cdef inline uint64_t _bits_from(Py_ssize_t low) nogil:
+    # bits low..63 set, low in [0, 63]
+    return ~(<uint64_t>0) << low
+
+
+cdef inline uint64_t _bits_to(Py_ssize_t high) nogil:
+    # bits 0..high set, high in [0, 63]
+    return ~(<uint64_t>0) >> (63 - high)
+
+
+cdef float _jaro_pm(unicode string1, unicode string2, PatternMatchVector* pm, uint64_t* flags_s2,
+                    Py_UCS4* matched1, Py_ssize_t min_common):
+    # pm holds the match vectors of string2, one block per 64 characters,
+    # flags_s2 one zeroed word per block and matched1 room for
+    # min(len(string1), len(string2)) characters
+    cdef int kind1 = PyUnicode_KIND(string1), kind2 = PyUnicode_KIND(string2)
+    cdef void* data1 = PyUnicode_DATA(string1)
+    cdef void* data2 = PyUnicode_DATA(string2)
+    cdef Py_ssize_t len_str1 = len(string1), len_str2 = len(string2)
+    cdef Py_ssize_t max_len = len_str1 if len_str1 > len_str2 else len_str2
+    cdef Py_ssize_t search_range = (max_len // 2) - 1
+    cdef uint64_t candidates = 0
+    cdef Py_ssize_t common_chars = 0, trans_count = 0, low = 0, high = 0, i = 0, j = 0, w = 0
+    cdef Py_ssize_t low_word = 0, high_word = 0
+    cdef Py_UCS4 ch
 
-    # Finding the number of common characters in two strings
-    for i from 0 <= i < len_str1:
+    if search_range < 0:
+        search_range = 0
+
+    # Finding the common characters, the first unmatched occurrence in the
+    # window being the lowest bit of the candidates, word by word through the
+    # window if string2 spans several words
+    for i in range(len_str1):
+        if common_chars + len_str1 - i < min_common:
+            return 0
         low = i - search_range if i > search_range else 0
         high = i + search_range if i + search_range < len_str2 else len_str2 - 1
-        for j from low <= j < (high + 1):
-            if flags_s2[j] == 0 and string2[j] == string1[i]:
-                flags_s1[i] = flags_s2[j] = 1
+        if low > high:
+            break
+        ch = PyUnicode_READ(kind1, data1, i)
+        if len_str2 <= 64:
+            candidates = pm_get(pm, ch) & ~flags_s2[0] & _bits_from(low) & _bits_to(high)
+            if candidates:
+                flags_s2[0] |= candidates & (~candidates + 1)
+                matched1[common_chars] = ch
+                common_chars += 1
+            continue
+        low_word = low // 64
+        high_word = high // 64
+        for w in range(low_word, high_word + 1):
+            candidates = pm_get(&pm[w], ch) & ~flags_s2[w]
+            if w == low_word:
+                candidates &= _bits_from(low % 64)
+            if w == high_word:
+                candidates &= _bits_to(high % 64)
+            if candidates:
+                flags_s2[w] |= candidates & (~candidates + 1)
+                matched1[common_chars] = ch
                 common_chars += 1
                 break
 
     if common_chars == 0:
         return 0
 
-    cdef int trans_count = 0, k = 0
-
-    # Finding the number of transpositions and Jaro distance
-    for i from 0 <= i < len_str1:
-        if flags_s1[i] == 1:
-            for j from k <= j < len_str2:
-                if flags_s2[j] == 1:
-                    k = j + 1
-                    break
-            if string1[i] != string2[j]:
+    # Finding the number of transpositions
+    i = 0
+    for j in range(len_str2):
+        if (flags_s2[j // 64] >> (j % 64)) & 1:
+            if matched1[i] != PyUnicode_READ(kind2, data2, j):
                 trans_count += 1
-    trans_count /= 2
-    cdef float score = (float(common_chars) / len_str1 + float(common_chars) / len_str2 +
-                         (float(common_chars) - trans_count) / float(common_chars)) / 3
-    return score
-
-
-
+            i += 1
+    trans_count = trans_count // 2
 
+    return (<double>common_chars / len_str1 + <double>common_chars / len_str2 +
+            (<double>common_chars - trans_count) / <double>common_chars) / 3
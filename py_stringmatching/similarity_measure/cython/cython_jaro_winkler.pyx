@@ -1,25 +1,125 @@
+import numpy as np
+cimport numpy as np
+from libc.math cimport ceil
 
-from py_stringmatching.similarity_measure.cython.cython_utils import int_min_two
-from py_stringmatching.similarity_measure.cython.cython_jaro import jaro
+from py_stringmatching.similarity_measure.cython.cython_jaro cimport \
+    jaro_score, jaro_common_bound, as_unicode, JaroPattern
+from py_stringmatching.similarity_measure.cython.cython_unicode cimport \
+    PyUnicode_KIND, PyUnicode_DATA, PyUnicode_READ
 
 
-def jaro_winkler(unicode string1, unicode string2, float prefix_weight):
+def jaro_winkler(unicode string1, unicode string2, float prefix_weight, min_sim=None):
     """Function to find the Jaro Winkler distance between two strings.
+
+    If min_sim is given, the pairs whose score is below min_sim are rejected
+    as early as possible and 0.0 is returned for them. The score is a
+    non-decreasing function of the Jaro score for a given common prefix, so
+    min_sim translates into a minimum number of common characters. That
+    minimum is checked against the length of the shorter string, then
+    against the common characters of the two strings regardless of their
+    positions, and the match scan stops once it can no longer be reached.
+
     Args:
         string1,string2 (unicode), prefix_weight (float): Input strings and prefix weight.
+        min_sim (float): Minimum score of interest (defaults to None).
     Returns:
         Jaro Winkler distance score (float)
     """
+    return _jaro_winkler(string1, string2, None, prefix_weight, min_sim is not None,
+                         min_sim if min_sim is not None else 0.0)
+
+
+def jaro_winkler_batch(unicode query, candidates, float prefix_weight, min_sim=None):
+    """Computes the Jaro Winkler scores between a query and many candidates.
+
+    The match vectors of the query are built once and reused for every
+    candidate, and the candidates are processed in a single compiled loop.
+
+    Args:
+        query (unicode): Input unicode string.
+        candidates (sequence): Candidate strings (unicode, or utf-8 encoded bytes).
+        prefix_weight (float): Prefix weight.
+        min_sim (float): Minimum score of interest (defaults to None). Scores
+                         below min_sim are reported as 0.0.
+
+    Returns:
+        Jaro Winkler scores (NumPy float64 array), 0.0 for the empty strings.
+
+    Raises:
+        TypeError : If one of the candidates is not a string.
+    """
+    cdef Py_ssize_t num_candidates = len(candidates)
+    cdef Py_ssize_t i = 0
+    cdef bint bounded = min_sim is not None
+    cdef double threshold = min_sim if bounded else 0.0
+    cdef double[:] scores = np.empty(num_candidates, dtype=np.float64)
+    cdef JaroPattern pattern = JaroPattern(query)
+    cdef unicode candidate
+
+    for i in range(num_candidates):
+        candidate = as_unicode(candidates[i])
+        if len(query) == 0 or len(candidate) == 0:
+            scores[i] = 0.0
+        else:
+            scores[i] = _jaro_winkler(candidate, query, pattern, prefix_weight, bounded, threshold)
+
+    return np.asarray(scores)
+
+
+cdef float _jaro_winkler(unicode string1, unicode string2, JaroPattern pattern, float prefix_weight,
+                         bint bounded, double min_sim) except? -1:
+    # pattern, if given, holds the match vectors of string2
+    cdef int kind1 = PyUnicode_KIND(string1), kind2 = PyUnicode_KIND(string2)
+    cdef void* data1 = PyUnicode_DATA(string1)
+    cdef void* data2 = PyUnicode_DATA(string2)
+    cdef Py_ssize_t len_str1 = len(string1), len_str2 = len(string2)
     cdef int i = 0
-    cdef float jw_score = jaro(string1, string2)
-    cdef int min_len = int_min_two(len(string1), len(string2))
-    cdef int j = int_min_two(min_len, 4)
+    cdef float jw_score = 0
+    cdef int min_len = len_str1 if len_str1 < len_str2 else len_str2
+    cdef int j = min_len if min_len < 4 else 4
+    cdef Py_ssize_t min_common = 0
 
-    #Finding the Jaro Winkler distance between two strings
-    while i < j and string1[i] == string2[i]:
+    #Finding the common prefix, up to 4 characters
+    while i < j and PyUnicode_READ(kind1, data1, i) == PyUnicode_READ(kind2, data2, i):
         i += 1
+
+    if bounded:
+        min_common = _get_min_common(len_str1, len_str2, i * prefix_weight, min_sim)
+        if min_common > min_len:
+            return 0.0
+        if min_common > 0 and jaro_common_bound(string1, string2) < min_common:
+            return 0.0
+
+    if pattern is None:
+        jw_score = jaro_score(string1, string2, min_common)
+    else:
+        jw_score = pattern.score(string1, min_common)
+    if min_common > 0 and jw_score == 0:
+        return 0.0
+
+    #Finding the Jaro Winkler distance between two strings
     if i != 0:
         jw_score += i * prefix_weight * (1 - jw_score)
 
+    if bounded and jw_score < min_sim:
+        return 0.0
     return jw_score
 
+
+cdef Py_ssize_t _get_min_common(Py_ssize_t len_str1, Py_ssize_t len_str2, double prefix_bonus,
+                                double min_sim):
+    # Smallest number of common characters a pair needs to score min_sim,
+    # given the prefix bonus. With c common characters, the Jaro score is at
+    # most (c / len_str1 + c / len_str2 + 1) / 3. The small tolerance keeps
+    # the bound from rejecting pairs whose score is rounded up to min_sim.
+    cdef double min_jaro, min_chars
+
+    if prefix_bonus >= 1 or len_str1 == 0 or len_str2 == 0:
+        return 0
+    min_jaro = (min_sim - 1e-6 - prefix_bonus) / (1 - prefix_bonus)
+    if min_jaro <= 0:
+        return 0
+    min_chars = (3 * min_jaro - 1) / (1.0 / len_str1 + 1.0 / len_str2)
+    if min_chars <= 1:
+        return 1
+    return <Py_ssize_t>ceil(min_chars - 1e-9)
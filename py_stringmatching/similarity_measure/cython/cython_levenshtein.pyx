@@ -1,56 +1,520 @@
 # cython: boundscheck=False
+# cython: wraparound=False
 
 from __future__ import division
 import cython
 import numpy as np
 cimport numpy as np
-from py_stringmatching.similarity_measure.cython.cython_utils import int_min_three
-from numpy import int32
-from numpy cimport int32_t
+from libc.stdint cimport uint64_t
+from libc.stdlib cimport malloc, calloc, free
 
-DTYPE = np.int
-ctypedef np.int_t DTYPE_t
+from py_stringmatching.similarity_measure.cython.cython_pattern_match cimport \
+    PatternMatchVector, pm_clear, pm_insert, pm_get
+from py_stringmatching.similarity_measure.cython.cython_unicode cimport \
+    ucs_t, Py_UCS1, Py_UCS2, PyUnicode_KIND, PyUnicode_DATA, PyUnicode_READ, \
+    PyUnicode_1BYTE_KIND, PyUnicode_2BYTE_KIND
 
-@cython.boundscheck(False)
-@cython.wraparound(False)
 
+def levenshtein(unicode string1, unicode string2, max_dist=None):
+    """Computes the Levenshtein distance between two strings.
 
+    The common prefix and suffix of the strings are stripped first. The
+    remainder is computed with the bit-parallel algorithm of Myers, in the
+    formulation of Hyyro, using the shorter string as the pattern: a single
+    64-bit word if it has at most 64 characters, blocks of words otherwise.
 
-def levenshtein(unicode string1, unicode string2):
+    If max_dist is given, pairs whose lengths differ by more than max_dist are
+    rejected right away, long patterns are computed on a diagonal band of
+    the DP matrix only (Ukkonen), and the computation stops as soon as the
+    distance can no longer be within max_dist.
 
-    cdef int len_str1 = len(string1)
-    cdef int len_str2 = len(string2)
+    Args:
+        string1, string2 (unicode): Input unicode strings.
+        max_dist (int): Maximum distance of interest (defaults to None, which
+                        means unbounded).
 
-    cdef int ins_cost = 1
-    cdef int del_cost = 1
-    cdef int sub_cost = 1
-    cdef int trans_cost = 1
+    Returns:
+        Levenshtein distance (int). If max_dist is given and the distance
+        exceeds it, max_dist + 1 is returned instead.
 
-    cdef int i = 0
-    cdef int j = 0
+    References:
+        * G. Myers. A fast bit-vector algorithm for approximate string matching based on dynamic programming. 1999.
+        * H. Hyyro. A bit-vector algorithm for computing Levenshtein and Damerau edit distances. 2003.
+        * E. Ukkonen. Algorithms for approximate string matching. 1985.
+    """
+    cdef Py_ssize_t len_str1 = len(string1)
+    cdef Py_ssize_t len_str2 = len(string2)
+    cdef Py_ssize_t prefix = 0, suffix = 0
+    cdef Py_ssize_t bound = -1 if max_dist is None else max_dist
+    cdef int kind1 = PyUnicode_KIND(string1), kind2 = PyUnicode_KIND(string2)
+    cdef void* data1 = PyUnicode_DATA(string1)
+    cdef void* data2 = PyUnicode_DATA(string2)
+
+    if bound >= 0 and abs(len_str1 - len_str2) > bound:
+        return bound + 1
+
+    # strip the common prefix and suffix, they never contribute to the distance
+    while (prefix < len_str1 and prefix < len_str2 and
+           PyUnicode_READ(kind1, data1, prefix) == PyUnicode_READ(kind2, data2, prefix)):
+        prefix += 1
+    while (suffix < len_str1 - prefix and suffix < len_str2 - prefix and
+           PyUnicode_READ(kind1, data1, len_str1 - suffix - 1) ==
+           PyUnicode_READ(kind2, data2, len_str2 - suffix - 1)):
+        suffix += 1
+    len_str1 -= prefix + suffix
+    len_str2 -= prefix + suffix
+
+    # use the shorter string as the pattern, so that it needs fewer words
+    if len_str1 > len_str2:
+        string1, string2 = string2, string1
+        len_str1, len_str2 = len_str2, len_str1
 
     if len_str1 == 0:
-        return len_str2 * ins_cost
+        return len_str2
+    if bound == 0:
+        # the stripped strings are not empty, so they differ
+        return 1
+
+    # the band pays off only if it is narrow: a DP cell costs about a quarter
+    # of a 64-bit word update, so it must hold fewer than four cells per word
+    if len_str1 > 64 and bound >= 0 and 2 * bound + 1 < len_str1 // 16:
+        return _levenshtein_ukkonen(string1, string2, prefix, len_str1, len_str2, bound)
+    return _levenshtein_bit_parallel(string1, prefix, len_str1, string2, prefix, len_str2, bound)
+
+
+def levenshtein_batch(unicode query, candidates, max_dist=None):
+    """Computes the Levenshtein distances between a query and many candidates.
+
+    The match vectors of the query are built once and reused for every
+    candidate, and the candidates are processed in a single compiled loop.
+
+    Args:
+        query (unicode): Input unicode string.
+        candidates (sequence): Candidate strings (unicode, or utf-8 encoded bytes).
+        max_dist (int): Maximum distance of interest (defaults to None, which
+                        means unbounded).
+
+    Returns:
+        Levenshtein distances (NumPy int64 array), where distances over
+        max_dist are reported as max_dist + 1.
+
+    Raises:
+        TypeError : If one of the candidates is not a string.
+    """
+    cdef Py_ssize_t num_candidates = len(candidates)
+    cdef Py_ssize_t len_query = len(query), len_candidate = 0
+    cdef Py_ssize_t bound = -1 if max_dist is None else max_dist
+    cdef Py_ssize_t i = 0
+    cdef np.int64_t[:] scores = np.empty(num_candidates, dtype=np.int64)
+    cdef unicode candidate
+    cdef _PatternBlocks pm = _PatternBlocks(query, 0, len_query)
+
+    for i in range(num_candidates):
+        candidate = _as_unicode(candidates[i])
+        len_candidate = len(candidate)
+        if bound >= 0 and abs(len_query - len_candidate) > bound:
+            scores[i] = bound + 1
+        elif len_query == 0 or len_candidate == 0:
+            scores[i] = len_query + len_candidate
+        else:
+            scores[i] = _levenshtein_hyrroe2003_pm(pm, candidate, 0, len_candidate, bound)
+
+    return np.asarray(scores)
+
+
+def levenshtein_sim_batch(unicode query, candidates, min_sim=None):
+    """Computes the normalized Levenshtein similarities between a query and many candidates.
+
+    Args:
+        query (unicode): Input unicode string.
+        candidates (sequence): Candidate strings (unicode, or utf-8 encoded bytes).
+        min_sim (float): Minimum similarity of interest (defaults to None).
+                         Similarities below min_sim are reported as 0.0.
+
+    Returns:
+        Normalized Levenshtein similarities (NumPy float64 array).
+
+    Raises:
+        TypeError : If one of the candidates is not a string.
+    """
+    cdef Py_ssize_t num_candidates = len(candidates)
+    cdef Py_ssize_t len_query = len(query), len_candidate = 0, max_len = 0
+    cdef Py_ssize_t bound = -1, dist = 0
+    cdef bint bounded = min_sim is not None
+    cdef double threshold = min_sim if bounded else 0.0
+    cdef double score = 0.0
+    cdef Py_ssize_t i = 0
+    cdef double[:] scores = np.empty(num_candidates, dtype=np.float64)
+    cdef unicode candidate
+    cdef _PatternBlocks pm = _PatternBlocks(query, 0, len_query)
+
+    for i in range(num_candidates):
+        candidate = _as_unicode(candidates[i])
+        len_candidate = len(candidate)
+        max_len = len_query if len_query > len_candidate else len_candidate
+        if max_len == 0:
+            score = 1.0
+        else:
+            if bounded:
+                # see Levenshtein.get_sim_score for the tolerance
+                bound = <Py_ssize_t>((1 - threshold) * max_len + 1e-9)
+            if bounded and bound < 0:
+                score = 0.0
+            else:
+                if bounded and abs(len_query - len_candidate) > bound:
+                    dist = bound + 1
+                elif len_query == 0 or len_candidate == 0:
+                    dist = max_len
+                else:
+                    dist = _levenshtein_hyrroe2003_pm(pm, candidate, 0, len_candidate, bound)
+                score = 1 - (<double>dist / max_len)
+        if bounded and score < threshold:
+            score = 0.0
+        scores[i] = score
+
+    return np.asarray(scores)
+
+
+cdef inline unicode _as_unicode(object string):
+    if isinstance(string, unicode):
+        return <unicode>string
+    if isinstance(string, bytes):
+        return (<bytes>string).decode('utf-8')
+    raise TypeError('Candidates are expected to be strings')
+
+
+cdef class _PatternBlocks:
+    # Match vectors of a pattern, one PatternMatchVector per 64 characters.
+    cdef PatternMatchVector* blocks
+    cdef Py_ssize_t words
+    cdef Py_ssize_t length
+
+    def __cinit__(self, unicode pattern, Py_ssize_t offset, Py_ssize_t length):
+        cdef int kind = PyUnicode_KIND(pattern)
+        cdef void* data = PyUnicode_DATA(pattern)
+        cdef Py_ssize_t i = 0
+        self.length = length
+        self.words = (length + 63) // 64
+        self.blocks = <PatternMatchVector*> calloc(self.words if self.words > 0 else 1,
+                                                   sizeof(PatternMatchVector))
+        if self.blocks == NULL:
+            raise MemoryError()
+        for i in range(length):
+            pm_insert(&self.blocks[i // 64], PyUnicode_READ(kind, data, offset + i),
+                      (<uint64_t>1) << (i % 64))
+
+    def __dealloc__(self):
+        free(self.blocks)
+
+
+cdef Py_ssize_t _levenshtein_bit_parallel(unicode pattern, Py_ssize_t p_offset, Py_ssize_t len_pattern,
+                                          unicode text, Py_ssize_t t_offset, Py_ssize_t len_text,
+                                          Py_ssize_t max_dist) except -1:
+    # builds the match vectors of the pattern and runs the bit-parallel kernel
+    cdef PatternMatchVector pm
+    cdef int kind = PyUnicode_KIND(pattern)
+    cdef void* data = PyUnicode_DATA(pattern)
+    cdef Py_ssize_t i = 0
+    if len_pattern <= 64:
+        pm_clear(&pm)
+        for i in range(len_pattern):
+            pm_insert(&pm, PyUnicode_READ(kind, data, p_offset + i), (<uint64_t>1) << i)
+        return _levenshtein_bit_parallel_text(&pm, 1, len_pattern, text, t_offset, len_text, max_dist)
+    return _levenshtein_hyrroe2003_pm(_PatternBlocks(pattern, p_offset, len_pattern),
+                                      text, t_offset, len_text, max_dist)
+
+
+cdef Py_ssize_t _levenshtein_hyrroe2003_pm(_PatternBlocks pm, unicode text, Py_ssize_t offset,
+                                           Py_ssize_t len_text, Py_ssize_t max_dist) except -1:
+    return _levenshtein_bit_parallel_text(pm.blocks, pm.words, pm.length, text, offset, len_text, max_dist)
+
+
+cdef Py_ssize_t _levenshtein_bit_parallel_text(PatternMatchVector* pm, Py_ssize_t words,
+                                               Py_ssize_t len_pattern, unicode text, Py_ssize_t offset,
+                                               Py_ssize_t len_text, Py_ssize_t max_dist) except -1:
+    # dispatches on the number of words of a non-empty pattern and on the
+    # code unit width of the text
+    cdef int kind = PyUnicode_KIND(text)
+    cdef void* data = PyUnicode_DATA(text)
+    if words == 1:
+        if kind == PyUnicode_1BYTE_KIND:
+            return _levenshtein_hyrroe2003(pm, len_pattern, <Py_UCS1*>data + offset, len_text, max_dist)
+        elif kind == PyUnicode_2BYTE_KIND:
+            return _levenshtein_hyrroe2003(pm, len_pattern, <Py_UCS2*>data + offset, len_text, max_dist)
+        return _levenshtein_hyrroe2003(pm, len_pattern, <Py_UCS4*>data + offset, len_text, max_dist)
+    if kind == PyUnicode_1BYTE_KIND:
+        return _levenshtein_hyrroe2003_block(pm, words, len_pattern, <Py_UCS1*>data + offset,
+                                             len_text, max_dist)
+    elif kind == PyUnicode_2BYTE_KIND:
+        return _levenshtein_hyrroe2003_block(pm, words, len_pattern, <Py_UCS2*>data + offset,
+                                             len_text, max_dist)
+    return _levenshtein_hyrroe2003_block(pm, words, len_pattern, <Py_UCS4*>data + offset,
+                                         len_text, max_dist)
+
+
+cdef Py_ssize_t _levenshtein_hyrroe2003(PatternMatchVector* pm, Py_ssize_t len_pattern,
+                                        ucs_t* text, Py_ssize_t len_text,
+                                        Py_ssize_t max_dist) nogil:
+    # single word version, len_pattern must be in [1, 64]. A negative max_dist
+    # means unbounded.
+    cdef uint64_t vp = ~(<uint64_t>0), vn = 0
+    cdef uint64_t x, d0, hp, hn
+    cdef uint64_t last = (<uint64_t>1) << (len_pattern - 1)
+    cdef Py_ssize_t dist = len_pattern
+    cdef Py_ssize_t j = 0
+
+    for j in range(len_text):
+        x = pm_get(pm, text[j])
+        d0 = (((x & vp) + vp) ^ vp) | x | vn
+        hp = vn | ~(d0 | vp)
+        hn = d0 & vp
+        if hp & last:
+            dist += 1
+        if hn & last:
+            dist -= 1
+        hp = (hp << 1) | 1
+        hn = hn << 1
+        vp = hn | ~(d0 | hp)
+        vn = hp & d0
+
+        # each remaining column can lower the distance by at most one
+        if max_dist >= 0 and dist - (len_text - j - 1) > max_dist:
+            return max_dist + 1
+
+    return dist
+
+
+cdef Py_ssize_t _levenshtein_hyrroe2003_block(PatternMatchVector* pm, Py_ssize_t words,
+                                              Py_ssize_t len_pattern, ucs_t* text,
+                                              Py_ssize_t len_text, Py_ssize_t max_dist) except -1:
+    # multi word version, the pattern is split into blocks of 64 characters
+    # and the horizontal deltas are carried from one block to the next
+    cdef uint64_t* vp = <uint64_t*> malloc(words * sizeof(uint64_t))
+    cdef uint64_t* vn = <uint64_t*> malloc(words * sizeof(uint64_t))
+    cdef uint64_t last = (<uint64_t>1) << ((len_pattern - 1) % 64)
+    cdef uint64_t x, d0, hp, hn, hp_carry, hn_carry, hp_carry_in, hn_carry_in
+    cdef Py_ssize_t dist = len_pattern
+    cdef Py_ssize_t j = 0, w = 0
+    cdef Py_UCS4 ch
+
+    if vp == NULL or vn == NULL:
+        free(vp)
+        free(vn)
+        raise MemoryError()
+
+    with nogil:
+        for w in range(words):
+            vp[w] = ~(<uint64_t>0)
+            vn[w] = 0
+
+        for j in range(len_text):
+            ch = text[j]
+            hp_carry = 1
+            hn_carry = 0
+            for w in range(words):
+                x = pm_get(&pm[w], ch) | hn_carry
+                d0 = (((x & vp[w]) + vp[w]) ^ vp[w]) | x | vn[w]
+                hp = vn[w] | ~(d0 | vp[w])
+                hn = d0 & vp[w]
+
+                hp_carry_in = hp_carry
+                hn_carry_in = hn_carry
+                if w < words - 1:
+                    hp_carry = hp >> 63
+                    hn_carry = hn >> 63
+                else:
+                    hp_carry = 1 if hp & last else 0
+                    hn_carry = 1 if hn & last else 0
+
+                hp = (hp << 1) | hp_carry_in
+                hn = (hn << 1) | hn_carry_in
+                vp[w] = hn | ~(d0 | hp)
+                vn[w] = hp & d0
+
+            dist += <Py_ssize_t>hp_carry - <Py_ssize_t>hn_carry
+
+            if max_dist >= 0 and dist - (len_text - j - 1) > max_dist:
+                dist = max_dist + 1
+                break
+
+    free(vp)
+    free(vn)
+    return dist
+
+
+cdef Py_ssize_t _levenshtein_ukkonen(unicode pattern, unicode text, Py_ssize_t offset,
+                                     Py_ssize_t len_pattern, Py_ssize_t len_text,
+                                     Py_ssize_t max_dist) except -1:
+    cdef int kind = PyUnicode_KIND(text)
+    cdef void* data = PyUnicode_DATA(text)
+    if kind == PyUnicode_1BYTE_KIND:
+        return _levenshtein_ukkonen_band(pattern, offset, len_pattern, <Py_UCS1*>data + offset,
+                                         len_text, max_dist)
+    elif kind == PyUnicode_2BYTE_KIND:
+        return _levenshtein_ukkonen_band(pattern, offset, len_pattern, <Py_UCS2*>data + offset,
+                                         len_text, max_dist)
+    return _levenshtein_ukkonen_band(pattern, offset, len_pattern, <Py_UCS4*>data + offset,
+                                     len_text, max_dist)
+
+
+cdef Py_ssize_t _levenshtein_ukkonen_band(unicode pattern, Py_ssize_t offset, Py_ssize_t len_pattern,
+                                          ucs_t* text, Py_ssize_t len_text,
+                                          Py_ssize_t max_dist) except -1:
+    # Two-row DP restricted to the diagonals that an alignment of cost at most
+    # max_dist can visit. Requires len_pattern <= len_text and
+    # len_text - len_pattern <= max_dist. Cells outside of the band hold
+    # max_dist + 1, which stands for "over the bound".
+    cdef int kind = PyUnicode_KIND(pattern)
+    cdef void* data = PyUnicode_DATA(pattern)
+    cdef Py_ssize_t over = max_dist + 1
+    cdef Py_ssize_t slack = (max_dist - (len_text - len_pattern)) // 2
+    cdef Py_ssize_t lo_diag = -slack
+    cdef Py_ssize_t hi_diag = len_text - len_pattern + slack
+    cdef Py_ssize_t* prev = <Py_ssize_t*> malloc((len_text + 1) * sizeof(Py_ssize_t))
+    cdef Py_ssize_t* curr = <Py_ssize_t*> malloc((len_text + 1) * sizeof(Py_ssize_t))
+    cdef Py_ssize_t* tmp
+    cdef Py_ssize_t i = 0, j = 0, j_lo = 0, j_hi = 0
+    cdef Py_ssize_t value = 0, row_min = 0
+    cdef Py_UCS4 ch
+
+    if prev == NULL or curr == NULL:
+        free(prev)
+        free(curr)
+        raise MemoryError()
+
+    for j in range(len_text + 1):
+        prev[j] = j if j <= hi_diag else over
+
+    for i in range(1, len_pattern + 1):
+        ch = PyUnicode_READ(kind, data, offset + i - 1)
+        j_lo = i + lo_diag if i + lo_diag > 0 else 0
+        j_hi = i + hi_diag if i + hi_diag < len_text else len_text
+
+        if j_lo == 0:
+            curr[0] = i
+            row_min = i
+            j_lo = 1
+        else:
+            curr[j_lo - 1] = over
+            row_min = over
+
+        for j in range(j_lo, j_hi + 1):
+            value = prev[j - 1] + (0 if text[j - 1] == ch else 1)
+            if prev[j] + 1 < value:
+                value = prev[j] + 1
+            if curr[j - 1] + 1 < value:
+                value = curr[j - 1] + 1
+            if value > over:
+                value = over
+            curr[j] = value
+            if value < row_min:
+                row_min = value
+        if j_hi < len_text:
+            curr[j_hi + 1] = over
+
+        # the distance can not decrease when moving down the matrix
+        if row_min > max_dist:
+            free(prev)
+            free(curr)
+            return over
+
+        tmp = prev
+        prev = curr
+        curr = tmp
+
+    value = prev[len_text]
+    free(prev)
+    free(curr)
+    return value
+
+
+def weighted_levenshtein(unicode string1, unicode string2, double ins_cost, double del_cost,
+                         double sub_cost, max_dist=None):
+    """Computes the Levenshtein distance between two strings with custom operation costs.
+
+    The distance is the minimum cost of transforming string1 into string2,
+    computed with two rows of the DP matrix.
+
+    Args:
+        string1, string2 (unicode): Input unicode strings.
+        ins_cost (float): Cost of inserting a character of string2.
+        del_cost (float): Cost of deleting a character of string1.
+        sub_cost (float): Cost of substituting a character of string1 by one of string2.
+        max_dist (float): Maximum distance of interest (defaults to None, which
+                          means unbounded).
+
+    Returns:
+        Weighted Levenshtein distance (float). If max_dist is given and the
+        distance exceeds it, max_dist + 1 is returned instead.
+    """
+    cdef Py_ssize_t len_str1 = len(string1), len_str2 = len(string2)
+    cdef double bound = -1 if max_dist is None else max_dist
+    cdef int kind2 = PyUnicode_KIND(string2)
+    cdef void* data2 = PyUnicode_DATA(string2)
+
+    if bound >= 0:
+        if len_str1 > len_str2 and (len_str1 - len_str2) * del_cost > bound:
+            return bound + 1
+        if len_str2 > len_str1 and (len_str2 - len_str1) * ins_cost > bound:
+            return bound + 1
+
+    if kind2 == PyUnicode_1BYTE_KIND:
+        return _weighted_levenshtein(string1, <Py_UCS1*>data2, len_str2, ins_cost, del_cost, sub_cost, bound)
+    elif kind2 == PyUnicode_2BYTE_KIND:
+        return _weighted_levenshtein(string1, <Py_UCS2*>data2, len_str2, ins_cost, del_cost, sub_cost, bound)
+    return _weighted_levenshtein(string1, <Py_UCS4*>data2, len_str2, ins_cost, del_cost, sub_cost, bound)
+
 
-    if len_str2 == 0:
-        return len_str1 * del_cost
+cdef double _weighted_levenshtein(unicode string1, ucs_t* string2, Py_ssize_t len_str2,
+                                  double ins_cost, double del_cost, double sub_cost,
+                                  double max_dist) except? -1:
+    # the rows follow string1, the columns string2. A negative max_dist
+    # means unbounded.
+    cdef int kind1 = PyUnicode_KIND(string1)
+    cdef void* data1 = PyUnicode_DATA(string1)
+    cdef Py_ssize_t len_str1 = len(string1)
+    cdef double* prev = <double*> malloc((len_str2 + 1) * sizeof(double))
+    cdef double* curr = <double*> malloc((len_str2 + 1) * sizeof(double))
+    cdef double* tmp
+    cdef double value = 0, row_min = 0
+    cdef Py_ssize_t i = 0, j = 0
+    cdef Py_UCS4 ch
 
-    cdef int[:,:] d_mat = np.zeros((len_str1 + 1, len_str2 + 1), dtype=np.int32)
+    if prev == NULL or curr == NULL:
+        free(prev)
+        free(curr)
+        raise MemoryError()
 
-    for i from 0 <= i < (len_str1 + 1):
-        d_mat[i, 0] = i * del_cost
+    for j in range(len_str2 + 1):
+        prev[j] = j * ins_cost
 
-    for j from 0 <= j < (len_str2 + 1):
-        d_mat[0, j] = j * ins_cost
+    for i in range(1, len_str1 + 1):
+        ch = PyUnicode_READ(kind1, data1, i - 1)
+        curr[0] = i * del_cost
+        row_min = curr[0]
+        for j in range(1, len_str2 + 1):
+            value = prev[j - 1] + (0 if string2[j - 1] == ch else sub_cost)
+            if prev[j] + del_cost < value:
+                value = prev[j] + del_cost
+            if curr[j - 1] + ins_cost < value:
+                value = curr[j - 1] + ins_cost
+            curr[j] = value
+            if value < row_min:
+                row_min = value
 
-    cdef unsigned char lchar = 0
-    cdef unsigned char rchar = 0
+        # costs are non-negative, so the distance can not go below the row minimum
+        if max_dist >= 0 and row_min > max_dist:
+            free(prev)
+            free(curr)
+            return max_dist + 1
 
-    for i from 0 <= i < (len_str1):
-        lchar = string1[i]
-        for j from 0 <= j < (len_str2):
-            rchar = string2[j]
+        tmp = prev
+        prev = curr
+        curr = tmp
 
-            d_mat[i+1,j+1] = int_min_three(d_mat[i + 1, j] + ins_cost, d_mat[i, j + 1] + del_cost, d_mat[i, j]
-                                        + (sub_cost if lchar != rchar else 0))
-    return d_mat[len_str1, len_str2]
+    value = prev[len_str2]
+    free(prev)
+    free(curr)
+    if max_dist >= 0 and value > max_dist:
+        return max_dist + 1
+    return value
@@ -1,43 +1,346 @@
 import cython
 import numpy as np
 cimport numpy as np
+from libc.math cimport INFINITY
+from libc.stdlib cimport malloc, free
+from py_stringmatching.similarity_measure.cython.cython_utils import cython_sim_ident
+from py_stringmatching.similarity_measure.cython.cython_substitution cimport SubstitutionTable
+from py_stringmatching.similarity_measure.cython.cython_unicode cimport \
+    ucs_t, Py_UCS1, Py_UCS2, PyUnicode_KIND, PyUnicode_DATA, PyUnicode_READ, \
+    PyUnicode_1BYTE_KIND, PyUnicode_2BYTE_KIND
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
 
 def needleman_wunsch(unicode string1, unicode string2, float gap_cost,
-                                                            sim_score):
+                                                            sim_score, min_score=None):
     """ Computes Needleman-Wunsch measure raw score.
     Args:
         string1, string2 (unicode): Input unicode strings
         gap_cost (float): Cost of gap
         sim_score (sim function): Similarity function given by user if not use default sim ident function
+        min_score (float): Minimum score of interest (defaults to None). If given, the DP stops as soon as the
+                           score is known to be below min_score
     Returns:
-        Returns Needleman-Wunsch similarity score (float)
+        Returns Needleman-Wunsch similarity score (float), or -inf if it is below min_score
     """
+    cdef int kind1 = PyUnicode_KIND(string1)
+    cdef void* data1 = PyUnicode_DATA(string1)
+    cdef int kind2 = PyUnicode_KIND(string2)
+    cdef void* data2 = PyUnicode_DATA(string2)
+    cdef SubstitutionTable table
 
+    # Only two rows of the DP matrix are kept, and they span the shorter
+    # string: the DP of the swapped strings is the transposed matrix, whose
+    # cells hold exactly the same values.
+    if min_score is not None:
+        table = SubstitutionTable(sim_score, string1, string2)
+        if len(string2) > len(string1):
+            return _needleman_wunsch_bounded(table.offsets2, len(string2), table.offsets1, len(string1),
+                                             table.scores, gap_cost, table.max_score, min_score)
+        return _needleman_wunsch_bounded(table.offsets1, len(string1), table.offsets2, len(string2),
+                                         table.scores, gap_cost, table.max_score, min_score)
+
+    if sim_score is not cython_sim_ident:
+        # the scores of the character pairs are looked up in a table, so that
+        # sim_score is not called on every cell
+        table = SubstitutionTable(sim_score, string1, string2)
+        if len(string2) > len(string1):
+            return _needleman_wunsch(table.offsets2, len(string2), table.offsets1, len(string1), table.scores,
+                                     gap_cost)
+        return _needleman_wunsch(table.offsets1, len(string1), table.offsets2, len(string2), table.scores,
+                                 gap_cost)
+
+    if len(string2) > len(string1):
+        string1, string2 = string2, string1
+        kind2 = kind1
+        data2 = data1
+
+    # with the identity function, the characters are compared directly in the
+    # string buffers, specialized on the code unit width of string2
+    if kind2 == PyUnicode_1BYTE_KIND:
+        return _needleman_wunsch_ident(string1, <Py_UCS1*>data2, len(string2), gap_cost)
+    elif kind2 == PyUnicode_2BYTE_KIND:
+        return _needleman_wunsch_ident(string1, <Py_UCS2*>data2, len(string2), gap_cost)
+    return _needleman_wunsch_ident(string1, <Py_UCS4*>data2, len(string2), gap_cost)
+
+
+def needleman_wunsch_banded(unicode string1, unicode string2, float gap_cost, sim_score, band=None,
+                            min_score=None):
+    """ Computes Needleman-Wunsch measure raw score over a band of the DP matrix.
+
+    Only the cells (i, j) with min(0, d) - band <= j - i <= max(0, d) + band,
+    where d = len(string2) - len(string1), are computed. An alignment
+    leaving the band has at least abs(d) + 2 * (band + 1) gaps, which bounds
+    its score given the best score of a pair of characters: if the score
+    within the band exceeds that bound, by more than the rounding errors of
+    the DP, it is the Needleman-Wunsch score. If
+    no band is given, the narrowest band whose bound is below min_score is
+    used, so that the score is exact as soon as it reaches min_score.
+
+    Args:
+        string1, string2 (unicode): Input unicode strings
+        gap_cost (float): Cost of gap
+        sim_score (sim function): Similarity function given by user if not use default sim ident function
+        band (int): Width of the band (defaults to None)
+        min_score (float): Minimum score of interest, from which the band is derived if it is not given
+                           (defaults to None, for the whole matrix)
+    Returns:
+        A tuple (score, exact) of the best score of the alignments within the band (float) and whether no
+        alignment leaving the band can score higher (bool)
+    """
+    cdef SubstitutionTable table = SubstitutionTable(sim_score, string1, string2)
+    cdef Py_ssize_t len_s1 = len(string1), len_s2 = len(string2)
+    cdef Py_ssize_t max_len = len_s1 if len_s1 > len_s2 else len_s2
+    cdef Py_ssize_t width = max_len
+    cdef double score = 0.0
+
+    if band is not None:
+        width = band if band < max_len else max_len
+    elif min_score is not None:
+        width = 0
+        while width < max_len and _get_outside_bound(len_s1, len_s2, width, table.max_score,
+                                                      gap_cost) >= min_score:
+            width += 1
+
+    score = _needleman_wunsch_banded(table.offsets1, len_s1, table.offsets2, len_s2, table.scores, gap_cost,
+                                     width)
+    return score, score >= _get_outside_bound(len_s1, len_s2, width, table.max_score, gap_cost)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double _needleman_wunsch(Py_ssize_t* offsets1, int len_s1, Py_ssize_t* offsets2, int len_s2,
+                              double* scores, float gap_cost) except? -1:
+    # the score of the i-th character of the first string and the j-th
+    # character of the second one is scores[offsets1[i] + offsets2[j]], see
+    # SubstitutionTable
     cdef int i = 0, j = 0
     cdef double match = 0.0, delete = 0.0, insert = 0.0
-    cdef double sim_func_score = 0.0
-    cdef int len_s1 = len(string1), len_s2 = len(string2)
-    cdef double[:,:] dist_mat = np.zeros((len(string1) + 1, len(string2) + 1), dtype=np.float)
+    cdef double* prev_row = <double*> malloc((len_s2 + 1) * sizeof(double))
+    cdef double* curr_row = <double*> malloc((len_s2 + 1) * sizeof(double))
+    cdef double* tmp_row
+    cdef double* row_scores
 
-    # DP initialization
-    for i from 0 <= i < (len_s1 + 1):
-        dist_mat[i, 0] = -(i * gap_cost)
+    if prev_row == NULL or curr_row == NULL:
+        free(prev_row)
+        free(curr_row)
+        raise MemoryError()
 
     # DP initialization
     for j from 0 <= j < (len_s2 + 1):
-        dist_mat[0, j] = -(j * gap_cost)
+        prev_row[j] = -(j * gap_cost)
+
+    # Needleman-Wunsch DP calculation
+    for i from 1 <= i < (len_s1 + 1):
+        row_scores = scores + offsets1[i - 1]
+        curr_row[0] = -(i * gap_cost)
+        for j from 1 <= j < (len_s2 + 1):
+            match = prev_row[j - 1] + row_scores[offsets2[j - 1]]
+            delete = prev_row[j] - gap_cost
+            insert = curr_row[j - 1] - gap_cost
+            curr_row[j] = max(match, delete, insert)
+        tmp_row = prev_row
+        prev_row = curr_row
+        curr_row = tmp_row
+
+    match = prev_row[len_s2]
+    free(prev_row)
+    free(curr_row)
+    return match
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double _needleman_wunsch_ident(unicode string1, ucs_t* string2, int len_s2,
+                                    float gap_cost) except? -1:
+    cdef int kind1 = PyUnicode_KIND(string1)
+    cdef void* data1 = PyUnicode_DATA(string1)
+    cdef int i = 0, j = 0
+    cdef double match = 0.0, delete = 0.0, insert = 0.0
+    cdef double sim_func_score = 0.0, score = 0.0
+    cdef int len_s1 = len(string1)
+    cdef double* prev_row = <double*> malloc((len_s2 + 1) * sizeof(double))
+    cdef double* curr_row = <double*> malloc((len_s2 + 1) * sizeof(double))
+    cdef double* tmp_row
+    cdef Py_UCS4 ch
 
+    if prev_row == NULL or curr_row == NULL:
+        free(prev_row)
+        free(curr_row)
+        raise MemoryError()
+
+    # DP initialization
+    for j from 0 <= j < (len_s2 + 1):
+        prev_row[j] = -(j * gap_cost)
 
     # Needleman-Wunsch DP calculation
     for i from 1 <= i < (len_s1 + 1):
+        ch = PyUnicode_READ(kind1, data1, i - 1)
+        curr_row[0] = -(i * gap_cost)
         for j from 1 <= j < (len_s2 + 1):
-            sim_func_score = sim_score(string1[i - 1], string2[j - 1])
-            match = dist_mat[i - 1, j - 1] + sim_func_score
-            delete = dist_mat[i - 1, j] - gap_cost
-            insert = dist_mat[i, j - 1] - gap_cost
-            dist_mat[i, j] = max(match, delete, insert)
+            sim_func_score = 1 if ch == string2[j - 1] else 0
+            match = prev_row[j - 1] + sim_func_score
+            delete = prev_row[j] - gap_cost
+            insert = curr_row[j - 1] - gap_cost
+            curr_row[j] = max(match, delete, insert)
+        tmp_row = prev_row
+        prev_row = curr_row
+        curr_row = tmp_row
+
+    score = prev_row[len_s2]
+    free(prev_row)
+    free(curr_row)
+    return score
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double _needleman_wunsch_bounded(Py_ssize_t* offsets1, Py_ssize_t len_s1, Py_ssize_t* offsets2,
+                                      Py_ssize_t len_s2, double* scores, float gap_cost, double max_score,
+                                      double min_score) except? -1:
+    # The same DP as _needleman_wunsch on the offsets of a SubstitutionTable,
+    # which stops as soon as no cell of the current row can lead to a score
+    # of min_score, and returns -INFINITY for the scores below min_score.
+    cdef Py_ssize_t i = 0, j = 0
+    cdef double match = 0.0, delete = 0.0, insert = 0.0, sim_func_score = 0.0
+    # the first row and column are multiples of the gap cost rounded to
+    # single precision, which the bounds do not follow
+    cdef double threshold = min_score - 1e-6 * (abs(min_score) + (len_s1 + len_s2) * abs(gap_cost) + 1)
+    cdef double* prev_row = <double*> malloc((len_s2 + 1) * sizeof(double))
+    cdef double* curr_row = <double*> malloc((len_s2 + 1) * sizeof(double))
+    cdef double* tmp_row
+
+    if prev_row == NULL or curr_row == NULL:
+        free(prev_row)
+        free(curr_row)
+        raise MemoryError()
+
+    # DP initialization
+    for j in range(len_s2 + 1):
+        prev_row[j] = -(j * gap_cost)
+
+    # Needleman-Wunsch DP calculation, checking the bound before each row
+    for i in range(1, len_s1 + 1):
+        if not _can_reach(prev_row, len_s1 - i + 1, len_s2, (i - 1) * len_s2 // len_s1, max_score, gap_cost,
+                          threshold):
+            free(prev_row)
+            free(curr_row)
+            return -INFINITY
+        curr_row[0] = -(i * gap_cost)
+        for j in range(1, len_s2 + 1):
+            if scores == NULL:
+                sim_func_score = 1 if offsets1[i - 1] == offsets2[j - 1] else 0
+            else:
+                sim_func_score = scores[offsets1[i - 1] + offsets2[j - 1]]
+            match = prev_row[j - 1] + sim_func_score
+            delete = prev_row[j] - gap_cost
+            insert = curr_row[j - 1] - gap_cost
+            curr_row[j] = max(match, delete, insert)
+        tmp_row = prev_row
+        prev_row = curr_row
+        curr_row = tmp_row
+
+    match = prev_row[len_s2]
+    free(prev_row)
+    free(curr_row)
+    return match if match >= min_score else -INFINITY
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef bint _can_reach(double* row, Py_ssize_t num_rows, Py_ssize_t len_s2, Py_ssize_t start, double max_score,
+                     double gap_cost, double threshold) nogil:
+    # Whether an alignment through one of the cells of a row, with num_rows
+    # rows left below it, can score threshold or more. From the j-th cell,
+    # the rest of the alignment has at most min(num_rows, len_s2 - j) pairs
+    # and at least abs(num_rows - len_s2 + j) gaps, and its bound is linear
+    # in the number of pairs, so it is largest at one end of their range. The
+    # cells are visited from the start-th one.
+    cdef Py_ssize_t j = 0, k = 0, num_cols = 0, num_pairs = 0, num_gaps = 0
+    for k in range(len_s2 + 1):
+        # from the cell on the main diagonal, where a good alignment usually is
+        j = start + k if start + k <= len_s2 else len_s2 - k
+        num_cols = len_s2 - j
+        num_pairs = num_rows if num_rows < num_cols else num_cols
+        num_gaps = num_rows + num_cols - 2 * num_pairs
+        if row[j] + max(num_pairs * max_score - num_gaps * gap_cost,
+                        -((num_rows + num_cols) * gap_cost)) >= threshold:
+            return True
+    return False
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double _needleman_wunsch_banded(Py_ssize_t* offsets1, Py_ssize_t len_s1, Py_ssize_t* offsets2,
+                                     Py_ssize_t len_s2, double* scores, float gap_cost,
+                                     Py_ssize_t band) except? -1:
+    # the scores are those of a SubstitutionTable. The cells left of and
+    # right of the band in a row are set to -INFINITY, so that the cells of
+    # the next row never take their values.
+    cdef Py_ssize_t i = 0, j = 0, j_lo = 0, j_hi = 0
+    cdef Py_ssize_t diag_lo = (len_s2 - len_s1 if len_s2 < len_s1 else 0) - band
+    cdef Py_ssize_t diag_hi = (len_s2 - len_s1 if len_s2 > len_s1 else 0) + band
+    cdef double match = 0.0, delete = 0.0, insert = 0.0, sim_func_score = 0.0
+    cdef double* prev_row = <double*> malloc((len_s2 + 2) * sizeof(double))
+    cdef double* curr_row = <double*> malloc((len_s2 + 2) * sizeof(double))
+    cdef double* tmp_row
+
+    if prev_row == NULL or curr_row == NULL:
+        free(prev_row)
+        free(curr_row)
+        raise MemoryError()
+
+    # DP initialization
+    j_hi = diag_hi if diag_hi < len_s2 else len_s2
+    for j in range(j_hi + 1):
+        prev_row[j] = -(j * gap_cost)
+    prev_row[j_hi + 1] = -INFINITY
+
+    # Needleman-Wunsch DP calculation, within the band
+    for i in range(1, len_s1 + 1):
+        j_lo = i + diag_lo if i + diag_lo > 0 else 0
+        j_hi = i + diag_hi if i + diag_hi < len_s2 else len_s2
+        if j_lo == 0:
+            curr_row[0] = -(i * gap_cost)
+            j_lo = 1
+        else:
+            curr_row[j_lo - 1] = -INFINITY
+        for j in range(j_lo, j_hi + 1):
+            if scores == NULL:
+                sim_func_score = 1 if offsets1[i - 1] == offsets2[j - 1] else 0
+            else:
+                sim_func_score = scores[offsets1[i - 1] + offsets2[j - 1]]
+            match = prev_row[j - 1] + sim_func_score
+            delete = prev_row[j] - gap_cost
+            insert = curr_row[j - 1] - gap_cost
+            curr_row[j] = max(match, delete, insert)
+        curr_row[j_hi + 1] = -INFINITY
+        tmp_row = prev_row
+        prev_row = curr_row
+        curr_row = tmp_row
+
+    match = prev_row[len_s2]
+    free(prev_row)
+    free(curr_row)
+    return match
+
 
-    return dist_mat[len_s1, len_s2]
\ No newline at end of file
+cdef double _get_outside_bound(Py_ssize_t len_s1, Py_ssize_t len_s2, Py_ssize_t band, double max_score,
+                               float gap_cost):
+    # Upper bound on the score of the alignments leaving the band. Such an
+    # alignment has num_gaps >= abs(len_s2 - len_s1) + 2 * (band + 1) gaps
+    # and (len_s1 + len_s2 - num_gaps) / 2 aligned pairs. Its bound is linear
+    # in num_gaps, so it is largest at one end of the range of num_gaps. The
+    # DP sums the same costs in different orders, and in single precision on
+    # the borders of the matrix, so an alignment scoring the bound exactly
+    # can come out slightly above it: the bound is raised by a margin
+    # covering these rounding errors, as the threshold of
+    # _needleman_wunsch_bounded is lowered by one.
+    cdef Py_ssize_t num_gaps = (len_s2 - len_s1 if len_s2 > len_s1 else len_s1 - len_s2) + 2 * (band + 1)
+    cdef Py_ssize_t total = len_s1 + len_s2
+    cdef double bound = 0.0
+    if len_s1 == 0 or len_s2 == 0 or num_gaps > total:
+        return -INFINITY
+    bound = max((total - num_gaps) / 2.0 * max_score - num_gaps * gap_cost, -(total * gap_cost))
+    return bound + 1e-6 * (abs(bound) + total * abs(gap_cost) + 1)
@@ -0,0 +1,55 @@
+# cython: boundscheck=False
+
+"""Per-character match bit vectors shared by the bit-parallel kernels.
+
+For a pattern of at most 64 characters, the match vector of a character c is a
+64-bit word whose i-th bit is set iff the i-th character of the pattern is c.
+Characters below 256 are looked up in a flat table; all other code points are
+kept in a small open-addressing hash map. Since a block holds at most 64
+distinct characters, a 128-slot map is never more than half full.
+"""
+
+from libc.stdint cimport uint64_t
+from libc.string cimport memset
+
+
+cdef struct PatternMatchVector:
+    uint64_t extended_ascii[256]
+    Py_UCS4 keys[128]
+    uint64_t values[128]
+
+
+cdef inline void pm_clear(PatternMatchVector* pm) nogil:
+    memset(pm, 0, sizeof(PatternMatchVector))
+
+
+cdef inline Py_ssize_t pm_slot(PatternMatchVector* pm, Py_UCS4 key) nogil:
+    # Lookup strategy borrowed from CPython's dict: a perturbed linear
+    # congruential probe sequence that eventually visits every slot.
+    cdef uint64_t perturb = <uint64_t>key
+    cdef Py_ssize_t i = perturb % 128
+
+    if pm.values[i] == 0 or pm.keys[i] == key:
+        return i
+
+    while True:
+        i = (i * 5 + perturb + 1) % 128
+        if pm.values[i] == 0 or pm.keys[i] == key:
+            return i
+        perturb >>= 5
+
+
+cdef inline void pm_insert(PatternMatchVector* pm, Py_UCS4 key, uint64_t mask) nogil:
+    cdef Py_ssize_t i
+    if key < 256:
+        pm.extended_ascii[key] |= mask
+    else:
+        i = pm_slot(pm, key)
+        pm.keys[i] = key
+        pm.values[i] |= mask
+
+
+cdef inline uint64_t pm_get(PatternMatchVector* pm, Py_UCS4 key) nogil:
+    if key < 256:
+        return pm.extended_ascii[key]
+    return pm.values[pm_slot(pm, key)]
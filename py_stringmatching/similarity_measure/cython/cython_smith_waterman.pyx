@@ -1,30 +1,475 @@
 import cython
 import numpy as np
 cimport numpy as np
+from libc.math cimport INFINITY
+from libc.stdlib cimport malloc, calloc, free
+from py_stringmatching.similarity_measure.cython.cython_utils import cython_sim_ident
+from py_stringmatching.similarity_measure.cython.cython_substitution cimport SubstitutionTable
+from py_stringmatching.similarity_measure.cython.cython_unicode cimport \
+    ucs_t, Py_UCS1, Py_UCS2, PyUnicode_KIND, PyUnicode_DATA, PyUnicode_READ, \
+    PyUnicode_1BYTE_KIND, PyUnicode_2BYTE_KIND
+
+ctypedef fused code_t:
+    Py_ssize_t
+    double
+
+
+# Both strings must have at least this many characters for the DP to be
+# computed by anti-diagonals. Below it, the alignment takes well under a
+# microsecond either way, and the row by row kernels avoid copying the
+# strings.
+cdef Py_ssize_t DIAGONAL_CUTOFF = 16
+
+# With a minimum score, the anti-diagonal kernel checks its bound once every
+# this many diagonals, since the check is not vectorized.
+cdef Py_ssize_t DIAGONAL_CHECK_INTERVAL = 64
+
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
 
 
 def smith_waterman(unicode string1, unicode string2, float gap_cost, \
-                                                             sim_func):
+                                                             sim_func, min_score=None):
+    """Computes the Smith-Waterman score.
+
+    Args:
+        string1, string2 (unicode): Input unicode strings.
+        gap_cost (float): Cost of gap.
+        sim_func (function): Similarity function.
+        min_score (float): Minimum score of interest (defaults to None). If given, the DP stops as soon as the
+                           score is known to be below min_score.
+    Returns:
+        The Smith-Waterman score (float), or -inf if it is below min_score.
+    """
+    cdef int kind1 = PyUnicode_KIND(string1)
+    cdef void* data1 = PyUnicode_DATA(string1)
+    cdef int kind2 = PyUnicode_KIND(string2)
+    cdef void* data2 = PyUnicode_DATA(string2)
+    cdef SubstitutionTable table
+    cdef bint diagonal = len(string1) >= DIAGONAL_CUTOFF and len(string2) >= DIAGONAL_CUTOFF
+    cdef double* codes1 = NULL
+    cdef double* codes2 = NULL
+    cdef double score = 0.0, gain = 0.0, threshold = 0.0
+
+    # Long strings are aligned by anti-diagonals. Otherwise only two rows of
+    # the DP matrix are kept, and they span the shorter string: the DP of the
+    # swapped strings is the transposed matrix, whose cells hold exactly the
+    # same values.
+    if min_score is not None:
+        table = SubstitutionTable(sim_func, string1, string2)
+        # the most an alignment can gain per pair of characters, and the
+        # threshold of the bounds, which do not follow the rounding of the
+        # cells
+        gain = table.max_score if table.max_score > 0 else 0
+        threshold = min_score - 1e-9 * (abs(min_score) + 1)
+        if diagonal and sim_func is cython_sim_ident:
+            try:
+                codes1 = _get_code_points(string1)
+                codes2 = _get_code_points(string2)
+                score = _smith_waterman_diagonal(codes1, len(string1), codes2, len(string2), NULL, gap_cost,
+                                                 gain, threshold)
+            finally:
+                free(codes1)
+                free(codes2)
+        elif diagonal:
+            score = _smith_waterman_diagonal(table.offsets1, len(string1), table.offsets2, len(string2),
+                                             table.scores, gap_cost, gain, threshold)
+        elif len(string2) > len(string1):
+            score = _smith_waterman_bounded(table.offsets2, len(string2), table.offsets1, len(string1),
+                                            table.scores, gap_cost, gain, threshold)
+        else:
+            score = _smith_waterman_bounded(table.offsets1, len(string1), table.offsets2, len(string2),
+                                            table.scores, gap_cost, gain, threshold)
+        return score if score >= min_score else -INFINITY
+
+    if sim_func is not cython_sim_ident:
+        # the scores of the character pairs are looked up in a table, so that
+        # sim_func is not called on every cell
+        table = SubstitutionTable(sim_func, string1, string2)
+        if diagonal:
+            return _smith_waterman_diagonal(table.offsets1, len(string1), table.offsets2, len(string2),
+                                            table.scores, gap_cost, 0, -INFINITY)
+        if len(string2) > len(string1):
+            return _smith_waterman(table.offsets2, len(string2), table.offsets1, len(string1), table.scores,
+                                   gap_cost)
+        return _smith_waterman(table.offsets1, len(string1), table.offsets2, len(string2), table.scores,
+                               gap_cost)
+
+    if diagonal:
+        try:
+            codes1 = _get_code_points(string1)
+            codes2 = _get_code_points(string2)
+            return _smith_waterman_diagonal(codes1, len(string1), codes2, len(string2), NULL, gap_cost, 0,
+                                            -INFINITY)
+        finally:
+            free(codes1)
+            free(codes2)
+
+    if len(string2) > len(string1):
+        string1, string2 = string2, string1
+        kind2 = kind1
+        data2 = data1
+
+    # with the identity function, the characters are compared directly in the
+    # string buffers, specialized on the code unit width of string2
+    if kind2 == PyUnicode_1BYTE_KIND:
+        return _smith_waterman_ident(string1, <Py_UCS1*>data2, len(string2), gap_cost)
+    elif kind2 == PyUnicode_2BYTE_KIND:
+        return _smith_waterman_ident(string1, <Py_UCS2*>data2, len(string2), gap_cost)
+    return _smith_waterman_ident(string1, <Py_UCS4*>data2, len(string2), gap_cost)
+
+
+def smith_waterman_banded(unicode string1, unicode string2, float gap_cost, sim_func, Py_ssize_t diag_lo,
+                          Py_ssize_t diag_hi):
+    """Computes the Smith-Waterman score of the local alignments within a band of the DP matrix.
+
+    Only the cells (i, j) with diag_lo <= j - i <= diag_hi are computed. The
+    cells outside of the band count as 0, which a local alignment can always
+    start from, so the score is that of the best local alignment within the
+    band.
+
+    Args:
+        string1, string2 (unicode): Input unicode strings.
+        gap_cost (float): Cost of gap.
+        sim_func (function): Similarity function.
+        diag_lo, diag_hi (int): Range of the diagonals of the band.
+    Returns:
+        A tuple (score, end1, end2) of the score (float) and the numbers of characters of string1 and string2 up to
+        the end of the best alignment (ints), the one ending first in string2, and then first in row order, if
+        several alignments have the best score, and (0, 0) if no alignment scores above 0.
+    """
+    cdef SubstitutionTable table = SubstitutionTable(sim_func, string1, string2)
+    cdef Py_ssize_t end1 = 0, end2 = 0
+    cdef double score = _smith_waterman_banded(table.offsets1, len(string1), table.offsets2, len(string2),
+                                               table.scores, gap_cost, diag_lo, diag_hi, &end1, &end2)
+    return score, end1, end2
+
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double _smith_waterman(Py_ssize_t* offsets1, int len_s1, Py_ssize_t* offsets2, int len_s2,
+                            double* scores, float gap_cost) except? -1:
+    # the score of the i-th character of the first string and the j-th
+    # character of the second one is scores[offsets1[i] + offsets2[j]], see
+    # SubstitutionTable
+    cdef int i = 0, j = 0
+    cdef double match = 0.0, delete = 0.0, insert = 0.0
+    cdef double max_value = 0.0
+    cdef double* prev_row = <double*> malloc((len_s2 + 1) * sizeof(double))
+    cdef double* curr_row = <double*> malloc((len_s2 + 1) * sizeof(double))
+    cdef double* tmp_row
+    cdef double* row_scores
+
+    if prev_row == NULL or curr_row == NULL:
+        free(prev_row)
+        free(curr_row)
+        raise MemoryError()
+
+    for j from 0 <= j < (len_s2 + 1):
+        prev_row[j] = 0
+    curr_row[0] = 0
+
+    # Smith Waterman DP calculations
+    for i from 1 <= i < (len_s1 + 1):
+        row_scores = scores + offsets1[i - 1]
+        for j from 1 <= j < (len_s2 + 1):
+
+            match = prev_row[j - 1] + row_scores[offsets2[j - 1]]
+            delete = prev_row[j] - gap_cost
+            insert = curr_row[j - 1] - gap_cost
+            curr_row[j] = max(0, match, delete, insert)
+            max_value = max(max_value, curr_row[j])
+        tmp_row = prev_row
+        prev_row = curr_row
+        curr_row = tmp_row
+
+    free(prev_row)
+    free(curr_row)
+    return max_value
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double _smith_waterman_ident(unicode string1, ucs_t* string2, int len_s2,
+                                  float gap_cost) except? -1:
+    cdef int kind1 = PyUnicode_KIND(string1)
+    cdef void* data1 = PyUnicode_DATA(string1)
     cdef int i = 0, j = 0
     cdef double match = 0.0, delete = 0.0, insert = 0.0
     cdef double sim_score = 0.0, max_value = 0.0
-    cdef int len_s1 = len(string1), len_s2 = len(string2)
-    cdef double[:,:] dist_mat = np.zeros((len(string1) + 1, len(string2) + 1), dtype=np.float)
+    cdef int len_s1 = len(string1)
+    cdef double* prev_row = <double*> malloc((len_s2 + 1) * sizeof(double))
+    cdef double* curr_row = <double*> malloc((len_s2 + 1) * sizeof(double))
+    cdef double* tmp_row
+    cdef Py_UCS4 ch
 
+    if prev_row == NULL or curr_row == NULL:
+        free(prev_row)
+        free(curr_row)
+        raise MemoryError()
+
+    for j from 0 <= j < (len_s2 + 1):
+        prev_row[j] = 0
+    curr_row[0] = 0
 
     # Smith Waterman DP calculations
     for i from 1 <= i < (len_s1 + 1):
+        ch = PyUnicode_READ(kind1, data1, i - 1)
         for j from 1 <= j < (len_s2 + 1):
 
-            sim_func_score = sim_func(string1[i - 1], string2[j - 1])
-            match = dist_mat[i - 1, j - 1] + sim_func_score
-            delete = dist_mat[i - 1, j] - gap_cost
-            insert = dist_mat[i, j - 1] - gap_cost
-            dist_mat[i, j] = max(0, match, delete, insert)
-            max_value = max(max_value, dist_mat[i, j])
+            sim_score = 1 if ch == string2[j - 1] else 0
+            match = prev_row[j - 1] + sim_score
+            delete = prev_row[j] - gap_cost
+            insert = curr_row[j - 1] - gap_cost
+            curr_row[j] = max(0, match, delete, insert)
+            max_value = max(max_value, curr_row[j])
+        tmp_row = prev_row
+        prev_row = curr_row
+        curr_row = tmp_row
+
+    free(prev_row)
+    free(curr_row)
+    return max_value
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double _smith_waterman_bounded(Py_ssize_t* offsets1, Py_ssize_t len_s1, Py_ssize_t* offsets2,
+                                    Py_ssize_t len_s2, double* scores, float gap_cost, double gain,
+                                    double threshold) except? -1:
+    # The same DP as _smith_waterman on the offsets of a SubstitutionTable,
+    # which stops, returning -INFINITY, as soon as neither the best cell so
+    # far nor any alignment going on below the current row can reach
+    # threshold. Such an alignment either goes through a cell of the row or
+    # starts below it, and it has at most min(rows left, len_s2) more pairs
+    # of characters, each adding at most gain.
+    cdef Py_ssize_t i = 0, j = 0
+    cdef Py_ssize_t num_rows = 0
+    cdef double match = 0.0, delete = 0.0, insert = 0.0, sim_score = 0.0
+    cdef double max_value = 0.0, row_max = 0.0
+    cdef double* prev_row = <double*> calloc(len_s2 + 1, sizeof(double))
+    cdef double* curr_row = <double*> calloc(len_s2 + 1, sizeof(double))
+    cdef double* tmp_row
+
+    if prev_row == NULL or curr_row == NULL:
+        free(prev_row)
+        free(curr_row)
+        raise MemoryError()
+
+    # Smith Waterman DP calculations, checking the bound before each row
+    for i in range(1, len_s1 + 1):
+        num_rows = len_s1 - i + 1
+        if (max_value < threshold and
+                row_max + gain * (num_rows if num_rows < len_s2 else len_s2) < threshold):
+            free(prev_row)
+            free(curr_row)
+            return -INFINITY
+        row_max = 0
+        for j in range(1, len_s2 + 1):
+            if scores == NULL:
+                sim_score = 1 if offsets1[i - 1] == offsets2[j - 1] else 0
+            else:
+                sim_score = scores[offsets1[i - 1] + offsets2[j - 1]]
+            match = prev_row[j - 1] + sim_score
+            delete = prev_row[j] - gap_cost
+            insert = curr_row[j - 1] - gap_cost
+            curr_row[j] = max(0, match, delete, insert)
+            row_max = max(row_max, curr_row[j])
+        max_value = max(max_value, row_max)
+        tmp_row = prev_row
+        prev_row = curr_row
+        curr_row = tmp_row
+
+    free(prev_row)
+    free(curr_row)
+    return max_value
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double _smith_waterman_diagonal(code_t* codes1, Py_ssize_t len_s1, code_t* codes2, Py_ssize_t len_s2,
+                                     double* scores, float gap_cost, double gain, double threshold) except? -1:
+    # Computes the DP by anti-diagonals. The cells of an anti-diagonal depend
+    # only on the two previous ones, so its inner loop has no dependency from
+    # one cell to the next and the C compiler vectorizes it. Every cell is
+    # computed from the same operands, with the same operations, as in the
+    # row by row kernels, so the score is exactly the same.
+    #
+    # codes1 and codes2 either hold the code points of the strings, as
+    # doubles, and matching characters score 1, or the offsets of a
+    # SubstitutionTable, the score of a pair being
+    # scores[codes1[i] + codes2[j]].
+    #
+    # With a threshold above -INFINITY, the kernel stops, returning
+    # -INFINITY, as soon as neither the best cell so far nor any alignment
+    # going on past the current diagonal k can reach it, see
+    # _get_diagonal_bound.
+    cdef Py_ssize_t i = 0, k = 0, lo = 0, hi = 0, base = 0
+    cdef code_t* tmp_codes
+    cdef code_t* codes2_rev = NULL
+    cdef double* buffers = NULL
+    cdef double* diag_k
+    cdef double* diag_k1
+    cdef double* diag_k2
+    cdef double* best
+    cdef double* tmp_diag
+    cdef double match = 0.0, delete = 0.0, insert = 0.0, cell = 0.0, max_value = 0.0
+
+    # the diagonals are indexed by the position in the shorter string
+    if len_s1 > len_s2:
+        tmp_codes = codes1; codes1 = codes2; codes2 = tmp_codes
+        len_s1, len_s2 = len_s2, len_s1
+
+    # the cells of the k-th diagonal are (i, k - i): reading the second string
+    # backwards makes its characters contiguous along a diagonal
+    codes2_rev = <code_t*> malloc(len_s2 * sizeof(code_t))
+    buffers = <double*> calloc(4 * (len_s1 + 1), sizeof(double))
+    if codes2_rev == NULL or buffers == NULL:
+        free(codes2_rev)
+        free(buffers)
+        raise MemoryError()
+    for i in range(len_s2):
+        codes2_rev[i] = codes2[len_s2 - 1 - i]
+
+    # diagonals k, k - 1 and k - 2, and the best cell seen at each position.
+    # The cells of the first row and column are never written, so they stay 0.
+    diag_k = buffers
+    diag_k1 = buffers + (len_s1 + 1)
+    diag_k2 = buffers + 2 * (len_s1 + 1)
+    best = buffers + 3 * (len_s1 + 1)
+
+    for k in range(2, len_s1 + len_s2 + 1):
+        lo = k - len_s2 if k - len_s2 > 1 else 1
+        hi = k - 1 if k - 1 < len_s1 else len_s1
+        # codes2[k - i - 1] is codes2_rev[base + i]
+        base = len_s2 - k
+        if code_t is double:
+            for i in range(lo, hi + 1):
+                match = diag_k2[i - 1] + (1 if codes1[i - 1] == codes2_rev[base + i] else 0)
+                delete = diag_k1[i - 1] - gap_cost
+                insert = diag_k1[i] - gap_cost
+                cell = match if match > 0 else 0
+                cell = delete if delete > cell else cell
+                cell = insert if insert > cell else cell
+                diag_k[i] = cell
+                best[i] = cell if cell > best[i] else best[i]
+        else:
+            for i in range(lo, hi + 1):
+                match = diag_k2[i - 1] + scores[codes1[i - 1] + codes2_rev[base + i]]
+                delete = diag_k1[i - 1] - gap_cost
+                insert = diag_k1[i] - gap_cost
+                cell = match if match > 0 else 0
+                cell = delete if delete > cell else cell
+                cell = insert if insert > cell else cell
+                diag_k[i] = cell
+                best[i] = cell if cell > best[i] else best[i]
+        if threshold > -INFINITY and k % DIAGONAL_CHECK_INTERVAL == 0:
+            if _get_diagonal_bound(diag_k, diag_k1, best, len_s1, len_s2, k, gain) < threshold:
+                free(codes2_rev)
+                free(buffers)
+                return -INFINITY
+        tmp_diag = diag_k2
+        diag_k2 = diag_k1
+        diag_k1 = diag_k
+        diag_k = tmp_diag
+
+    for i in range(1, len_s1 + 1):
+        max_value = best[i] if best[i] > max_value else max_value
+
+    free(codes2_rev)
+    free(buffers)
+    return max_value
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double _get_diagonal_bound(double* diag_k, double* diag_k1, double* best, Py_ssize_t len_s1,
+                                Py_ssize_t len_s2, Py_ssize_t k, double gain) nogil:
+    # Upper bound on the score of the DP of _smith_waterman_diagonal, given
+    # its diagonals k and k - 1. An alignment going on past diagonal k goes
+    # through a cell of one of them, or starts after them, and has at most
+    # (len_s1 + len_s2 - k + 1) / 2 more pairs of characters, each adding at
+    # most gain. The diagonal buffers also hold cells of earlier diagonals,
+    # which only loosen the bound.
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t num_pairs = (len_s1 + len_s2 - k + 1) // 2
+    cdef double max_value = 0.0, max_cell = 0.0
+    for i in range(1, len_s1 + 1):
+        max_value = best[i] if best[i] > max_value else max_value
+        max_cell = diag_k[i] if diag_k[i] > max_cell else max_cell
+        max_cell = diag_k1[i] if diag_k1[i] > max_cell else max_cell
+    if num_pairs > len_s1:
+        num_pairs = len_s1
+    return max(max_value, max_cell + gain * num_pairs)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double _smith_waterman_banded(Py_ssize_t* offsets1, Py_ssize_t len_s1, Py_ssize_t* offsets2,
+                                   Py_ssize_t len_s2, double* scores, float gap_cost, Py_ssize_t diag_lo,
+                                   Py_ssize_t diag_hi, Py_ssize_t* end1, Py_ssize_t* end2) except? -1:
+    # the scores are those of a SubstitutionTable. The cells left of and
+    # right of the band in a row are set to 0, the rows being zeroed
+    # beforehand for the rows above the band.
+    cdef Py_ssize_t i = 0, j = 0, j_lo = 0, j_hi = 0
+    cdef double match = 0.0, delete = 0.0, insert = 0.0, sim_score = 0.0, max_value = 0.0
+    cdef double* prev_row = <double*> calloc(len_s2 + 2, sizeof(double))
+    cdef double* curr_row = <double*> calloc(len_s2 + 2, sizeof(double))
+    cdef double* tmp_row
+
+    if prev_row == NULL or curr_row == NULL:
+        free(prev_row)
+        free(curr_row)
+        raise MemoryError()
+
+    end1[0] = 0
+    end2[0] = 0
+
+    # Smith Waterman DP calculations, within the band
+    for i in range(1, len_s1 + 1):
+        j_lo = i + diag_lo if i + diag_lo > 1 else 1
+        j_hi = i + diag_hi if i + diag_hi < len_s2 else len_s2
+        if j_lo > j_hi:
+            if i + diag_hi < 1:
+                # the band starts further down
+                continue
+            # the band has left the matrix
+            break
+        curr_row[j_lo - 1] = 0
+        for j in range(j_lo, j_hi + 1):
+            if scores == NULL:
+                sim_score = 1 if offsets1[i - 1] == offsets2[j - 1] else 0
+            else:
+                sim_score = scores[offsets1[i - 1] + offsets2[j - 1]]
+            match = prev_row[j - 1] + sim_score
+            delete = prev_row[j] - gap_cost
+            insert = curr_row[j - 1] - gap_cost
+            curr_row[j] = max(0, match, delete, insert)
+            # among the best alignments, the one ending first in string2
+            if curr_row[j] > max_value or (curr_row[j] == max_value and max_value > 0 and j < end2[0]):
+                max_value = curr_row[j]
+                end1[0] = i
+                end2[0] = j
+        curr_row[j_hi + 1] = 0
+        tmp_row = prev_row
+        prev_row = curr_row
+        curr_row = tmp_row
+
+    free(prev_row)
+    free(curr_row)
+    return max_value
+
 
-    return max_value
\ No newline at end of file
+cdef double* _get_code_points(unicode string) except NULL:
+    # the code points are held exactly by doubles, which lets the compiler
+    # compare them in the same vector lanes as the cells
+    cdef int kind = PyUnicode_KIND(string)
+    cdef void* data = PyUnicode_DATA(string)
+    cdef Py_ssize_t i = 0
+    cdef double* codes = <double*> malloc((len(string) + 1) * sizeof(double))
+    if codes == NULL:
+        raise MemoryError()
+    for i in range(len(string)):
+        codes[i] = PyUnicode_READ(kind, data, i)
+    return codes
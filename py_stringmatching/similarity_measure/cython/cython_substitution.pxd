@@ -0,0 +1,7 @@
+cdef class SubstitutionTable:
+    cdef object owner
+    cdef double* scores
+    cdef Py_ssize_t* offsets1
+    cdef Py_ssize_t* offsets2
+    cdef bint owns_scores
+    cdef double max_score
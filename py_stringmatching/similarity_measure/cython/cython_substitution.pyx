@@ -0,0 +1,91 @@
+from libc.stdlib cimport malloc, free
+
+from py_stringmatching.similarity_measure.cython.cython_utils import cython_sim_ident
+from py_stringmatching.similarity_measure.substitution_matrix import SubstitutionMatrix
+from py_stringmatching.similarity_measure.cython.cython_unicode cimport \
+    PyUnicode_KIND, PyUnicode_DATA, PyUnicode_READ
+
+
+cdef class SubstitutionTable:
+    """Scores of the character pairs of two strings, looked up from C.
+
+    The score of the i-th character of string1 and the j-th character of
+    string2 is scores[offsets1[i] + offsets2[j]]. Since the sum does not
+    depend on which string spans the rows of a DP matrix, the kernels can
+    swap the strings without changing the argument order of the scores.
+
+    For a SubstitutionMatrix, scores points into its table and the offsets
+    are the rows and columns of the characters. For any other similarity
+    function, it is called once per distinct pair of characters, with the
+    characters in the order of the input strings, and its results are stored
+    in a table over the distinct characters of each string. For the identity
+    function, scores is NULL and the offsets are the code points of the
+    characters, the pairs of equal code points scoring 1 and the others 0.
+
+    max_score is at least the score of any pair of characters of the two
+    strings.
+    """
+
+    def __cinit__(self, sim_func, unicode string1, unicode string2):
+        cdef double[:, ::1] table
+        cdef dict chars1, chars2
+        cdef Py_ssize_t size = 0, i = 0, j = 0
+        cdef int kind1 = PyUnicode_KIND(string1), kind2 = PyUnicode_KIND(string2)
+        cdef void* data1 = PyUnicode_DATA(string1)
+        cdef void* data2 = PyUnicode_DATA(string2)
+
+        self.offsets1 = <Py_ssize_t*> malloc((len(string1) + 1) * sizeof(Py_ssize_t))
+        self.offsets2 = <Py_ssize_t*> malloc((len(string2) + 1) * sizeof(Py_ssize_t))
+        if self.offsets1 == NULL or self.offsets2 == NULL:
+            raise MemoryError()
+
+        if sim_func is cython_sim_ident:
+            for i in range(len(string1)):
+                self.offsets1[i] = PyUnicode_READ(kind1, data1, i)
+            for j in range(len(string2)):
+                self.offsets2[j] = PyUnicode_READ(kind2, data2, j)
+            self.max_score = 1
+            return
+
+        if isinstance(sim_func, SubstitutionMatrix):
+            table = sim_func._table
+            self.owner = sim_func._table
+            self.scores = &table[0, 0]
+            self.max_score = sim_func._table.max()
+            alphabet = sim_func._alphabet
+            size = len(sim_func._table)
+            for i, ch in enumerate(string1):
+                self.offsets1[i] = alphabet.get(ch, size - 1) * size
+            for j, ch in enumerate(string2):
+                self.offsets2[j] = alphabet.get(ch, size - 1)
+            return
+
+        chars1 = _get_distinct_chars(string1, self.offsets1)
+        chars2 = _get_distinct_chars(string2, self.offsets2)
+        for i in range(len(string1)):
+            self.offsets1[i] *= len(chars2)
+        self.scores = <double*> malloc((len(chars1) * len(chars2) + 1) * sizeof(double))
+        if self.scores == NULL:
+            raise MemoryError()
+        self.owns_scores = True
+        for char1, i in chars1.items():
+            for char2, j in chars2.items():
+                self.scores[i * len(chars2) + j] = sim_func(char1, char2)
+                if (i == 0 and j == 0) or self.scores[i * len(chars2) + j] > self.max_score:
+                    self.max_score = self.scores[i * len(chars2) + j]
+
+    def __dealloc__(self):
+        free(self.offsets1)
+        free(self.offsets2)
+        if self.owns_scores:
+            free(self.scores)
+
+
+cdef dict _get_distinct_chars(unicode string, Py_ssize_t* indices):
+    # numbers the distinct characters of string in order of first occurrence,
+    # and stores the number of each character in indices
+    cdef dict chars = {}
+    cdef Py_ssize_t i = 0
+    for i, ch in enumerate(string):
+        indices[i] = chars.setdefault(ch, len(chars))
+    return chars
@@ -0,0 +1,106 @@
+# cython: boundscheck=False
+# cython: wraparound=False
+
+import numpy as np
+cimport numpy as np
+from libc.stdlib cimport malloc, free
+
+from py_stringmatching.similarity_measure.cython.cython_unicode cimport \
+    PyUnicode_KIND, PyUnicode_DATA, PyUnicode_READ
+
+
+def trie_levenshtein_search(np.ndarray[np.uint32_t, ndim=1] labels, np.ndarray[np.int32_t, ndim=1] depths,
+                            np.ndarray[np.int32_t, ndim=1] ends, np.ndarray[np.int32_t, ndim=1] terms,
+                            int max_depth, unicode query, int max_dist):
+    """Finds the strings of a trie within Levenshtein distance max_dist of a query string.
+
+    The trie is given by its nodes in preorder, node 0 being the root. For each node, labels holds the character
+    of its incoming edge, depths its depth, ends the position following its last descendant and terms the id of
+    the string ending at the node (-1 if none). One row of the Levenshtein DP matrix, restricted to the diagonal
+    band of width 2 * max_dist + 1, is computed per visited node from the row of its parent, and the descendants
+    of a node are skipped as soon as the minimum of its row exceeds max_dist.
+
+    Args:
+        labels, depths, ends, terms (NumPy arrays): Trie nodes, in preorder.
+        max_depth (int): Largest depth of a node.
+        query (unicode): Query string.
+        max_dist (int): Maximum distance of interest.
+
+    Returns:
+        A tuple (matches, num_terms), where matches is a list of (term id, distance) tuples and num_terms is the
+        number of visited nodes where a string ends.
+    """
+    cdef int kind = PyUnicode_KIND(query)
+    cdef void* data = PyUnicode_DATA(query)
+    cdef Py_ssize_t len_query = len(query)
+    cdef Py_ssize_t num_nodes = labels.shape[0]
+    cdef Py_ssize_t width = len_query + 1
+    cdef Py_UCS4* query_chars = <Py_UCS4*> malloc(width * sizeof(Py_UCS4))
+    cdef int* rows = <int*> malloc((max_depth + 1) * width * sizeof(int))
+    cdef int* prev
+    cdef int* curr
+    cdef int value = 0, row_min = 0
+    cdef Py_ssize_t i = 1, j = 0, num_terms = 0
+    cdef Py_ssize_t depth = 0, low = 0, high = 0
+    cdef Py_UCS4 label
+    cdef list matches = []
+
+    if query_chars == NULL or rows == NULL:
+        free(query_chars)
+        free(rows)
+        raise MemoryError()
+
+    try:
+        for j in range(len_query):
+            query_chars[j] = PyUnicode_READ(kind, data, j)
+        # the row of the root is the distance from the empty string
+        for j in range(width):
+            rows[j] = j
+        if num_nodes > 0 and terms[0] >= 0:
+            num_terms += 1
+            if len_query <= max_dist:
+                matches.append((terms[0], len_query))
+
+        while i < num_nodes:
+            label = labels[i]
+            depth = depths[i]
+            prev = rows + (depth - 1) * width
+            curr = prev + width
+
+            # Only the cells on the diagonals -max_dist..max_dist can hold
+            # values up to max_dist. The cells next to that band are set to
+            # max_dist + 1, which is all the next row needs to know of them.
+            # When the band leaves the row, the row minimum exceeds max_dist
+            # and the children are skipped, so low - 1 stays within the row.
+            low = depth - max_dist if depth > max_dist else 1
+            high = depth + max_dist if depth + max_dist < len_query else len_query
+            curr[low - 1] = depth if low == 1 else max_dist + 1
+            row_min = curr[low - 1]
+            for j in range(low, high + 1):
+                value = prev[j - 1] + (0 if query_chars[j - 1] == label else 1)
+                if prev[j] + 1 < value:
+                    value = prev[j] + 1
+                if curr[j - 1] + 1 < value:
+                    value = curr[j - 1] + 1
+                curr[j] = value
+                if value < row_min:
+                    row_min = value
+            if high < len_query:
+                curr[high + 1] = max_dist + 1
+
+            if terms[i] >= 0:
+                num_terms += 1
+                if high == len_query and curr[len_query] <= max_dist:
+                    matches.append((terms[i], curr[len_query]))
+
+            # every string below the node starts with its prefix, whose
+            # distance to any prefix of the query exceeds max_dist
+            if row_min > max_dist:
+                i = ends[i]
+            else:
+                i += 1
+    finally:
+        free(query_chars)
+        free(rows)
+
+    return matches, num_terms
@@ -0,0 +1,19 @@
+"""Direct access to the buffers of unicode strings.
+
+Since PEP 393, a unicode object stores its characters in a compact buffer of
+1-, 2- or 4-byte code units, depending on its widest character. The kernels
+read these buffers directly instead of indexing the string, which would
+create a Python object per character. Inner loops are specialized on the
+code unit width through the fused type ucs_t, while the characters of outer
+loops are read with PyUnicode_READ.
+"""
+
+from cpython.unicode cimport Py_UCS1, Py_UCS2
+from cpython.unicode cimport PyUnicode_KIND, PyUnicode_DATA, PyUnicode_READ
+from cpython.unicode cimport PyUnicode_1BYTE_KIND, PyUnicode_2BYTE_KIND
+
+
+ctypedef fused ucs_t:
+    Py_UCS1
+    Py_UCS2
+    Py_UCS4
@@ -0,0 +1,44 @@
+# Typed helpers for the DP kernels, inlined into the modules that cimport
+# them and callable without the GIL. The Python functions of cython_utils
+# wrap them.
+
+cdef inline int c_int_max_two(int a, int b) nogil:
+    if a > b: return a
+    else: return b
+
+
+cdef inline int c_int_max_three(int a, int b, int c) nogil:
+    cdef int max_int = a
+    if b > max_int:
+        max_int = b
+    if c > max_int:
+        max_int = c
+    return max_int
+
+
+cdef inline float c_float_max_two(float a, float b) nogil:
+    if a > b: return a
+    else: return b
+
+
+cdef inline float c_float_max_three(float a, float b, float c) nogil:
+    cdef float max_float = a
+    if b > max_float:
+        max_float = b
+    if c > max_float:
+        max_float = c
+    return max_float
+
+
+cdef inline int c_int_min_two(int a, int b) nogil:
+    if a > b: return b
+    else: return a
+
+
+cdef inline int c_int_min_three(int a, int b, int c) nogil:
+    cdef int min_int = a
+    if b < min_int:
+        min_int = b
+    if c < min_int:
+        min_int = c
+    return min_int
@@ -12,8 +12,7 @@ def int_max_two(int a, int b):
         Returns:
             Maximum integer (int).
     """
-    if a > b : return a
-    else: return b
+    return c_int_max_two(a, b)
 
 
 def int_max_three(int a, int b, int c):
@@ -23,12 +22,7 @@ def int_max_three(int a, int b, int c):
         Returns:
             Maximum integer (int).
     """
-    cdef int max_int = a
-    if b > max_int:
-        max_int = b
-    if c > max_int:
-        max_int = c
-    return max_int
+    return c_int_max_three(a, b, c)
 
 
 def float_max_two(float a, float b):
@@ -38,8 +32,7 @@ def float_max_two(float a, float b):
         Returns:
             Maximum float (float).
     """
-    if a > b : return a
-    else: return b
+    return c_float_max_two(a, b)
 
 
 def float_max_three(float a, float b, float c):
@@ -49,12 +42,7 @@ def float_max_three(float a, float b, float c):
         Returns:
             Maximum float (float).
     """
-    cdef float max_float = a
-    if b > max_float:
-        max_float = b
-    if c > max_float:
-        max_float = c
-    return max_float
+    return c_float_max_three(a, b, c)
 
 
 def int_min_two(int a, int b):
@@ -64,8 +52,7 @@ def int_min_two(int a, int b):
     Returns:
         Minimum integer (int).
     """
-    if a > b : return b
-    else: return a
+    return c_int_min_two(a, b)
 
 
 def int_min_three(int a, int b, int c):
@@ -75,9 +62,4 @@ def int_min_three(int a, int b, int c):
     Returns:
         Minimum integer (int).
     """
-    cdef int min_int = a
-    if b < min_int:
-        min_int = b
-    if c < min_int:
-        min_int = c
-    return min_int
+    return c_int_min_three(a, b, c)
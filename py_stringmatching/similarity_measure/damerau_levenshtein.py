@@ -0,0 +1,228 @@
+from __future__ import division
+
+from py_stringmatching import utils
+from py_stringmatching.similarity_measure.cython.cython_damerau_levenshtein import damerau_levenshtein
+from py_stringmatching.similarity_measure.cython.cython_damerau_levenshtein import osa
+from py_stringmatching.similarity_measure.sequence_similarity_measure import \
+    SequenceSimilarityMeasure
+
+
+class DamerauLevenshtein(SequenceSimilarityMeasure):
+    """Computes Damerau-Levenshtein measure.
+
+    Damerau-Levenshtein distance computes the minimum cost of transforming one string into the other using the
+    Levenshtein operators (delete a character, insert a character, and substitute one character for another) and
+    the transposition of two adjacent characters.
+
+    In the restricted variant, also known as optimal string alignment distance, no substring is edited more than
+    once. For example, the distance between 'ca' and 'abc' is 2 ('ca' -> 'ac' -> 'abc'), but their optimal string
+    alignment distance is 3, as the inserted 'b' would edit the transposed substring again.
+
+    Parameters:
+        ins_cost (int or float): Cost of inserting a character, default=1
+        del_cost (int or float): Cost of deleting a character, default=1
+        sub_cost (int or float): Cost of substituting one character for another, default=1
+        trans_cost (int or float): Cost of transposing two adjacent characters, default=1
+        restricted (boolean): Restricted variant (optimal string alignment) on/off, default=False
+
+    Note:
+        The unrestricted distance is computed with the algorithm of Lowrance and Wagner, which requires
+        2 * trans_cost >= ins_cost + del_cost.
+    """
+
+    def __init__(self, ins_cost=1, del_cost=1, sub_cost=1, trans_cost=1, restricted=False):
+        # validate the costs
+        utils.sim_check_edit_costs(ins_cost, del_cost, sub_cost, trans_cost)
+
+        self.ins_cost = ins_cost
+        self.del_cost = del_cost
+        self.sub_cost = sub_cost
+        self.trans_cost = trans_cost
+        self.restricted = restricted
+        super(DamerauLevenshtein, self).__init__()
+
+    def get_raw_score(self, string1, string2):
+        """Computes the raw Damerau-Levenshtein distance between two strings.
+
+        Args:
+            string1,string2 (str): Input strings.
+
+        Returns:
+            Damerau-Levenshtein distance (int, or float if one of the costs is a float).
+
+        Raises:
+            TypeError : If the inputs are not strings.
+            ValueError : If the unrestricted variant is used with 2 * trans_cost < ins_cost + del_cost.
+
+        Examples:
+            >>> dl = DamerauLevenshtein()
+            >>> dl.get_raw_score('ca', 'abc')
+            2
+            >>> dl.get_raw_score('example', 'exmaple')
+            1
+            >>> osa = DamerauLevenshtein(restricted=True)
+            >>> osa.get_raw_score('ca', 'abc')
+            3
+            >>> dl = DamerauLevenshtein(trans_cost=1.5)
+            >>> dl.get_raw_score('example', 'exmaple')
+            1.5
+        """
+
+        # input validations
+        utils.sim_check_for_none(string1, string2)
+
+        # convert input to unicode.
+        string1 = utils.convert_to_unicode(string1)
+        string2 = utils.convert_to_unicode(string2)
+
+        utils.tok_check_for_string_input(string1, string2)
+
+        if not self.restricted and 2 * self.trans_cost < self.ins_cost + self.del_cost:
+            raise ValueError('Damerau-Levenshtein distance requires 2 * trans_cost >= ins_cost + del_cost, '
+                             'use the restricted variant instead')
+
+        if utils.sim_check_for_exact_match(string1, string2):
+            raw_score = 0
+        elif self.restricted:
+            raw_score = osa(string1, string2, self.ins_cost, self.del_cost, self.sub_cost, self.trans_cost)
+        else:
+            raw_score = damerau_levenshtein(string1, string2, self.ins_cost, self.del_cost, self.sub_cost,
+                                            self.trans_cost)
+
+        # the compiled kernels work on doubles, integer costs give integer distances
+        if all(isinstance(cost, int) for cost in (self.ins_cost, self.del_cost, self.sub_cost, self.trans_cost)):
+            return int(raw_score)
+        return raw_score
+
+    def get_sim_score(self, string1, string2):
+        """Computes the normalized Damerau-Levenshtein similarity score between two strings.
+
+        The raw score is normalized by the largest possible distance between strings of the given lengths, which
+        is the length of the longer string with unit costs.
+
+        Args:
+            string1,string2 (str): Input strings.
+
+        Returns:
+            Normalized Damerau-Levenshtein similarity (float).
+
+        Raises:
+            TypeError : If the inputs are not strings.
+
+        Examples:
+            >>> dl = DamerauLevenshtein()
+            >>> dl.get_sim_score('ca', 'abc')
+            0.33333333333333337
+            >>> dl.get_sim_score('example', 'exmaple')
+            0.8571428571428572
+        """
+
+        # convert input strings to unicode.
+        string1 = utils.convert_to_unicode(string1)
+        string2 = utils.convert_to_unicode(string2)
+
+        raw_score = self.get_raw_score(string1, string2)
+        max_cost = utils.get_max_edit_cost(len(string1), len(string2), self.ins_cost, self.del_cost,
+                                           self.sub_cost)
+        if max_cost == 0:
+            return 1.0
+        return 1 - (raw_score / max_cost)
+
+    def get_ins_cost(self):
+        """
+        Get insertion cost
+
+        Returns:
+            insertion cost (int or float)
+        """
+        return self.ins_cost
+
+    def get_del_cost(self):
+        """
+        Get deletion cost
+
+        Returns:
+            deletion cost (int or float)
+        """
+        return self.del_cost
+
+    def get_sub_cost(self):
+        """
+        Get substitution cost
+
+        Returns:
+            substitution cost (int or float)
+        """
+        return self.sub_cost
+
+    def get_trans_cost(self):
+        """
+        Get transposition cost
+
+        Returns:
+            transposition cost (int or float)
+        """
+        return self.trans_cost
+
+    def get_restricted(self):
+        """
+        Get restricted flag
+
+        Returns:
+            restricted flag (boolean)
+        """
+        return self.restricted
+
+    def set_ins_cost(self, ins_cost):
+        """
+        Set insertion cost
+
+        Args:
+            ins_cost (int or float): Cost of inserting a character
+        """
+        utils.sim_check_edit_costs(ins_cost)
+        self.ins_cost = ins_cost
+        return True
+
+    def set_del_cost(self, del_cost):
+        """
+        Set deletion cost
+
+        Args:
+            del_cost (int or float): Cost of deleting a character
+        """
+        utils.sim_check_edit_costs(del_cost)
+        self.del_cost = del_cost
+        return True
+
+    def set_sub_cost(self, sub_cost):
+        """
+        Set substitution cost
+
+        Args:
+            sub_cost (int or float): Cost of substituting one character for another
+        """
+        utils.sim_check_edit_costs(sub_cost)
+        self.sub_cost = sub_cost
+        return True
+
+    def set_trans_cost(self, trans_cost):
+        """
+        Set transposition cost
+
+        Args:
+            trans_cost (int or float): Cost of transposing two adjacent characters
+        """
+        utils.sim_check_edit_costs(trans_cost)
+        self.trans_cost = trans_cost
+        return True
+
+    def set_restricted(self, restricted):
+        """
+        Set restricted flag
+
+        Args:
+            restricted (boolean): Restricted variant (optimal string alignment) on/off
+        """
+        self.restricted = restricted
+        return True
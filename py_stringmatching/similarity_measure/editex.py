@@ -3,16 +3,16 @@
 
 from __future__ import division
 from __future__ import unicode_literals
-import unicodedata
 import six
 
 import numpy as np
 
 from py_stringmatching import utils
-from six.moves import xrange
 from six import text_type
 from py_stringmatching.similarity_measure.sequence_similarity_measure import \
                                                     SequenceSimilarityMeasure
+from py_stringmatching.similarity_measure.cython.cython_editex import editex
+from py_stringmatching.similarity_measure.cython.cython_editex import editex_batch
 
 
 class Editex(SequenceSimilarityMeasure):
@@ -32,7 +32,7 @@ class Editex(SequenceSimilarityMeasure):
         self.local = local
         super(Editex, self).__init__()
 
-    def get_raw_score(self, string1, string2):
+    def get_raw_score(self, string1, string2, max_dist=None):
         """
         Computes the editex distance between two strings.
 
@@ -50,12 +50,17 @@ class Editex(SequenceSimilarityMeasure):
 
         Args:
             string1,string2 (str): Input strings
+            max_dist (float): Maximum distance of interest (defaults to None). If given, the pairs whose lengths
+                              alone imply a larger distance are rejected, the computation stops as soon as the
+                              distance is known to exceed max_dist, and max_dist + 1 is returned in that case.
+                              It can only be a fractional number if one of the costs is a float.
 
         Returns:
-            Editex distance (int)
+            Editex distance (int, or float if one of the costs is a float)
 
         Raises:
             TypeError : If the inputs are not strings
+            ValueError : If max_dist is negative, or if it is not a whole number while all the costs are integers
 
         Examples:
             >>> ed = Editex()
@@ -65,6 +70,8 @@ class Editex(SequenceSimilarityMeasure):
             2
             >>> ed.get_raw_score('aluminum', 'Catalan')
             12
+            >>> ed.get_raw_score('aluminum', 'Catalan', max_dist=4)
+            5
             >>> ed.get_raw_score('ATCG', 'TAGC')
             6
 
@@ -75,49 +82,58 @@ class Editex(SequenceSimilarityMeasure):
         # input validations
         utils.sim_check_for_none(string1, string2)
         utils.sim_check_for_string_inputs(string1, string2)
+        utils.sim_check_max_dist(max_dist)
+        max_dist = self._to_int_max_dist(max_dist)
         if utils.sim_check_for_exact_match(string1, string2):
             return 0
 
-        # convert both the strings to NFKD normalized unicode
-        string1 = unicodedata.normalize('NFKD', text_type(string1.upper()))
-        string2 = unicodedata.normalize('NFKD', text_type(string2.upper()))
-
-        # convert ß to SS (for Python2)
-        string1 = string1.replace('ß', 'SS')
-        string2 = string2.replace('ß', 'SS')
-
-        if len(string1) == 0:
-            return len(string2) * self.mismatch_cost
-        if len(string2) == 0:
-            return len(string1) * self.mismatch_cost
-
-        d_mat = np.zeros((len(string1) + 1, len(string2) + 1), dtype=np.int)
-        len1 = len(string1)
-        len2 = len(string2)
-        string1 = ' ' + string1
-        string2 = ' ' + string2
-        editex_helper = EditexHelper(self.match_cost, self.mismatch_cost,
-                                     self.group_cost)
-
-        if not self.local:
-            for i in xrange(1, len1 + 1):
-                d_mat[i, 0] = d_mat[i - 1, 0] + editex_helper.d_cost(
-                                                    string1[i - 1], string1[i])
-
-        for j in xrange(1, len2 + 1):
-            d_mat[0, j] = d_mat[0, j - 1] + editex_helper.d_cost(string2[j - 1],
-                                                                 string2[j])
-
-        for i in xrange(1, len1 + 1):
-            for j in xrange(1, len2 + 1):
-                d_mat[i, j] = min(d_mat[i - 1, j] + editex_helper.d_cost(
-                                                    string1[i - 1], string1[i]),
-                                  d_mat[i, j - 1] + editex_helper.d_cost(
-                                                    string2[j - 1], string2[j]),
-                                  d_mat[i - 1, j - 1] + editex_helper.r_cost(
-                                                        string1[i], string2[j]))
-
-        return d_mat[len1, len2]
+        return self._to_cost_type(editex(text_type(string1), text_type(string2), self.match_cost, self.group_cost,
+                                         self.mismatch_cost, self.local, max_dist))
+
+    def get_raw_scores(self, query, candidates, max_dist=None):
+        """
+        Computes the editex distances between a query string and a list of candidate strings.
+
+        The query is normalized and encoded into its letter groups once, and all the candidates are scored in a
+        single compiled loop, which is much faster than calling get_raw_score for each candidate.
+
+        Args:
+            query (str): Query string, the first string of each pair
+            candidates (list): Candidate strings
+            max_dist (float): Maximum distance of interest (defaults to None). Distances over max_dist are reported
+                              as max_dist + 1. It can only be a fractional number if one of the costs is a float
+
+        Returns:
+            Editex distances, in the order of the candidates (NumPy array of int64, or of float64 if one of the
+            costs is a float)
+
+        Raises:
+            TypeError : If the query or one of the candidates is not a string
+            ValueError : If max_dist is negative, or if it is not a whole number while all the costs are integers
+
+        Examples:
+            >>> ed = Editex()
+            >>> ed.get_raw_scores('Niall', ['Neil', 'Nigel', 'Niall', 'Catalan'])
+            array([2, 3, 0, 9])
+            >>> ed.get_raw_scores('Niall', ['Neil', 'Nigel', 'Niall', 'Catalan'], max_dist=2)
+            array([2, 3, 0, 3])
+        """
+        # input validations
+        utils.sim_check_for_none(query, candidates)
+        utils.sim_check_max_dist(max_dist)
+        max_dist = self._to_int_max_dist(max_dist)
+
+        # convert input to unicode.
+        query = utils.convert_to_unicode(query)
+
+        utils.tok_check_for_string_input(query)
+
+        if not isinstance(candidates, (list, tuple)):
+            candidates = list(candidates)
+
+        scores = editex_batch(query, candidates, self.match_cost, self.group_cost, self.mismatch_cost, self.local,
+                              max_dist)
+        return scores.astype(np.int64) if self._has_int_costs() else scores
 
     def get_sim_score(self, string1, string2):
         """
@@ -230,41 +246,21 @@ class Editex(SequenceSimilarityMeasure):
         self.local = local
         return True
 
+    def _has_int_costs(self):
+        return all(isinstance(cost, six.integer_types) for cost in
+                   (self.match_cost, self.group_cost, self.mismatch_cost))
 
-class EditexHelper:
-    letter_groups = dict()
-    letter_groups['A'] = letter_groups['E'] = letter_groups['I'] = letter_groups['O'] \
-        = letter_groups['U'] = letter_groups['Y'] = 0
-    letter_groups['B'] = letter_groups['P'] = 1
-    letter_groups['C'] = letter_groups['K'] = letter_groups['Q'] = 2
-    letter_groups['D'] = letter_groups['T'] = 3
-    letter_groups['L'] = letter_groups['R'] = 4
-    letter_groups['M'] = letter_groups['N'] = 5
-    letter_groups['G'] = letter_groups['J'] = 6
-    letter_groups['F'] = letter_groups['P'] = letter_groups['V'] = 7
-    letter_groups['S'] = letter_groups['X'] = letter_groups['Z'] = 8
-    letter_groups['C'] = letter_groups['S'] = letter_groups['J'] = 9
-    all_letters = frozenset('AEIOUYBPCKQDTLRMNGJFVSXZ')
-
-    def __init__(self, match_cost, mismatch_cost, group_cost):
-        self.match_cost = match_cost
-        self.mismatch_cost = mismatch_cost
-        self.group_cost = group_cost
+    def _to_cost_type(self, score):
+        # the compiled kernel works on doubles, integer costs give integer distances
+        return int(score) if self._has_int_costs() else score
 
-    def r_cost(self, ch1, ch2):
-        """Return r(a,b) according to Zobel & Dart's definition
-        """
-        if ch1 == ch2:
-            return self.match_cost
-        if ch1 in EditexHelper.all_letters and ch2 in EditexHelper.all_letters:
-            if (EditexHelper.letter_groups[ch1] ==
-                EditexHelper.letter_groups[ch2]):
-                return self.group_cost
-        return self.mismatch_cost
+    def _to_int_max_dist(self, max_dist):
+        # with integer costs, the distances are integers and _to_cost_type
+        # truncates max_dist + 1, so a fractional max_dist would silently be
+        # rounded down
+        if max_dist is None or not self._has_int_costs():
+            return max_dist
+        if max_dist != int(max_dist):
+            raise ValueError('max_dist should be a whole number when all the costs are integers')
+        return int(max_dist)
 
-    def d_cost(self, ch1, ch2):
-        """Return d(a,b) according to Zobel & Dart's definition
-        """
-        if ch1 != ch2 and (ch1 == 'H' or ch1 == 'W'):
-            return self.group_cost
-        return self.r_cost(ch1, ch2)
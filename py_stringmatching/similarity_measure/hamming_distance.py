@@ -1,10 +1,21 @@
 from __future__ import division
 
+import numpy as np
+
 from py_stringmatching import utils
 from py_stringmatching.similarity_measure.sequence_similarity_measure import \
                                                     SequenceSimilarityMeasure
 
 
+# number of bits set in each 16-bit value
+_POPCOUNT = np.unpackbits(np.arange(1 << 16, dtype=np.uint16).view(np.uint8).reshape(-1, 2), axis=1).sum(
+    axis=1, dtype=np.uint8)
+
+# number of character comparisons (or bytes of packed codes) held at once by
+# the blocks of a distance matrix
+_BLOCK_SIZE = 1 << 22
+
+
 class HammingDistance(SequenceSimilarityMeasure):
     """Computes Hamming distance.
 
@@ -92,3 +103,173 @@ class HammingDistance(SequenceSimilarityMeasure):
         if common_len == 0:
             return 1.0
         return 1 - (raw_score / common_len)
+
+    def get_raw_scores(self, strings1, strings2):
+        """Computes the raw Hamming distances between the strings of two lists, pair by pair.
+
+        The strings are viewed as fixed-width NumPy arrays of character codes, and all the pairs are compared in a
+        few vectorized operations, with their lengths checked once for the whole batch. A single string can be
+        given instead of either list, to be compared with every string of the other one.
+
+        Args:
+            strings1,strings2 (list or str): Input strings, as lists (or NumPy arrays of unicode or bytes strings)
+                                             of the same size, or a single string.
+
+        Returns:
+            Hamming distances of strings1[i] and strings2[i], in order (NumPy array of int64).
+
+        Raises:
+            TypeError : If the inputs are not strings or if one of the inputs is None.
+            ValueError : If the lists are not of the same size or if the strings of a pair are not of same length.
+
+        Examples:
+            >>> hd = HammingDistance()
+            >>> hd.get_raw_scores(['karolin', 'alex'], ['kathrin', 'john'])
+            array([3, 4])
+            >>> hd.get_raw_scores('10110', ['10011', '10110', '01001'])
+            array([2, 0, 5])
+        """
+
+        # input validations
+        utils.sim_check_for_none(strings1, strings2)
+
+        codes1, lengths1 = _get_codes(strings1)
+        codes2, lengths2 = _get_codes(strings2)
+        if len(codes1) != len(codes2) and len(codes1) != 1 and len(codes2) != 1:
+            raise ValueError('The lists of strings should be of the same size')
+        if not np.all(lengths1 == lengths2):
+            raise ValueError('Undefined for sequences of unequal length')
+
+        codes1, codes2 = _to_common_width(codes1, codes2)
+        return np.count_nonzero(codes1 != codes2, axis=1).astype(np.int64)
+
+    def get_raw_score_matrix(self, strings1, strings2):
+        """Computes the raw Hamming distances between every string of a list and every string of another list.
+
+        The strings are viewed as fixed-width NumPy arrays of character codes and compared block by block. Binary
+        codes, made only of the characters '0' and '1', are packed into 64-bit words instead, 64 characters to the
+        word, and each distance is the number of bits set in the exclusive or of the words.
+
+        Args:
+            strings1,strings2 (list): Input strings, as lists (or NumPy arrays of unicode or bytes strings) all of the
+                                      same length.
+
+        Returns:
+            Hamming distances, with the distance of strings1[i] and strings2[j] at row i and column j (2-D NumPy array
+            of int64).
+
+        Raises:
+            TypeError : If the inputs are not strings or if one of the inputs is None.
+            ValueError : If the strings are not all of the same length.
+
+        Examples:
+            >>> hd = HammingDistance()
+            >>> hd.get_raw_score_matrix(['10110', '00000'], ['10011', '10110', '01001'])
+            array([[2, 0, 5],
+                   [3, 3, 2]])
+        """
+
+        # input validations
+        utils.sim_check_for_none(strings1, strings2)
+
+        codes1, lengths1 = _get_codes(strings1)
+        codes2, lengths2 = _get_codes(strings2)
+        lengths = np.unique(np.concatenate((lengths1, lengths2)))
+        if len(lengths) > 1:
+            raise ValueError('Undefined for sequences of unequal length')
+
+        matrix = np.empty((len(codes1), len(codes2)), dtype=np.int64)
+        if len(lengths) == 0:
+            return matrix
+
+        # the characters past the common length are all padding
+        codes1, codes2 = codes1[:, :lengths[0]], codes2[:, :lengths[0]]
+        if _is_binary(codes1) and _is_binary(codes2):
+            words1, words2 = _pack_bits(codes1), _pack_bits(codes2)
+            block = max(1, _BLOCK_SIZE // max(1, words2.size * 8))
+            for start in range(0, len(words1), block):
+                diff = words1[start:start + block, None, :] ^ words2[None, :, :]
+                matrix[start:start + block] = _POPCOUNT[diff.view(np.uint16)].sum(axis=2, dtype=np.int64)
+            return matrix
+
+        codes1, codes2 = _to_common_width(codes1, codes2)
+        block = max(1, _BLOCK_SIZE // max(1, codes2.size))
+        for start in range(0, len(codes1), block):
+            matrix[start:start + block] = np.count_nonzero(codes1[start:start + block, None, :] != codes2[None, :, :],
+                                                           axis=2)
+        return matrix
+
+
+def _get_codes(strings):
+    # Views strings as a 2-D array of character codes, one row per string
+    # padded with zeros, and returns it with the lengths of the strings. The
+    # bytes strings are utf-8 encoded, as in get_raw_score, and are only
+    # decoded if they are not all ASCII.
+    if isinstance(strings, (bytes, str)):
+        strings = [strings]
+    lengths = None
+    if not isinstance(strings, np.ndarray):
+        # NumPy strips the trailing null characters of its strings, so the
+        # lengths are taken from the strings themselves
+        strings = list(strings)
+        lengths = _get_lengths(strings)
+    try:
+        array = np.asarray(strings)
+    except UnicodeDecodeError:
+        # NumPy decodes the non-ASCII bytes strings mixed with unicode ones
+        # as ASCII
+        array = np.asarray([utils.convert_to_unicode(string) for string in strings])
+    if array.size == 0:
+        array = np.empty(0, dtype='U1')
+    if array.dtype.kind not in ('U', 'S'):
+        raise TypeError('Inputs are expected to be strings or lists of strings')
+    array = np.ascontiguousarray(array.reshape(-1))
+
+    if array.dtype.kind == 'S':
+        codes = array.view(np.uint8).reshape(len(array), array.dtype.itemsize)
+        if codes.size != 0 and codes.max() >= 128:
+            array = np.char.decode(array, 'utf-8')
+            codes = None
+    if array.dtype.kind == 'U':
+        codes = array.view(np.uint32).reshape(len(array), array.dtype.itemsize // 4)
+
+    if lengths is None:
+        # a string of a NumPy array ends at the last non-zero code of its row
+        if codes.shape[1] == 0:
+            return codes, np.zeros(len(codes), dtype=np.int64)
+        nonzero = codes[:, ::-1] != 0
+        return codes, np.where(nonzero.any(axis=1), codes.shape[1] - nonzero.argmax(axis=1), 0)
+    if len(lengths) > 0 and lengths.max() > codes.shape[1]:
+        # the trailing null characters are put back as padding
+        codes = np.pad(codes, ((0, 0), (0, lengths.max() - codes.shape[1])), 'constant')
+    return codes, lengths
+
+
+def _get_lengths(strings):
+    # lengths of the strings, the bytes strings being decoded as in
+    # get_raw_score
+    try:
+        return np.array([len(utils.convert_to_unicode(string)) if isinstance(string, bytes) else len(string)
+                         for string in strings], dtype=np.int64)
+    except TypeError:
+        raise TypeError('Inputs are expected to be strings or lists of strings')
+
+
+def _to_common_width(codes1, codes2):
+    # pads the narrower array of codes with zeros, the codes of the padding
+    width = max(codes1.shape[1], codes2.shape[1])
+    if codes1.shape[1] == codes2.shape[1]:
+        return codes1, codes2
+    return (np.pad(codes1, ((0, 0), (0, width - codes1.shape[1])), 'constant'),
+            np.pad(codes2, ((0, 0), (0, width - codes2.shape[1])), 'constant'))
+
+
+def _is_binary(codes):
+    return bool(np.all((codes == ord('0')) | (codes == ord('1'))))
+
+
+def _pack_bits(codes):
+    # packs the binary codes into rows of 64-bit words, padded with zeros
+    packed = np.packbits(codes == ord('1'), axis=1)
+    packed = np.pad(packed, ((0, 0), (0, -packed.shape[1] % 8)), 'constant')
+    return np.ascontiguousarray(packed).view(np.uint64)
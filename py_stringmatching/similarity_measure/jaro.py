@@ -2,7 +2,7 @@ from py_stringmatching import utils
 from six.moves import xrange
 from py_stringmatching.similarity_measure.sequence_similarity_measure import \
                                                     SequenceSimilarityMeasure
-from py_stringmatching.similarity_measure.cython.cython_jaro import jaro
+from py_stringmatching.similarity_measure.cython.cython_jaro import jaro, jaro_batch
 
 
 class Jaro(SequenceSimilarityMeasure):
@@ -76,3 +76,38 @@ class Jaro(SequenceSimilarityMeasure):
 
         """
         return self.get_raw_score(string1, string2)
+
+    def get_sim_scores(self, query, candidates):
+        """Computes the normalized Jaro similarities between a query string and a list of candidate strings.
+
+        The query is preprocessed once and all the candidates are scored in a single compiled loop, which is much
+        faster than calling get_sim_score for each candidate.
+
+        Args:
+            query (str): Query string.
+            candidates (list): Candidate strings.
+
+        Returns:
+            Normalized Jaro similarities, in the order of the candidates (NumPy array of float64).
+
+        Raises:
+            TypeError : If the query or one of the candidates is not a string.
+
+        Examples:
+            >>> jaro = Jaro()
+            >>> jaro.get_sim_scores('MARTHA', ['MARHTA', 'MARTHA', ''])
+            array([0.94444442, 1.        , 0.        ])
+        """
+
+        # input validations
+        utils.sim_check_for_none(query, candidates)
+
+        # convert input to unicode.
+        query = utils.convert_to_unicode(query)
+
+        utils.tok_check_for_string_input(query)
+
+        if not isinstance(candidates, (list, tuple)):
+            candidates = list(candidates)
+
+        return jaro_batch(query, candidates)
@@ -1,7 +1,7 @@
 from py_stringmatching import utils
 from py_stringmatching.similarity_measure.sequence_similarity_measure import \
                                                     SequenceSimilarityMeasure
-from py_stringmatching.similarity_measure.cython.cython_jaro_winkler import jaro_winkler
+from py_stringmatching.similarity_measure.cython.cython_jaro_winkler import jaro_winkler, jaro_winkler_batch
 
 
 class JaroWinkler(SequenceSimilarityMeasure):
@@ -58,11 +58,15 @@ class JaroWinkler(SequenceSimilarityMeasure):
 
         return jaro_winkler(string1, string2, self.prefix_weight)
 
-    def get_sim_score(self, string1, string2):
+    def get_sim_score(self, string1, string2, min_sim=None):
         """Computes the normalized Jaro-Winkler similarity score between two strings. Simply call get_raw_score.
 
         Args:
             string1,string2 (str): Input strings.
+            min_sim (float): Minimum similarity of interest (defaults to None). If given, the pairs that can not reach
+                             min_sim are rejected from their lengths, common prefix and characters before the Jaro
+                             kernel runs, the kernel stops as soon as min_sim is out of reach, and 0.0 is returned for
+                             pairs whose similarity is below min_sim.
 
         Returns:
             Normalized Jaro-Winkler similarity (float).
@@ -78,8 +82,65 @@ class JaroWinkler(SequenceSimilarityMeasure):
             0.84
             >>> jw.get_sim_score('DIXON', 'DICKSONX')
             0.8133333333333332
+            >>> jw.get_sim_score('DIXON', 'DICKSONX', min_sim=0.85)
+            0.0
         """
-        return self.get_raw_score(string1, string2)
+        if min_sim is None:
+            return self.get_raw_score(string1, string2)
+
+        # input validations
+        utils.sim_check_for_none(string1, string2)
+
+        # convert input to unicode.
+        string1 = utils.convert_to_unicode(string1)
+        string2 = utils.convert_to_unicode(string2)
+
+        utils.tok_check_for_string_input(string1, string2)
+
+        # if one of the strings is empty return 0
+        if utils.sim_check_for_empty(string1, string2):
+            return 0
+
+        return jaro_winkler(string1, string2, self.prefix_weight, min_sim)
+
+    def get_sim_scores(self, query, candidates, min_sim=None):
+        """Computes the normalized Jaro-Winkler similarities between a query string and a list of candidate strings.
+
+        The query is preprocessed once and all the candidates are scored in a single compiled loop, which is much
+        faster than calling get_sim_score for each candidate.
+
+        Args:
+            query (str): Query string.
+            candidates (list): Candidate strings.
+            min_sim (float): Minimum similarity of interest (defaults to None). Similarities below min_sim are
+                             reported as 0.0, see get_sim_score.
+
+        Returns:
+            Normalized Jaro-Winkler similarities, in the order of the candidates (NumPy array of float64).
+
+        Raises:
+            TypeError : If the query or one of the candidates is not a string.
+
+        Examples:
+            >>> jw = JaroWinkler()
+            >>> jw.get_sim_scores('DIXON', ['DICKSONX', 'DIXON', ''])
+            array([0.81333333, 1.        , 0.        ])
+            >>> jw.get_sim_scores('DIXON', ['DICKSONX', 'DIXON', ''], min_sim=0.85)
+            array([0., 1., 0.])
+        """
+
+        # input validations
+        utils.sim_check_for_none(query, candidates)
+
+        # convert input to unicode.
+        query = utils.convert_to_unicode(query)
+
+        utils.tok_check_for_string_input(query)
+
+        if not isinstance(candidates, (list, tuple)):
+            candidates = list(candidates)
+
+        return jaro_winkler_batch(query, candidates, self.prefix_weight, min_sim)
 
     def get_prefix_weight(self):
         """Get prefix weight.
@@ -1,7 +1,12 @@
 from __future__ import division
 
+import numpy as np
+
 from py_stringmatching import utils
 from py_stringmatching.similarity_measure.cython.cython_levenshtein import levenshtein
+from py_stringmatching.similarity_measure.cython.cython_levenshtein import levenshtein_batch
+from py_stringmatching.similarity_measure.cython.cython_levenshtein import levenshtein_sim_batch
+from py_stringmatching.similarity_measure.cython.cython_levenshtein import weighted_levenshtein
 from py_stringmatching.similarity_measure.sequence_similarity_measure import \
     SequenceSimilarityMeasure
 
@@ -12,22 +17,41 @@ class Levenshtein(SequenceSimilarityMeasure):
     Levenshtein distance computes the minimum cost of transforming one string into the other. Transforming a string
     is carried out using a sequence of the following operators: delete a character, insert a character, and
     substitute one character for another.
+
+    Parameters:
+        ins_cost (int or float): Cost of inserting a character, default=1
+        del_cost (int or float): Cost of deleting a character, default=1
+        sub_cost (int or float): Cost of substituting one character for another, default=1
+
+    With the default unit costs the distance is computed with a bit-parallel algorithm. With other costs, the
+    distance is computed with two rows of the dynamic programming matrix, and the similarity is normalized by the
+    largest possible distance between strings of the given lengths.
     """
 
-    def __init__(self):
+    def __init__(self, ins_cost=1, del_cost=1, sub_cost=1):
+        # validate the costs
+        utils.sim_check_edit_costs(ins_cost, del_cost, sub_cost)
+
+        self.ins_cost = ins_cost
+        self.del_cost = del_cost
+        self.sub_cost = sub_cost
         super(Levenshtein, self).__init__()
 
-    def get_raw_score(self, string1, string2):
+    def get_raw_score(self, string1, string2, max_dist=None):
         """Computes the raw Levenshtein distance between two strings.
 
         Args:
             string1,string2 (str): Input strings.
+            max_dist (int): Maximum distance of interest (defaults to None). If given, the computation stops as soon as
+                            the distance is known to exceed max_dist, and max_dist + 1 is returned in that case. It
+                            can only be a fractional number if one of the costs is a float other than 1.0.
 
         Returns:
-            Levenshtein distance (int).
+            Levenshtein distance (int, or float if one of the costs is a float).
 
         Raises:
             TypeError : If the inputs are not strings.
+            ValueError : If max_dist is negative, or if it is not a whole number while all the costs are integers or 1.
 
         Examples:
             >>> lev = Levenshtein()
@@ -37,10 +61,18 @@ class Levenshtein(SequenceSimilarityMeasure):
             3
             >>> lev.get_raw_score('levenshtein', 'frankenstein')
             6
+            >>> lev.get_raw_score('levenshtein', 'frankenstein', max_dist=3)
+            4
+            >>> lev = Levenshtein(sub_cost=2)
+            >>> lev.get_raw_score('example', 'samples')
+            4
         """
         
         # input validations
         utils.sim_check_for_none(string1, string2)
+        utils.sim_check_max_dist(max_dist)
+        if self._has_int_distances():
+            max_dist = self._to_int_max_dist(max_dist)
 
         # convert input to unicode.
         string1 = utils.convert_to_unicode(string1)
@@ -51,13 +83,19 @@ class Levenshtein(SequenceSimilarityMeasure):
         if utils.sim_check_for_exact_match(string1, string2):
             return 0.0
 
-        return levenshtein(string1, string2)
+        if self._has_unit_costs():
+            return levenshtein(string1, string2, max_dist)
+
+        return self._to_cost_type(weighted_levenshtein(string1, string2, self.ins_cost, self.del_cost,
+                                                       self.sub_cost, max_dist))
 
-    def get_sim_score(self, string1, string2):
+    def get_sim_score(self, string1, string2, min_sim=None):
         """Computes the normalized Levenshtein similarity score between two strings.
 
         Args:
             string1,string2 (str): Input strings.
+            min_sim (float): Minimum similarity of interest (defaults to None). If given, the distance is computed with
+                             the bound implied by min_sim, and 0.0 is returned for pairs whose similarity is below min_sim.
 
         Returns:
             Normalized Levenshtein similarity (float).
@@ -73,6 +111,8 @@ class Levenshtein(SequenceSimilarityMeasure):
             0.5714285714285714
             >>> lev.get_sim_score('levenshtein', 'frankenstein')
             0.5
+            >>> lev.get_sim_score('levenshtein', 'frankenstein', min_sim=0.8)
+            0.0
 
         """
 
@@ -80,8 +120,201 @@ class Levenshtein(SequenceSimilarityMeasure):
         string1 = utils.convert_to_unicode(string1)
         string2 = utils.convert_to_unicode(string2)
 
-        raw_score = self.get_raw_score(string1, string2)
-        max_len = max(len(string1), len(string2))
-        if max_len == 0:
-            return 1.0
-        return 1 - (raw_score / max_len)
+        if min_sim is None:
+            raw_score = self.get_raw_score(string1, string2)
+            max_cost = self._get_max_cost(string1, string2)
+            if max_cost == 0:
+                return 1.0
+            return 1 - (raw_score / max_cost)
+
+        utils.sim_check_for_none(string1, string2)
+        utils.tok_check_for_string_input(string1, string2)
+
+        max_cost = self._get_max_cost(string1, string2)
+        if max_cost == 0:
+            sim_score = 1.0
+        else:
+            # the small tolerance keeps the bound from being rounded down,
+            # the final comparison below is done on the exact score
+            max_dist = (1 - min_sim) * max_cost + 1e-9
+            if self._has_int_distances():
+                max_dist = int(max_dist)
+            if max_dist < 0:
+                return 0.0
+            sim_score = 1 - (self.get_raw_score(string1, string2, max_dist) / max_cost)
+        return sim_score if sim_score >= min_sim else 0.0
+
+    def get_raw_scores(self, query, candidates, max_dist=None):
+        """Computes the raw Levenshtein distances between a query string and a list of candidate strings.
+
+        The query is preprocessed once and all the candidates are scored in a single compiled loop, which is much
+        faster than calling get_raw_score for each candidate.
+
+        Args:
+            query (str): Query string.
+            candidates (list): Candidate strings.
+            max_dist (int): Maximum distance of interest (defaults to None). Distances over max_dist are reported
+                            as max_dist + 1. It can only be a fractional number if one of the costs is a float other
+                            than 1.0.
+
+        Returns:
+            Levenshtein distances, in the order of the candidates (NumPy array of int64, or of float64 if one of
+            the costs is a float).
+
+        Raises:
+            TypeError : If the query or one of the candidates is not a string.
+            ValueError : If max_dist is negative, or if it is not a whole number while all the costs are integers or 1.
+
+        Examples:
+            >>> lev = Levenshtein()
+            >>> lev.get_raw_scores('example', ['samples', 'example', ''])
+            array([3, 0, 7])
+            >>> lev.get_raw_scores('example', ['samples', 'example', ''], max_dist=2)
+            array([3, 0, 3])
+        """
+
+        # input validations
+        utils.sim_check_for_none(query, candidates)
+        utils.sim_check_max_dist(max_dist)
+        if self._has_int_distances():
+            max_dist = self._to_int_max_dist(max_dist)
+
+        # convert input to unicode.
+        query = utils.convert_to_unicode(query)
+
+        utils.tok_check_for_string_input(query)
+
+        if not isinstance(candidates, (list, tuple)):
+            candidates = list(candidates)
+
+        if self._has_unit_costs():
+            return levenshtein_batch(query, candidates, max_dist)
+
+        return np.array([self.get_raw_score(query, candidate, max_dist) for candidate in candidates],
+                        dtype=np.int64 if self._has_int_costs() else np.float64)
+
+    def get_sim_scores(self, query, candidates, min_sim=None):
+        """Computes the normalized Levenshtein similarities between a query string and a list of candidate strings.
+
+        Args:
+            query (str): Query string.
+            candidates (list): Candidate strings.
+            min_sim (float): Minimum similarity of interest (defaults to None). Similarities below min_sim are
+                             reported as 0.0.
+
+        Returns:
+            Normalized Levenshtein similarities, in the order of the candidates (NumPy array of float64).
+
+        Raises:
+            TypeError : If the query or one of the candidates is not a string.
+
+        Examples:
+            >>> lev = Levenshtein()
+            >>> lev.get_sim_scores('levenshtein', ['frankenstein', 'levenshtein'])
+            array([0.5, 1. ])
+            >>> lev.get_sim_scores('levenshtein', ['frankenstein', 'levenshtein'], min_sim=0.8)
+            array([0., 1.])
+        """
+
+        # input validations
+        utils.sim_check_for_none(query, candidates)
+
+        # convert input to unicode.
+        query = utils.convert_to_unicode(query)
+
+        utils.tok_check_for_string_input(query)
+
+        if not isinstance(candidates, (list, tuple)):
+            candidates = list(candidates)
+
+        if self._has_unit_costs():
+            return levenshtein_sim_batch(query, candidates, min_sim)
+
+        return np.array([self.get_sim_score(query, candidate, min_sim) for candidate in candidates],
+                        dtype=np.float64)
+
+    def get_ins_cost(self):
+        """
+        Get insertion cost
+
+        Returns:
+            insertion cost (int or float)
+        """
+        return self.ins_cost
+
+    def get_del_cost(self):
+        """
+        Get deletion cost
+
+        Returns:
+            deletion cost (int or float)
+        """
+        return self.del_cost
+
+    def get_sub_cost(self):
+        """
+        Get substitution cost
+
+        Returns:
+            substitution cost (int or float)
+        """
+        return self.sub_cost
+
+    def set_ins_cost(self, ins_cost):
+        """
+        Set insertion cost
+
+        Args:
+            ins_cost (int or float): Cost of inserting a character
+        """
+        utils.sim_check_edit_costs(ins_cost)
+        self.ins_cost = ins_cost
+        return True
+
+    def set_del_cost(self, del_cost):
+        """
+        Set deletion cost
+
+        Args:
+            del_cost (int or float): Cost of deleting a character
+        """
+        utils.sim_check_edit_costs(del_cost)
+        self.del_cost = del_cost
+        return True
+
+    def set_sub_cost(self, sub_cost):
+        """
+        Set substitution cost
+
+        Args:
+            sub_cost (int or float): Cost of substituting one character for another
+        """
+        utils.sim_check_edit_costs(sub_cost)
+        self.sub_cost = sub_cost
+        return True
+
+    def _has_unit_costs(self):
+        return self.ins_cost == 1 and self.del_cost == 1 and self.sub_cost == 1
+
+    def _has_int_costs(self):
+        return all(isinstance(cost, int) for cost in (self.ins_cost, self.del_cost, self.sub_cost))
+
+    def _to_cost_type(self, score):
+        # the compiled kernel works on doubles, integer costs give integer distances
+        return int(score) if self._has_int_costs() else score
+
+    def _has_int_distances(self):
+        return self._has_unit_costs() or self._has_int_costs()
+
+    def _to_int_max_dist(self, max_dist):
+        # the distances are integers, the unit cost kernels take an integer
+        # bound and _to_cost_type truncates max_dist + 1, so a fractional
+        # max_dist would silently be rounded down
+        if max_dist is None:
+            return None
+        if max_dist != int(max_dist):
+            raise ValueError('max_dist should be a whole number when all the costs are integers or 1')
+        return int(max_dist)
+
+    def _get_max_cost(self, string1, string2):
+        return utils.get_max_edit_cost(len(string1), len(string2), self.ins_cost, self.del_cost, self.sub_cost)
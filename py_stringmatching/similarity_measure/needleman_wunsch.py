@@ -4,7 +4,8 @@ from py_stringmatching import utils
 from six.moves import xrange
 from py_stringmatching.similarity_measure.sequence_similarity_measure import \
                                                     SequenceSimilarityMeasure
-from py_stringmatching.similarity_measure.cython.cython_needleman_wunsch import needleman_wunsch
+from py_stringmatching.similarity_measure.cython.cython_needleman_wunsch import needleman_wunsch, \
+    needleman_wunsch_banded
 from py_stringmatching.similarity_measure.cython.cython_utils import cython_sim_ident
 
 
@@ -18,9 +19,13 @@ class NeedlemanWunsch(SequenceSimilarityMeasure):
 
     Args:
         gap_cost (float): Cost of gap (defaults to 1.0).
-        sim_func (function): Similarity function to give a score for each correspondence between the characters (defaults
-                             to an identity function, which returns 1 if the two characters are the same and 0 otherwise.  
-                             
+        sim_func (function or SubstitutionMatrix): Similarity function to give a score for each correspondence
+                                                   between the characters (defaults to an identity function, which
+                                                   returns 1 if the two characters are the same and 0 otherwise). The
+                                                   function is called once per distinct pair of characters of the two
+                                                   strings. The scores of a SubstitutionMatrix, such as a BLOSUM or
+                                                   nucleotide matrix, are looked up by the DP without calling Python.
+
     Attributes:
         gap_cost (float): An attribute to store the gap cost.
         sim_func (function): An attribute to store the similarity function.
@@ -31,14 +36,17 @@ class NeedlemanWunsch(SequenceSimilarityMeasure):
         self.sim_func = sim_func
         super(NeedlemanWunsch, self).__init__()
 
-    def get_raw_score(self, string1, string2):
+    def get_raw_score(self, string1, string2, min_score=None):
         """Computes the raw Needleman-Wunsch score between two strings.
 
         Args:
             string1,string2 (str) : Input strings.
+            min_score (float): Minimum score of interest (defaults to None). If given, the computation stops as soon as
+                               no alignment can reach min_score, given the best score of a pair of characters, and
+                               -inf is returned for the scores below min_score.
 
         Returns:
-            Needleman-Wunsch similarity score (float).
+            Needleman-Wunsch similarity score (float), or -inf if it is below min_score.
 
         Raises:
             TypeError : If the inputs are not strings or if one of the inputs is None.
@@ -56,6 +64,8 @@ class NeedlemanWunsch(SequenceSimilarityMeasure):
             >>> nw = NeedlemanWunsch(gap_cost=0.5, sim_func=lambda s1, s2 : (1.0 if s1 == s2 else -1.0))
             >>> nw.get_raw_score('GCATGCUA', 'GATTACA')
             2.5
+            >>> nw.get_raw_score('GCATGCUA', 'GATTACA', min_score=3.0)
+            -inf
         """
         
         # input validations
@@ -68,7 +78,57 @@ class NeedlemanWunsch(SequenceSimilarityMeasure):
         utils.tok_check_for_string_input(string1, string2)
 
         # returns the similarity score from the cython function
-        return needleman_wunsch(string1, string2, self.gap_cost, self.sim_func)
+        return needleman_wunsch(string1, string2, self.gap_cost, self.sim_func, min_score)
+
+    def get_banded_raw_score(self, string1, string2, band=None, min_score=None):
+        """Computes the raw Needleman-Wunsch score between two strings over a band around the diagonal of the DP matrix.
+
+        For strings of similar lengths, the best alignment rarely strays far from the diagonal. Only the cells (i, j)
+        with min(0, d) - band <= j - i <= max(0, d) + band, where d = len(string2) - len(string1), are computed, that
+        is O(len(string1) * band) cells instead of len(string1) * len(string2). An alignment leaving the band needs at
+        least abs(d) + 2 * (band + 1) gaps, which bounds its score given the best score of a pair of characters. If the
+        score within the band exceeds that bound, by more than the rounding errors of the computation, no alignment
+        leaving the band can score higher, and the score is reported as exact.
+
+        Args:
+            string1,string2 (str) : Input strings.
+            band (int): Number of diagonals computed beyond those between the two corners of the DP matrix, on each
+                        side (defaults to None).
+            min_score (float): Minimum score of interest (defaults to None). If no band is given, the narrowest band
+                               that can not cut off an alignment scoring min_score or more is used, so that the score
+                               is exact whenever it is at least min_score. If neither band nor min_score is given, the
+                               whole DP matrix is computed.
+
+        Returns:
+            A tuple (score, exact), where score is the best Needleman-Wunsch score of the alignments within the band
+            (float) and exact is True if it is the Needleman-Wunsch score of the two strings (bool).
+
+        Raises:
+            TypeError : If the inputs are not strings or if one of the inputs is None.
+            ValueError : If band is negative, or if both band and min_score are given.
+
+        Examples:
+            >>> nw = NeedlemanWunsch()
+            >>> nw.get_banded_raw_score('dva', 'deeva', band=0)
+            (1.0, True)
+            >>> nw = NeedlemanWunsch(gap_cost=0.5, sim_func=lambda s1, s2 : (1.0 if s1 == s2 else -1.0))
+            >>> nw.get_banded_raw_score('GCATGCUA', 'GATTACA', band=0)
+            (2.5, False)
+            >>> nw.get_banded_raw_score('GCATGCUA', 'GATTACA', min_score=2.0)
+            (2.5, True)
+        """
+
+        # input validations
+        utils.sim_check_for_none(string1, string2)
+        utils.sim_check_band(band, min_score)
+
+        # convert input to unicode.
+        string1 = utils.convert_to_unicode(string1)
+        string2 = utils.convert_to_unicode(string2)
+
+        utils.tok_check_for_string_input(string1, string2)
+
+        return needleman_wunsch_banded(string1, string2, self.gap_cost, self.sim_func, band, min_score)
 
     def get_gap_cost(self):
         """Get gap cost.
@@ -99,7 +159,8 @@ class NeedlemanWunsch(SequenceSimilarityMeasure):
         """Set similarity function.
 
         Args:
-            sim_func (function): Similarity function to give a score for the correspondence between characters.
+            sim_func (function or SubstitutionMatrix): Similarity function to give a score for the correspondence
+                                                       between characters.
         """
         self.sim_func = sim_func
         return True
@@ -17,8 +17,12 @@ class SmithWaterman(SequenceSimilarityMeasure):
 
     Args:
         gap_cost (float): Cost of gap (defaults to 1.0).
-        sim_func (function): Similarity function to give a score for the correspondence between the characters (defaults
-                             to an identity function, which returns 1 if the two characters are the same and 0 otherwise).
+        sim_func (function or SubstitutionMatrix): Similarity function to give a score for the correspondence
+                                                   between the characters (defaults to an identity function, which
+                                                   returns 1 if the two characters are the same and 0 otherwise). A
+                                                   SubstitutionMatrix is read from the loop over the DP cells, with no
+                                                   Python call per cell, and a function is called once per distinct
+                                                   pair of characters of the two strings.
 
     Attributes:
         gap_cost (float): An attribute to store the gap cost.
@@ -30,14 +34,17 @@ class SmithWaterman(SequenceSimilarityMeasure):
         self.sim_func = sim_func
         super(SmithWaterman, self).__init__()
 
-    def get_raw_score(self, string1, string2):
+    def get_raw_score(self, string1, string2, min_score=None):
         """Computes the raw Smith-Waterman score between two strings.
 
         Args:
             string1,string2 (str) : Input strings.
+            min_score (float): Minimum score of interest (defaults to None). If given, the computation stops as soon as
+                               no local alignment can reach min_score, given the best score of a pair of characters,
+                               and -inf is returned for the scores below min_score.
 
         Returns:
-            Smith-Waterman similarity score (float).
+            Smith-Waterman similarity score (float), or -inf if it is below min_score.
 
         Raises:
             TypeError : If the inputs are not strings or if one of the inputs is None.
@@ -46,6 +53,8 @@ class SmithWaterman(SequenceSimilarityMeasure):
             >>> sw = SmithWaterman()
             >>> sw.get_raw_score('cat', 'hat')
             2.0
+            >>> sw.get_raw_score('cat', 'hat', min_score=3)
+            -inf
             >>> sw = SmithWaterman(gap_cost=2.2)
             >>> sw.get_raw_score('dva', 'deeve')
             1.0
@@ -67,7 +76,7 @@ class SmithWaterman(SequenceSimilarityMeasure):
         utils.tok_check_for_string_input(string1, string2)
 
         # Returns smith waterman similarity score from cython function
-        return smith_waterman(string1,string2,self.gap_cost,self.sim_func)
+        return smith_waterman(string1, string2, self.gap_cost, self.sim_func, min_score)
 
     def get_gap_cost(self):
         """Get gap cost.
@@ -98,7 +107,8 @@ class SmithWaterman(SequenceSimilarityMeasure):
         """Set similarity function.
 
         Args:
-            sim_func (function): Similarity function to give a score for the correspondence between the characters.
+            sim_func (function or SubstitutionMatrix): Similarity function to give a score for the correspondence
+                                                       between the characters.
         """
         self.sim_func = sim_func
         return True
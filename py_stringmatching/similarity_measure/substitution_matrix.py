@@ -0,0 +1,113 @@
+"""Substitution matrix for the alignment measures"""
+
+import numpy as np
+
+from py_stringmatching import utils
+
+
+class SubstitutionMatrix(object):
+    """Scores of the correspondences between characters, to be used as the similarity function of the Affine,
+    NeedlemanWunsch and SmithWaterman measures.
+
+    A substitution matrix is a table of scores over an alphabet. The alignment measures look the scores up in it
+    from their compiled loops, instead of calling a Python similarity function for each cell of their dynamic
+    programming matrices. It can be given either as a dict of character pairs, or as a dense 2-D array whose rows
+    and columns are indexed by the characters of an alphabet. The pairs it does not cover, including those of
+    characters outside of the alphabet, score the default value. A substitution matrix can also be called like a
+    similarity function.
+
+    Args:
+        scores (dict or array): Either a dict mapping (char1, char2) pairs to their score, or a square 2-D array
+                                (list of lists or NumPy array) holding the score of alphabet[i] and alphabet[j] at
+                                row i and column j.
+        alphabet (str, list or dict): Characters indexing the rows and columns of a 2-D array of scores, in order,
+                                      or a dict mapping each character to its row and column. It is only used, and
+                                      is required, if scores is an array (defaults to None).
+        default (float): Score of the pairs not covered by scores (defaults to 0).
+
+    Raises:
+        ValueError : If the keys of a dict of scores are not pairs of characters, if the array of scores is not a
+                     square 2-D array, or if the alphabet is missing or does not match the array.
+
+    Examples:
+        >>> blosum = SubstitutionMatrix({('A', 'A'): 4, ('A', 'R'): -1, ('R', 'A'): -1, ('R', 'R'): 5}, default=-4)
+        >>> blosum('A', 'R')
+        -1.0
+        >>> blosum('A', 'W')
+        -4.0
+        >>> dna = SubstitutionMatrix([[2, -1, -1, -1], [-1, 2, -1, -1], [-1, -1, 2, -1], [-1, -1, -1, 2]], 'ACGT')
+        >>> dna('G', 'G')
+        2.0
+    """
+
+    def __init__(self, scores, alphabet=None, default=0):
+        self.default = default
+
+        if isinstance(scores, dict):
+            pairs = {}
+            for key, score in scores.items():
+                if not isinstance(key, tuple) or len(key) != 2:
+                    raise ValueError('The keys of the scores should be pairs of characters')
+                pairs[tuple(_get_char(char) for char in key)] = score
+            self._alphabet = {}
+            for char in sorted(set(char for pair in pairs for char in pair)):
+                self._alphabet[char] = len(self._alphabet)
+            size = len(self._alphabet)
+            self._table = np.full((size + 1, size + 1), default, dtype=np.float64)
+            for (char1, char2), score in pairs.items():
+                self._table[self._alphabet[char1], self._alphabet[char2]] = score
+            return
+
+        array = np.array(scores, dtype=np.float64)
+        if array.ndim != 2 or array.shape[0] != array.shape[1]:
+            raise ValueError('The scores should be a dict or a square 2-D array')
+        if alphabet is None:
+            raise ValueError('An alphabet is required for a 2-D array of scores')
+        if isinstance(alphabet, dict):
+            self._alphabet = dict((_get_char(char), index) for char, index in alphabet.items())
+        else:
+            self._alphabet = {}
+            for char in alphabet:
+                self._alphabet.setdefault(_get_char(char), len(self._alphabet))
+            if len(self._alphabet) != len(array):
+                raise ValueError('The alphabet should have one distinct character per row of the scores')
+        for index in self._alphabet.values():
+            if not 0 <= index < len(array):
+                raise ValueError('The alphabet maps a character outside of the rows of the scores')
+
+        # the extra last row and column hold the scores of the characters
+        # outside of the alphabet
+        size = len(array)
+        self._table = np.full((size + 1, size + 1), default, dtype=np.float64)
+        self._table[:size, :size] = array
+
+    def __call__(self, char1, char2):
+        return self.get_score(char1, char2)
+
+    def get_score(self, char1, char2):
+        """Gets the score of the correspondence between two characters.
+
+        Args:
+            char1,char2 (str): Input characters.
+
+        Returns:
+            Score of the two characters (float).
+        """
+        other = len(self._table) - 1
+        return float(self._table[self._alphabet.get(utils.convert_to_unicode(char1), other),
+                                 self._alphabet.get(utils.convert_to_unicode(char2), other)])
+
+    def get_default(self):
+        """Gets the score of the pairs not covered by the matrix.
+
+        Returns:
+            Default score (float).
+        """
+        return self.default
+
+
+def _get_char(char):
+    char = utils.convert_to_unicode(char)
+    if not isinstance(char, str) or len(char) != 1:
+        raise ValueError('The alphabet of the scores should be made of single characters')
+    return char
@@ -0,0 +1,546 @@
+from __future__ import unicode_literals
+
+import io
+import unittest
+from random import Random
+from nose.tools import *
+
+from py_stringmatching.index.bk_tree import BKTree
+from py_stringmatching.index.jaro_winkler_index import JaroWinklerIndex
+from py_stringmatching.index.multi_index_hashing import MultiIndexHashing
+from py_stringmatching.index.pass_join import PassJoin
+from py_stringmatching.index.qgram_index import QgramIndex
+from py_stringmatching.index.smith_waterman_index import SmithWatermanIndex
+from py_stringmatching.index.symmetric_delete_index import SymmetricDeleteIndex
+from py_stringmatching.index.trie import Trie
+from py_stringmatching.similarity_measure.bag_distance import BagDistance
+from py_stringmatching.similarity_measure.editex import Editex
+from py_stringmatching.similarity_measure.hamming_distance import HammingDistance
+from py_stringmatching.similarity_measure.jaro_winkler import JaroWinkler
+from py_stringmatching.similarity_measure.levenshtein import Levenshtein
+from py_stringmatching.similarity_measure.smith_waterman import SmithWaterman
+from py_stringmatching.similarity_measure.substitution_matrix import SubstitutionMatrix
+
+
+# strings indexed by the Levenshtein indexes, with duplicates, the empty
+# string, non-ASCII and long strings, and the query strings run against them
+WORDS = ['book', 'books', 'cake', 'boo', 'cape', 'cart', 'boon', 'cook', 'cake', '', 'b', '東京都', '京都府', 'bücher',
+         'abcdefghij' * 10]
+QUERY_STRINGS = ['bo', 'cook', 'cape', 'cate', 'xyz', '東京', '京都', 'bucher', b'b\xc3\xbccher', 'bokos', '',
+                 'abcdefghij' * 9 + 'abcdefgij']
+
+
+def scan(strings, query_string, max_dist, measure):
+    # reference results, computed by scoring every string
+    matches = [(position, measure.get_raw_score(query_string, string)) for position, string in enumerate(strings)]
+    return sorted([match for match in matches if match[1] <= max_dist], key=lambda match: (match[1], match[0]))
+
+
+def check_query(test_case, query, strings, max_dists=range(4), query_strings=QUERY_STRINGS, measure=None):
+    # checks the results of query(query_string, max_dist) against a scan of
+    # strings, with Levenshtein by default
+    measure = Levenshtein() if measure is None else measure
+    for query_string in query_strings:
+        for max_dist in max_dists:
+            test_case.assertEqual(query(query_string, max_dist), scan(strings, query_string, max_dist, measure))
+
+
+class ScanTestCases(unittest.TestCase):
+    def test_scan_words(self):
+        lev = Levenshtein()
+        self.assertEqual(scan(WORDS, 'bo', 2, lev), [(3, 1), (10, 1), (0, 2), (6, 2), (9, 2)])
+        self.assertEqual(scan(WORDS, 'cake', 0, lev), [(2, 0), (8, 0)])
+        self.assertEqual(scan(WORDS, 'cate', 1, lev), [(2, 1), (4, 1), (8, 1)])
+        self.assertEqual(scan(WORDS, '', 1, lev), [(9, 0), (10, 1)])
+        self.assertEqual(scan(WORDS, '京都', 1, lev), [(11, 1), (12, 1)])
+        self.assertEqual(scan(WORDS, b'b\xc3\xbccher', 0, lev), [(13, 0)])
+        self.assertEqual(scan(WORDS, 'abcdefghij' * 9 + 'abcdefgij', 1, lev), [(14, 1)])
+        self.assertEqual(scan(WORDS, 'xyz', 2, lev), [])
+
+
+class BKTreeTestCases(unittest.TestCase):
+    def setUp(self):
+        self.bk_tree = BKTree(WORDS)
+
+    def test_query_valid(self):
+        check_query(self, self.bk_tree.query, WORDS)
+
+    def test_query_empty_index(self):
+        bk_tree = BKTree([])
+        self.assertEqual(bk_tree.query('a', 3), [])
+        self.assertEqual(bk_tree.get_num_evaluations(), 0)
+
+    def test_query_other_measures(self):
+        strings = ['cat', 'hat', 'act', 'cot', 'dog', 'god', 'cab']
+        for measure in [HammingDistance(), BagDistance()]:
+            bk_tree = BKTree(strings, measure)
+            self.assertEqual(bk_tree.get_measure(), measure)
+            check_query(self, bk_tree.query, strings, range(3), ['cat', 'dot', 'abc'], measure)
+
+    def test_query_non_metric_measure(self):
+        # Editex does not satisfy the triangle inequality, so strings within
+        # max_dist may be missed, but all the strings found are matches
+        strings = ['cat', 'hat', 'act', 'cot', 'dog', 'god', 'cab']
+        measure = Editex()
+        bk_tree = BKTree(strings, measure)
+        for query_string in ['cat', 'dot', 'abc']:
+            for max_dist in range(5):
+                self.assertLessEqual(set(bk_tree.query(query_string, max_dist)),
+                                     set(scan(strings, query_string, max_dist, measure)))
+
+    def test_num_evaluations(self):
+        strings = ['%05d' % number for number in range(1000)]
+        bk_tree = BKTree(strings, HammingDistance())
+        self.assertEqual(bk_tree.query('00042', 0), [(42, 0)])
+        self.assertLess(bk_tree.get_num_evaluations(), 100)
+        self.assertEqual(bk_tree.get_num_saved_evaluations(), 1000 - bk_tree.get_num_evaluations())
+        self.assertEqual(len(bk_tree), 1000)
+        self.assertEqual(bk_tree.get_strings(), strings)
+
+    @raises(ValueError)
+    def test_query_invalid_max_dist(self):
+        self.bk_tree.query('a', -1)
+
+    @raises(TypeError)
+    def test_query_invalid_query(self):
+        self.bk_tree.query(None, 1)
+
+    @raises(TypeError)
+    def test_invalid_strings(self):
+        BKTree(['a', None])
+
+    @raises(TypeError)
+    def test_invalid_none_strings(self):
+        BKTree(None)
+
+
+class SymmetricDeleteIndexTestCases(unittest.TestCase):
+    def setUp(self):
+        self.index = SymmetricDeleteIndex(WORDS)
+
+    def test_query_valid(self):
+        # the max_dist of the index is the default one of its queries
+        self.assertEqual(self.index.query('bo'), self.index.query('bo', 2))
+        check_query(self, self.index.query, WORDS, range(3))
+
+    def test_query_empty_index(self):
+        index = SymmetricDeleteIndex([], 1)
+        self.assertEqual(index.query('a'), [])
+        self.assertEqual(index.get_num_evaluations(), 0)
+
+    def test_num_evaluations(self):
+        strings = ['%05d' % number for number in range(1000)]
+        index = SymmetricDeleteIndex(strings, 1)
+        self.assertEqual(index.get_max_dist(), 1)
+        self.assertEqual(index.query('00042', 0), [(42, 0)])
+        self.assertEqual(index.get_num_evaluations(), 1)
+        self.assertEqual(index.get_num_saved_evaluations(), 999)
+        self.assertEqual(len(index.query('00042')), 28)
+
+    @raises(ValueError)
+    def test_query_invalid_max_dist(self):
+        self.index.query('a', -1)
+
+    @raises(ValueError)
+    def test_query_max_dist_above_index(self):
+        self.index.query('a', 3)
+
+    @raises(ValueError)
+    def test_invalid_max_dist(self):
+        SymmetricDeleteIndex(['a'], -1)
+
+    @raises(TypeError)
+    def test_query_invalid_query(self):
+        self.index.query(None)
+
+    @raises(TypeError)
+    def test_invalid_strings(self):
+        SymmetricDeleteIndex(['a', 12.90])
+
+
+class TrieTestCases(unittest.TestCase):
+    def setUp(self):
+        self.trie = Trie(WORDS)
+
+    def test_query_valid(self):
+        check_query(self, self.trie.query, WORDS)
+        self.assertEqual(len(self.trie.query('xyz', 1000)), len(WORDS))
+
+    def test_query_empty_index(self):
+        trie = Trie([])
+        self.assertEqual(trie.query('a', 1), [])
+        self.assertEqual(trie.get_num_nodes(), 1)
+
+    def test_shared_prefixes(self):
+        trie = Trie(['main street', 'main avenue', 'main square', 'main'])
+        self.assertEqual(trie.get_num_nodes(), 1 + 5 + 6 + 6 + 5)
+        self.assertEqual(trie.query('main stret', 1), [(0, 1)])
+        self.assertEqual(trie.get_num_evaluations(), 2)
+        self.assertEqual(trie.get_num_saved_evaluations(), 2)
+
+    @raises(ValueError)
+    def test_query_invalid_max_dist(self):
+        self.trie.query('a', -1)
+
+    @raises(TypeError)
+    def test_query_invalid_query(self):
+        self.trie.query(None, 1)
+
+    @raises(TypeError)
+    def test_invalid_strings(self):
+        Trie(['a', None])
+
+
+class PassJoinTestCases(unittest.TestCase):
+    def setUp(self):
+        # with a pair of long strings within max_dist of each other
+        self.strings = WORDS + ['abcdefghij' * 9 + 'abcdefgij']
+        self.pass_join = PassJoin(self.strings, 2)
+
+    def test_self_join_valid(self):
+        lev = Levenshtein()
+        for max_dist in range(4):
+            pass_join = PassJoin(self.strings, max_dist)
+            expected = []
+            for position1, string1 in enumerate(self.strings):
+                for position2 in range(position1 + 1, len(self.strings)):
+                    dist = lev.get_raw_score(string1, self.strings[position2])
+                    if dist <= max_dist:
+                        expected.append((position1, position2, dist))
+            self.assertEqual(sorted(pass_join.self_join()), expected)
+        self.assertEqual(sorted(PassJoin(['ab', 'ab', 'ba'], 1).self_join()), [(0, 1, 0)])
+        self.assertEqual(list(PassJoin([], 1).self_join()), [])
+
+    def test_join_valid(self):
+        # the pairs joined with each query string, in the order of scan
+        matches = dict((query_string, []) for query_string in QUERY_STRINGS)
+        for position, other_position, dist in self.pass_join.join(QUERY_STRINGS):
+            matches[QUERY_STRINGS[other_position]].append((position, dist))
+        check_query(self, lambda query_string, max_dist: sorted(matches[query_string],
+                                                                key=lambda match: (match[1], match[0])),
+                    self.strings, [2])
+        self.assertEqual(list(self.pass_join.join(iter(['cake']))), [(2, 0, 0), (4, 0, 1), (5, 0, 2), (8, 0, 0)])
+        self.assertEqual(list(self.pass_join.join([])), [])
+
+    def test_query_valid(self):
+        check_query(self, lambda query_string, max_dist: self.pass_join.query(query_string), self.strings, [2])
+        self.assertEqual(self.pass_join.get_max_dist(), 2)
+
+    def test_num_evaluations(self):
+        strings = ['%06d' % (number * 7919 % 1000000) for number in range(300)]
+        pass_join = PassJoin(strings, 1)
+        lev = Levenshtein()
+        expected = [(position1, position2, 1) for position1 in range(300) for position2 in range(position1 + 1, 300)
+                    if lev.get_raw_score(strings[position1], strings[position2]) == 1]
+        self.assertEqual(sorted(pass_join.self_join()), expected)
+        self.assertLess(pass_join.get_num_evaluations(), 300 * 299 // 2)
+        self.assertEqual(pass_join.get_num_saved_evaluations(),
+                         300 * 299 // 2 - pass_join.get_num_evaluations())
+
+    @raises(ValueError)
+    def test_invalid_max_dist(self):
+        PassJoin(['a'], -1)
+
+    @raises(TypeError)
+    def test_join_invalid_strings(self):
+        list(self.pass_join.join(['a', None]))
+
+    @raises(TypeError)
+    def test_query_invalid_query(self):
+        self.pass_join.query(None)
+
+
+class QgramIndexTestCases(unittest.TestCase):
+    def setUp(self):
+        # with a string holding the padding characters
+        self.strings = WORDS + ['#b$']
+        self.index = QgramIndex(self.strings)
+
+    def test_query_valid(self):
+        self.assertEqual(self.index.query('bo', 2), [(3, 1), (10, 1), (0, 2), (6, 2), (9, 2), (15, 2)])
+        check_query(self, self.index.query, self.strings)
+
+    def test_query_configurations(self):
+        for qval in [1, 2, 3]:
+            for padding in [True, False]:
+                index = QgramIndex(self.strings, qval, padding)
+                self.assertEqual(index.get_qval(), qval)
+                self.assertEqual(index.get_padding(), padding)
+                check_query(self, index.query, self.strings, query_strings=QUERY_STRINGS + ['b$'])
+
+    def test_query_empty_index(self):
+        index = QgramIndex([])
+        self.assertEqual(index.query('a', 1), [])
+        self.assertEqual(index.get_num_evaluations(), 0)
+
+    def test_num_evaluations(self):
+        strings = ['%05d' % number for number in range(1000)]
+        index = QgramIndex(strings, 3, False)
+        self.assertEqual(index.query('00042', 0), [(42, 0)])
+        self.assertEqual(index.get_num_evaluations(), 1)
+        self.assertEqual(index.get_num_saved_evaluations(), 999)
+        self.assertEqual(len(index.query('00042', 1)), 28)
+
+    @raises(ValueError)
+    def test_query_invalid_max_dist(self):
+        self.index.query('a', -1)
+
+    @raises(TypeError)
+    def test_query_invalid_query(self):
+        self.index.query(None, 1)
+
+    @raises(TypeError)
+    def test_invalid_strings(self):
+        QgramIndex(['a', None])
+
+    @raises(AssertionError)
+    def test_invalid_qval(self):
+        QgramIndex(['a'], 0)
+
+
+class JaroWinklerIndexTestCases(unittest.TestCase):
+    def setUp(self):
+        self.strings = ['MARTHA', 'MARHTA', 'DWAYNE', 'DUANE', 'DIXON', 'DICKSONX', 'MARTHA', '', 'M', 'MARTA',
+                        'MARTHAS', 'ARTHAM', 'JONATHAN', 'JOHNATHAN', 'JON', 'L\xe1szl\xf3', 'Ls\xe1l\xf3',
+                        '\u6771\u4eac\u90fd', 'DIXON' * 20]
+        self.index = JaroWinklerIndex(self.strings)
+
+    def scores(self, query_string, prefix_weight=0.1):
+        # reference results, computed by scoring every string
+        jw = JaroWinkler(prefix_weight)
+        scores = [(position, float(jw.get_sim_score(query_string, string)))
+                  for position, string in enumerate(self.strings)]
+        return sorted(scores, key=lambda match: (-match[1], match[0]))
+
+    def test_query_valid(self):
+        self.assertEqual([position for position, _ in self.index.query('MARTHA', 0.9)], [0, 6, 10, 9, 1])
+        self.assertEqual(self.index.query('MARTHA', 1.0), [(0, 1.0), (6, 1.0)])
+        self.assertEqual(self.index.query('QQQ', 0.5), [])
+        self.assertEqual(self.index.query(b'L\xc3\xa1szl\xc3\xb3', 1.0), [(15, 1.0)])
+        for prefix_weight in [0.1, 0.25]:
+            index = JaroWinklerIndex(self.strings, prefix_weight)
+            self.assertEqual(index.get_prefix_weight(), prefix_weight)
+            for query_string in ['MARTHA', 'MARHTA', 'DWANE', 'DIXON', 'JOHNATAN', 'M', '', 'L\xe1sl\xf3']:
+                scores = self.scores(query_string, prefix_weight)
+                for min_sim in [0.0, 0.5, 0.8, 0.9, 0.95]:
+                    self.assertEqual(index.query(query_string, min_sim),
+                                     [score for score in scores if score[1] >= min_sim])
+
+    def test_top_k_valid(self):
+        self.assertEqual([position for position, _ in self.index.top_k('MARTHA', 3)], [0, 6, 10])
+        self.assertEqual(self.index.top_k('MARTHA', 0), [])
+        self.assertEqual(len(self.index.top_k('MARTHA', 100)), len(self.strings))
+        for query_string in ['MARTHA', 'MARHTA', 'DWANE', 'DIXON', 'JOHNATAN', 'M', '', 'L\xe1sl\xf3']:
+            scores = self.scores(query_string)
+            for k in [1, 2, 5, 10]:
+                self.assertEqual(self.index.top_k(query_string, k), scores[:k])
+
+    def test_query_empty_index(self):
+        index = JaroWinklerIndex([])
+        self.assertEqual(index.query('a', 0.5), [])
+        self.assertEqual(index.top_k('a', 3), [])
+        self.assertEqual(index.get_num_evaluations(), 0)
+
+    def test_num_evaluations(self):
+        strings = ['MARTHA', 'MARHTA'] + ['X' * length for length in range(20, 40)]
+        index = JaroWinklerIndex(strings)
+        self.assertEqual([position for position, _ in index.query('MARTHA', 0.9)], [0, 1])
+        self.assertEqual(index.get_num_evaluations(), 2)
+        self.assertEqual(index.get_num_saved_evaluations(), 20)
+        self.assertEqual([position for position, _ in index.top_k('MARTHA', 1)], [0])
+        self.assertEqual(index.get_num_evaluations(), 1)
+
+    @raises(ValueError)
+    def test_top_k_invalid_k(self):
+        self.index.top_k('a', -1)
+
+    @raises(TypeError)
+    def test_query_invalid_query(self):
+        self.index.query(None, 0.5)
+
+    @raises(TypeError)
+    def test_top_k_invalid_query(self):
+        self.index.top_k(None, 1)
+
+    @raises(TypeError)
+    def test_invalid_strings(self):
+        JaroWinklerIndex(['a', None])
+
+
+class SmithWatermanIndexTestCases(unittest.TestCase):
+    def setUp(self):
+        self.strings = ['the quick brown fox jumps over the lazy dog', 'a lazy cat', 'no seed here', '',
+                        'GATTACAGATTACAGGCATTAGCCATTAGACCATGATTACA', 'L\xe1szl\xf3 Kov\xe1cs']
+        self.index = SmithWatermanIndex(self.strings, k=4)
+
+    def test_query_valid(self):
+        self.assertEqual(self.index.query('jumped over'), [(0, 8.0, 30)])
+        self.assertEqual(self.index.query('the lazy'), [(0, 8.0, 39), (1, 5.0, 6)])
+        self.assertEqual(self.index.query('the lazy', min_score=6), [(0, 8.0, 39)])
+        self.assertEqual(self.index.query('lazy'), [(0, 4.0, 39), (1, 4.0, 6)])
+        self.assertEqual(self.index.query('GATTACA'), [(4, 7.0, 7)])
+        self.assertEqual(self.index.query(b'L\xc3\xa1szl\xc3\xb3'), [(5, 6.0, 6)])
+        self.assertEqual(self.index.query('zzzz'), [])
+        self.assertEqual(self.index.query('the'), [])
+        self.assertEqual(self.index.query(''), [])
+        self.assertEqual(self.index.get_k(), 4)
+        self.assertEqual(self.index.get_band(), 8)
+        self.assertEqual(self.index.get_gap_cost(), 1.0)
+
+    def test_query_wide_band(self):
+        # with a band covering the whole DP matrices, the scores of the strings
+        # sharing a seed with the query are those of SmithWaterman
+        sim_funcs = [SmithWaterman().get_sim_func(), lambda s1, s2: 2 if s1 == s2 else -1,
+                     SubstitutionMatrix({('A', 'A'): 2, ('C', 'C'): 3, ('G', 'G'): 3, ('T', 'T'): 2}, default=-2)]
+        for sim_func in sim_funcs:
+            for gap_cost in [0.5, 1.0, 2.0]:
+                index = SmithWatermanIndex(self.strings, k=3, band=100, gap_cost=gap_cost, sim_func=sim_func)
+                sw = SmithWaterman(gap_cost=gap_cost, sim_func=sim_func)
+                for query_string in ['GATTTACAGCATT', 'CCATGAATTACA', 'the lazy cat', 'quack brown']:
+                    matches = index.query(query_string)
+                    self.assertTrue(len(matches) > 0)
+                    for position, score, _ in matches:
+                        self.assertEqual(score, sw.get_raw_score(query_string, self.strings[position]))
+
+    def test_query_tied_alignments(self):
+        # two alignments score 4, the one ending first in the string is
+        # reported although the other one ends first in the query
+        index = SmithWatermanIndex(['TCCCTTCTAGTCGA'], k=2, band=200, gap_cost=2.0,
+                                   sim_func=lambda s1, s2: 2 if s1 == s2 else -1)
+        self.assertEqual(index.query('GATGCG'), [(0, 4.0, 13)])
+
+    def test_query_seed_and_extend(self):
+        # a long string made of a repeated pattern with a single copy of the
+        # query, which is only found from its seed
+        string = 'ab' * 5000 + 'the quick brown fox jumps over the lazy dog' + 'ba' * 5000
+        index = SmithWatermanIndex([string, 'ab' * 100], k=6, band=4)
+        self.assertEqual(index.query('brown fax jumps'), [(0, 14.0, 10000 + 25)])
+        self.assertEqual(index.get_num_evaluations(), 1)
+        self.assertEqual(index.get_num_saved_evaluations(), 1)
+        self.assertEqual(index.query('the quick brown fox')[0], (0, 19.0, 10000 + 19))
+
+    def test_query_empty_index(self):
+        index = SmithWatermanIndex([])
+        self.assertEqual(index.query('the lazy dog'), [])
+        self.assertEqual(index.get_num_evaluations(), 0)
+
+    @raises(ValueError)
+    def test_invalid_k(self):
+        SmithWatermanIndex(self.strings, k=0)
+
+    @raises(ValueError)
+    def test_invalid_band(self):
+        SmithWatermanIndex(self.strings, band=-1)
+
+    @raises(TypeError)
+    def test_query_invalid_query(self):
+        self.index.query(None)
+
+    @raises(TypeError)
+    def test_invalid_strings(self):
+        SmithWatermanIndex(['a', None])
+
+
+class MultiIndexHashingTestCases(unittest.TestCase):
+    def setUp(self):
+        self.strings = ['10110100', '10110111', '00001111', '10010100', '10110100', '01001011', '11111111',
+                        '00000000']
+        self.index = MultiIndexHashing(self.strings, num_substrings=2)
+
+    def test_query_valid(self):
+        self.assertEqual(self.index.query('10110101', 1), [(0, 1), (1, 1), (4, 1)])
+        self.assertEqual(self.index.query('10110100', 0), [(0, 0), (4, 0)])
+        self.assertEqual(self.index.query('00001111', 8), scan(self.strings, '00001111', 8, HammingDistance()))
+        self.assertEqual(self.index.query(b'00001111', 0), [(2, 0)])
+        self.assertEqual(self.index.query('1011', 1), [])
+        for query_string in ['10110101', '01110000', '11110000', '00000001']:
+            for max_dist in range(9):
+                self.assertEqual(self.index.query(query_string, max_dist),
+                                 scan(self.strings, query_string, max_dist, HammingDistance()))
+
+    def test_query_non_binary(self):
+        strings = ['53703', '53706', '10001', '53715', '東京都港区', '94110', '53703']
+        for num_substrings in (None, 1, 2, 3, 5):
+            index = MultiIndexHashing(strings, num_substrings)
+            for query_string in ['53705', '10002', '東京都北区', 'abcde']:
+                for max_dist in range(6):
+                    self.assertEqual(index.query(query_string, max_dist),
+                                     scan(strings, query_string, max_dist, HammingDistance()))
+
+    def test_query_many_codes(self):
+        # enough codes for the queries to look the variants up rather than
+        # scan all the codes
+        random = Random(0)
+        strings = [''.join(random.choice('01') for _ in range(32)) for _ in range(2000)]
+        index = MultiIndexHashing(strings, 4)
+        for query_string in strings[:5] + ['0' * 32]:
+            for max_dist in range(8):
+                self.assertEqual(index.query(query_string, max_dist),
+                                 scan(strings, query_string, max_dist, HammingDistance()))
+                self.assertLess(index.get_num_evaluations(), len(strings))
+
+    def test_query_large_radius_scans(self):
+        # with a single substring, the variants within 7 of a 33 digits code
+        # would be far too many to generate
+        random = Random(0)
+        strings = [''.join(random.choice('0123456789') for _ in range(33)) for _ in range(200)]
+        strings.append(strings[0][:27] + strings[1][27:])
+        index = MultiIndexHashing(strings, 1)
+        self.assertEqual(index.query(strings[0], 7), scan(strings, strings[0], 7, HammingDistance()))
+        self.assertEqual(len(index.query(strings[0], 7)), 2)
+        self.assertEqual(index.get_num_evaluations(), len(strings))
+
+    def test_num_substrings(self):
+        self.assertEqual(self.index.get_num_substrings(), 2)
+        self.assertEqual(MultiIndexHashing(self.strings, 20).get_num_substrings(), 8)
+        self.assertEqual(MultiIndexHashing(['0' * 64, '1' * 64] * 8).get_num_substrings(), 16)
+
+    def test_num_evaluations(self):
+        strings = ['%05d' % number for number in range(1000)]
+        index = MultiIndexHashing(strings, 1)
+        self.assertEqual(index.query('00042', 0), [(42, 0)])
+        self.assertEqual(index.get_num_evaluations(), 1)
+        self.assertEqual(index.get_num_saved_evaluations(), 999)
+        self.assertEqual(len(index.query('00042', 1)), 28)
+        self.assertEqual(index.get_num_evaluations(), 28)
+
+    def test_save_load(self):
+        saved = io.BytesIO()
+        self.assertEqual(self.index.save(saved), True)
+        saved.seek(0)
+        index = MultiIndexHashing.load(saved)
+        self.assertEqual(index.get_strings(), self.strings)
+        self.assertEqual(index.get_num_substrings(), 2)
+        for query_string in ['10110101', '01110000']:
+            for max_dist in range(9):
+                self.assertEqual(index.query(query_string, max_dist), self.index.query(query_string, max_dist))
+
+    def test_query_empty_strings(self):
+        index = MultiIndexHashing(['', ''])
+        self.assertEqual(index.query('', 0), [(0, 0), (1, 0)])
+        self.assertEqual(index.query('a', 1), [])
+
+    def test_query_empty_index(self):
+        index = MultiIndexHashing([])
+        self.assertEqual(index.query('0110', 1), [])
+        self.assertEqual(index.get_num_evaluations(), 0)
+
+    @raises(ValueError)
+    def test_invalid_num_substrings(self):
+        MultiIndexHashing(self.strings, 0)
+
+    @raises(ValueError)
+    def test_invalid_strings_length(self):
+        MultiIndexHashing(['0110', '011'])
+
+    @raises(ValueError)
+    def test_query_invalid_max_dist(self):
+        self.index.query('10110100', -1)
+
+    @raises(TypeError)
+    def test_query_invalid_query(self):
+        self.index.query(None, 1)
+
+    @raises(TypeError)
+    def test_invalid_strings(self):
+        MultiIndexHashing(['0110', None])
@@ -14,6 +14,7 @@ from nose.tools import *
 # sequence based similarity measures
 from py_stringmatching.similarity_measure.affine import Affine
 from py_stringmatching.similarity_measure.bag_distance import BagDistance
+from py_stringmatching.similarity_measure.damerau_levenshtein import DamerauLevenshtein
 from py_stringmatching.similarity_measure.editex import Editex
 from py_stringmatching.similarity_measure.hamming_distance import HammingDistance
 from py_stringmatching.similarity_measure.jaro import Jaro
@@ -21,6 +22,7 @@ from py_stringmatching.similarity_measure.jaro_winkler import JaroWinkler
 from py_stringmatching.similarity_measure.levenshtein import Levenshtein
 from py_stringmatching.similarity_measure.needleman_wunsch import NeedlemanWunsch
 from py_stringmatching.similarity_measure.smith_waterman import SmithWaterman
+from py_stringmatching.similarity_measure.substitution_matrix import SubstitutionMatrix
 # token based similarity measures
 from py_stringmatching.similarity_measure.cosine import Cosine
 from py_stringmatching.similarity_measure.dice import Dice
@@ -65,6 +67,123 @@ class AffineTestCases(unittest.TestCase):
         self.assertAlmostEqual(self.affine.get_raw_score('dva', 'dáóva'), 1.5)
         self.assertAlmostEqual(self.affine.get_raw_score('dva', b'd\xc3\xa1\xc3\xb3va'), 1.5)
 
+    def test_valid_input_wide_chars(self):
+        # 2- and 4-byte code units are compared as code points
+        self.assertAlmostEqual(self.affine.get_raw_score('dva', 'dĀĂva'), 1.5)
+        self.assertAlmostEqual(self.affine.get_raw_score('dĀa', 'dĀĀĀa'), 1.5)
+        self.assertAlmostEqual(self.affine.get_raw_score('d😀a', 'd😀😁😁a'), 1.5)
+        self.assertAlmostEqual(self.affine.get_raw_score('aāb', 'aȁb'), 2)
+
+    def test_valid_input_long_strings(self):
+        # the DP rows span the shorter string, whichever argument it is
+        self.assertAlmostEqual(self.affine.get_raw_score('ACGT' * 300, 'ACGT' * 100), -0.5)
+        self.assertAlmostEqual(self.affine.get_raw_score('ACGT' * 100, 'ACGT' * 300), -0.5)
+
+    def test_valid_input_identity_paths(self):
+        # the identity function is compared in the string buffers, with the
+        # same single precision maxima as the scores looked up in a table
+        sim_func = lambda s1, s2: 1 if s1 == s2 else 0
+        for gap_start, gap_continuation in [(0.3, 0.2), (0.3, 0.3), (0.3, 0.5), (1.1, 0.1)]:
+            affine = Affine(gap_start=gap_start, gap_continuation=gap_continuation)
+            affine_table = Affine(gap_start=gap_start, gap_continuation=gap_continuation, sim_func=sim_func)
+            for string1, string2 in [('ACCCCAAAACAAACACCACCCAACACACAAAAAAAACAAA',
+                                      'AAAAAACAACAAAAAAAACCAAAACCCCCACCCACCCCAC'),
+                                     ('dva', 'deeva'), ('AAAGAATTCA', 'AAATCA'), ('d\u0100\u0102va', 'deeva')]:
+                self.assertEqual(affine.get_raw_score(string1, string2),
+                                 affine_table.get_raw_score(string1, string2))
+
+    def test_valid_input_sim_func_argument_order(self):
+        affine = Affine(sim_func=lambda s1, s2: 2 if s1 == s2 else (1 if s1 == 'a' else -1))
+        self.assertAlmostEqual(affine.get_raw_score('a', 'bb'), 0)
+        self.assertAlmostEqual(affine.get_raw_score('bb', 'a'), -2)
+
+    def test_valid_input_substitution_matrix(self):
+        matrix = SubstitutionMatrix({('A', 'A'): 1, ('C', 'C'): 1, ('G', 'G'): 1, ('T', 'T'): 1})
+        affine = Affine(gap_continuation=0.2, sim_func=matrix)
+        self.assertAlmostEqual(round(affine.get_raw_score('AAAGAATTCA', 'AAATCA'), NUMBER_OF_DECIMAL_PLACES), 4.4)
+        self.assertEqual(affine.get_raw_score('AAAGAATTCA', 'AAATCA'),
+                         self.affine_with_params2.get_raw_score('AAAGAATTCA', 'AAATCA'))
+        matrix = SubstitutionMatrix([[2, 1], [-1, 2]], 'ab')
+        self.assertAlmostEqual(Affine(sim_func=matrix).get_raw_score('a', 'bb'), 0)
+        self.assertAlmostEqual(Affine(sim_func=matrix).get_raw_score('bb', 'a'), -2)
+        # characters outside of the alphabet score the default
+        self.assertAlmostEqual(Affine(sim_func=matrix).get_raw_score('xa', 'xa'), 2)
+
+    def test_valid_input_sim_func_called_once_per_pair(self):
+        pairs = []
+        def sim_func(s1, s2):
+            pairs.append((s1, s2))
+            return 1 if s1 == s2 else 0
+        self.assertAlmostEqual(Affine(sim_func=sim_func).get_raw_score('dva', 'deeva'), 1.5)
+        self.assertEqual(sorted(pairs), sorted((c1, c2) for c1 in 'dva' for c2 in 'deva'))
+
+    def test_banded_raw_score(self):
+        self.assertEqual(self.affine.get_banded_raw_score('dva', 'deeva', band=0), (1.5, True))
+        self.assertEqual(self.affine.get_banded_raw_score('dva', 'deeva'), (1.5, True))
+        self.assertEqual(self.affine.get_banded_raw_score('', 'deeva', band=0), (0, True))
+        score, exact = self.affine_with_params2.get_banded_raw_score('AAAGAATTCA', 'AAATCA', min_score=4)
+        self.assertAlmostEqual(score, 4.4, places=5)
+        self.assertEqual(exact, True)
+        # the band can not hold the best alignment, which is reported
+        affine = Affine(gap_start=0.5, gap_continuation=0.5)
+        self.assertEqual(affine.get_raw_score('abcdefgh', 'ghabcdef'), 4.0)
+        self.assertEqual(affine.get_banded_raw_score('abcdefgh', 'ghabcdef', band=0), (0.0, False))
+        self.assertEqual(affine.get_banded_raw_score('abcdefgh', 'ghabcdef', band=1), (0.0, False))
+        self.assertEqual(affine.get_banded_raw_score('abcdefgh', 'ghabcdef', band=2), (4.0, True))
+        self.assertEqual(affine.get_banded_raw_score('abcdefgh', 'ghabcdef', min_score=4), (4.0, True))
+        self.assertEqual(affine.get_banded_raw_score('abcdefgh', 'ghabcdef', band=8), (4.0, True))
+
+    def test_banded_raw_score_rounding(self):
+        # an alignment leaving the band scores the bound, which the score
+        # within the band ties up to rounding errors
+        affine = Affine(gap_start=0.3, gap_continuation=0.3, sim_func=lambda s1, s2: 2 if s1 == s2 else -1)
+        self.assertNotEqual(affine.get_banded_raw_score('GTAC', 'GAGACGCG', band=0)[0],
+                            affine.get_raw_score('GTAC', 'GAGACGCG'))
+        self.assertEqual(affine.get_banded_raw_score('GTAC', 'GAGACGCG', band=0)[1], False)
+        self.assertEqual(affine.get_banded_raw_score('GTAC', 'GAGACGCG', band=1),
+                         (affine.get_raw_score('GTAC', 'GAGACGCG'), True))
+
+    def test_banded_raw_score_long_strings(self):
+        string1 = 'ACGTTGCA' * 100
+        string2 = string1[:200] + string1[203:600] + 'T' + string1[600:]
+        self.assertEqual(self.affine.get_banded_raw_score(string1, string2, band=5), (794.0, True))
+        self.assertEqual(self.affine.get_raw_score(string1, string2), 794.0)
+        self.assertEqual(self.affine.get_banded_raw_score(string1, string2, min_score=700), (794.0, True))
+
+    def test_raw_score_min_score(self):
+        self.assertEqual(self.affine.get_raw_score('dva', 'deeva', min_score=1.5), 1.5)
+        self.assertEqual(self.affine.get_raw_score('dva', 'deeva', min_score=1.6), float('-inf'))
+        self.assertEqual(self.affine_with_params1.get_raw_score('dva', 'deeve', min_score=-1), -0.5)
+        self.assertEqual(self.affine_with_params1.get_raw_score('dva', 'deeve', min_score=0), float('-inf'))
+        self.assertEqual(self.affine.get_raw_score('', 'deeva', min_score=0), 0)
+        self.assertEqual(self.affine.get_raw_score('', 'deeva', min_score=1), float('-inf'))
+        for string1, string2 in [('AAAGAATTCA', 'AAATCA'), ('abcdefgh', 'ghabcdef'), ('dva', 'deeve')]:
+            score = self.affine_with_params2.get_raw_score(string1, string2)
+            self.assertEqual(self.affine_with_params2.get_raw_score(string1, string2, min_score=score), score)
+            self.assertEqual(self.affine_with_params2.get_raw_score(string1, string2, min_score=score + 0.01),
+                             float('-inf'))
+
+    def test_raw_score_min_score_long_strings(self):
+        string1 = 'ACGTTGCA' * 100
+        string2 = string1[:200] + string1[203:600] + 'T' + string1[600:]
+        self.assertEqual(self.affine.get_raw_score(string1, string2, min_score=794), 794.0)
+        self.assertEqual(self.affine.get_raw_score(string1, string2, min_score=795), float('-inf'))
+        self.assertEqual(self.affine.get_raw_score(string1, 'GGCC' * 200, min_score=700), float('-inf'))
+        self.assertEqual(self.affine.get_raw_score(string1, string1[:100], min_score=-250.5), -250.5)
+        self.assertEqual(self.affine.get_raw_score(string1, string1[:100], min_score=0), float('-inf'))
+
+    @raises(ValueError)
+    def test_banded_raw_score_invalid_band(self):
+        self.affine.get_banded_raw_score('dva', 'deeva', band=-1)
+
+    @raises(ValueError)
+    def test_banded_raw_score_invalid_band_and_min_score(self):
+        self.affine.get_banded_raw_score('dva', 'deeva', band=1, min_score=1)
+
+    @raises(TypeError)
+    def test_banded_raw_score_invalid_input(self):
+        self.affine.get_banded_raw_score('dva', None, band=1)
+
     def test_get_gap_start(self):
         self.assertEqual(self.affine_with_params1.get_gap_start(), 2)
 
@@ -320,6 +439,99 @@ class EditexTestCases(unittest.TestCase):
         self.assertEqual(self.ed_with_params6.get_sim_score('nihl', 'neal'), 1.0 - (3.0/8.0))
         self.assertEqual(self.ed.get_sim_score('', ''), 1.0)
 
+    def test_valid_input_long_strings(self):
+        self.assertEqual(self.ed.get_raw_score('ACGT' * 150, 'ACGT' * 50), 800)
+        self.assertEqual(self.ed.get_raw_score('ACGT' * 50, 'ACGT' * 150), 800)
+        self.assertEqual(self.ed_with_params6.get_raw_score('ACGT' * 150, 'ACGT' * 50), 0)
+
+    def test_valid_input_non_ascii(self):
+        self.assertEqual(self.ed.get_raw_score('Straße', 'STRASSE'), 0)
+        self.assertEqual(self.ed.get_raw_score('Müller', 'MULLER'), 2)
+        self.assertEqual(self.ed.get_raw_score('中文', '中'), 2)
+
+    def test_valid_input_float_costs(self):
+        ed = Editex(group_cost=0.5, mismatch_cost=1.5)
+        self.assertEqual(ed.get_raw_score('MARTHA', 'MARHTA'), 2.0)
+        self.assertEqual(ed.get_raw_score('ALIP', 'ALIF'), 0.5)
+        self.assertEqual(ed.get_raw_score('ALIE', 'ALI'), 0.5)
+        self.assertEqual(Editex(group_cost=0.5, mismatch_cost=1.5, local=True).get_raw_score('niall', 'nihal'), 1.5)
+
+    def test_valid_input_raw_score_max_dist(self):
+        self.assertEqual(self.ed.get_raw_score('MARTHA', 'MARHTA', max_dist=3), 3)
+        self.assertEqual(self.ed.get_raw_score('MARTHA', 'MARHTA', max_dist=2), 3)
+        self.assertEqual(self.ed.get_raw_score('MARTHA', 'MARTHA', max_dist=0), 0)
+        self.assertEqual(self.ed.get_raw_score('ALIE', 'ALI', max_dist=0), 1)
+        self.assertEqual(self.ed.get_raw_score('Catalan', 'aluminum', max_dist=4), 5)
+        self.assertEqual(self.ed.get_raw_score('', 'MARTHA', max_dist=5), 6)
+        self.assertEqual(self.ed.get_raw_score('ACGT' * 150, 'ACGT' * 50, max_dist=10), 11)
+        self.assertEqual(self.ed_with_params6.get_raw_score('niall', 'nihal', max_dist=1), 2)
+        self.assertEqual(self.ed_with_params6.get_raw_score('ACGT' * 150, 'ACGT' * 50, max_dist=0), 0)
+        self.assertEqual(Editex(group_cost=0.5, mismatch_cost=1.5).get_raw_score('MARTHA', 'MARHTA', max_dist=1.5),
+                         2.5)
+
+    def test_valid_input_raw_score_max_dist_matches_unbounded(self):
+        strings = ['MARTHA', 'MARHTA', 'Niall', 'Neil', 'nihal', 'Catalan', 'aluminum', 'ALLEN', 'WHALE', 'Straße',
+                   '']
+        for ed in (self.ed, self.ed_with_params4, self.ed_with_params6):
+            for string1 in strings:
+                for string2 in strings:
+                    raw_score = ed.get_raw_score(string1, string2)
+                    for max_dist in range(8):
+                        self.assertEqual(ed.get_raw_score(string1, string2, max_dist=max_dist),
+                                         raw_score if raw_score <= max_dist else max_dist + 1)
+
+    def test_valid_input_raw_scores(self):
+        candidates = ['MARHTA', 'MARTHA', 'martha', '', b'MARHTA']
+        self.assertEqual(list(self.ed.get_raw_scores('MARTHA', candidates)), [3, 0, 0, 12, 3])
+        self.assertEqual(list(self.ed.get_raw_scores('MARTHA', candidates, max_dist=2)), [3, 0, 0, 3, 3])
+        self.assertEqual(list(self.ed.get_raw_scores('MARTHA', iter(candidates))), [3, 0, 0, 12, 3])
+        self.assertEqual(list(self.ed.get_raw_scores('', ['', 'ab'])), [0, 4])
+        self.assertEqual(list(self.ed_with_params6.get_raw_scores('niall', ['nihal', 'NEAL'])), [2, 1])
+        self.assertEqual(self.ed.get_raw_scores('MARTHA', candidates).dtype.kind, 'i')
+        self.assertEqual(len(self.ed.get_raw_scores('MARTHA', [])), 0)
+        ed = Editex(group_cost=0.5, mismatch_cost=1.5)
+        self.assertEqual(list(ed.get_raw_scores('MARTHA', ['MARHTA', 'MARTHA', '', 'ALI'])), [2.0, 0.0, 9.0, 5.5])
+        self.assertEqual(ed.get_raw_scores('MARTHA', candidates).dtype.kind, 'f')
+
+    def test_valid_input_raw_scores_match_raw_score(self):
+        candidates = ['MARHTA', 'Niall', 'Neil', 'nihal', 'Catalan', 'aluminum', 'ALLEN', 'WHALE', 'Straße', '']
+        for ed in (self.ed, self.ed_with_params1, self.ed_with_params5):
+            for query in candidates:
+                for max_dist in (None, 0, 2, 5):
+                    self.assertEqual(list(ed.get_raw_scores(query, candidates, max_dist=max_dist)),
+                                     [ed.get_raw_score(query, candidate, max_dist=max_dist)
+                                      for candidate in candidates])
+
+    @raises(ValueError)
+    def test_invalid_max_dist_raw_score(self):
+        self.ed.get_raw_score('MARTHA', 'MARHTA', max_dist=-1)
+
+    @raises(ValueError)
+    def test_invalid_max_dist_raw_scores(self):
+        self.ed.get_raw_scores('MARTHA', ['MARHTA'], max_dist=-1)
+
+    def test_valid_input_float_max_dist(self):
+        self.assertEqual(self.ed.get_raw_score('cat', 'hat', max_dist=1.0), 2)
+        ed = Editex(group_cost=0.5, mismatch_cost=1.5)
+        self.assertEqual(ed.get_raw_score('cat', 'hat', max_dist=1.25), 2.25)
+        self.assertEqual(list(ed.get_raw_scores('cat', ['hat', 'cat'], max_dist=1.25)), [2.25, 0.0])
+
+    @raises(ValueError)
+    def test_invalid_fractional_max_dist_raw_score(self):
+        self.ed.get_raw_score('cat', 'cat', max_dist=1.5)
+
+    @raises(ValueError)
+    def test_invalid_fractional_max_dist_raw_scores(self):
+        self.ed.get_raw_scores('cat', ['hat'], max_dist=4.5)
+
+    @raises(TypeError)
+    def test_invalid_query_raw_scores(self):
+        self.ed.get_raw_scores(None, ['MARHTA'])
+
+    @raises(TypeError)
+    def test_invalid_candidates_raw_scores(self):
+        self.ed.get_raw_scores('MARTHA', ['MARHTA', None])
+
     @raises(TypeError)
     def test_invalid_input1_raw_score(self):
         self.ed.get_raw_score(None, 'MARHTA')
@@ -414,6 +626,51 @@ class JaroTestCases(unittest.TestCase):
                                                        b'Ls\xc3\xa1l\xc3\xb3'),
                                0.8777777777777779)
 
+    def test_wide_chars_input_raw_score(self):
+        # 2- and 4-byte code units are compared as code points
+        self.assertAlmostEqual(self.jaro.get_raw_score('MĀRTHĀ', 'MĀRHTĀ'),
+                               self.jaro.get_raw_score('MARTHA', 'MARHTA'))
+        self.assertAlmostEqual(self.jaro.get_raw_score('MARTHA', 'MĀRHTĀ'),
+                               self.jaro.get_raw_score('MARTHA', 'MXRHTX'))
+        self.assertAlmostEqual(self.jaro.get_raw_score('D😀XON', 'D😀CKSONX'),
+                               self.jaro.get_raw_score('DIXON', 'DICKSONX'))
+        self.assertAlmostEqual(self.jaro.get_raw_score('aāb', 'aȁb'),
+                               self.jaro.get_raw_score('axb', 'ayb'))
+
+    def test_long_input_raw_score(self):
+        # strings over 64 characters are matched block by block
+        self.assertAlmostEqual(self.jaro.get_raw_score('ab' * 32, 'ba' * 32),
+                               0.8333333333333334, places=6)
+        self.assertAlmostEqual(self.jaro.get_raw_score('ab' * 32 + 'c', 'ba' * 32 + 'c'),
+                               0.8358974358974359, places=6)
+        self.assertAlmostEqual(self.jaro.get_raw_score('DIXON' * 13, 'DICKSONX' * 8),
+                               0.6467948717948718, places=6)
+        self.assertAlmostEqual(self.jaro.get_raw_score('MARTHA' * 20, 'MARHTA' * 20),
+                               0.9444444444444445, places=6)
+        self.assertEqual(self.jaro.get_raw_score('x' * 100 + 'DIXON', 'DICKSONX'), 0)
+
+    def test_valid_input_sim_scores(self):
+        candidates = ['MARHTA', 'DUANE', 'MARTHA', '', 'L\xe1szl\xf3', 'M\u0100RHT\u0100', 'MARHTA' * 20]
+        scores = self.jaro.get_sim_scores('MARTHA', candidates)
+        self.assertEqual(scores.dtype, 'float64')
+        self.assertEqual(list(scores), [self.jaro.get_sim_score('MARTHA', candidate) for candidate in candidates])
+        self.assertEqual(list(self.jaro.get_sim_scores('', ['MARTHA', ''])), [0.0, 0.0])
+        self.assertEqual(len(self.jaro.get_sim_scores('MARTHA', [])), 0)
+        self.assertEqual(list(self.jaro.get_sim_scores(b'MARTHA', iter([b'MARHTA']))),
+                         [self.jaro.get_sim_score('MARTHA', 'MARHTA')])
+
+    @raises(TypeError)
+    def test_invalid_input1_sim_scores(self):
+        self.jaro.get_sim_scores(None, ['MARTHA'])
+
+    @raises(TypeError)
+    def test_invalid_input2_sim_scores(self):
+        self.jaro.get_sim_scores('MARTHA', None)
+
+    @raises(TypeError)
+    def test_invalid_input3_sim_scores(self):
+        self.jaro.get_sim_scores('MARTHA', ['MARHTA', 12.90])
+
     @raises(TypeError)
     def test_invalid_input1_raw_score(self):
         self.jaro.get_raw_score(None, 'MARHTA')
@@ -515,6 +772,70 @@ class JaroWinklerTestCases(unittest.TestCase):
                                                      b'Ls\xc3\xa1l\xc3\xb3'),
                                0.8900000000000001)
 
+    def test_wide_chars_input_raw_score(self):
+        # 2- and 4-byte code units are compared as code points
+        self.assertAlmostEqual(self.jw.get_raw_score('MĀRTHĀ', 'MĀRHTĀ'),
+                               self.jw.get_raw_score('MARTHA', 'MARHTA'))
+        self.assertAlmostEqual(self.jw.get_raw_score('D😀XON', 'D😀CKSONX'),
+                               self.jw.get_raw_score('DIXON', 'DICKSONX'))
+        self.assertAlmostEqual(self.jw.get_raw_score('aāb', 'aȁb'),
+                               self.jw.get_raw_score('axb', 'ayb'))
+
+    def test_long_input_raw_score(self):
+        self.assertAlmostEqual(self.jw.get_raw_score('DIXON' * 13, 'DICKSONX' * 8),
+                               0.7174358974358974, places=6)
+        self.assertAlmostEqual(self.jw.get_raw_score('MARTHA' * 20, 'MARHTA' * 20),
+                               0.9611111111111111, places=6)
+
+    def test_valid_input_sim_score_min_sim(self):
+        self.assertEqual(self.jw.get_sim_score('MARTHA', 'MARHTA', min_sim=0.9),
+                         self.jw.get_sim_score('MARTHA', 'MARHTA'))
+        self.assertEqual(self.jw.get_sim_score('MARTHA', 'MARHTA', min_sim=0.97), 0.0)
+        self.assertEqual(self.jw.get_sim_score('DIXON', 'DICKSONX', min_sim=0.85), 0.0)
+        self.assertEqual(self.jw.get_sim_score('DIXON', 'DICKSONX', min_sim=0.0),
+                         self.jw.get_sim_score('DIXON', 'DICKSONX'))
+        # rejected from the lengths, and from the common characters
+        self.assertEqual(self.jw.get_sim_score('AB', 'ABCDEFGHIJ', min_sim=0.8), 0.0)
+        self.assertEqual(self.jw.get_sim_score('ABCDEF', 'FEDCBA', min_sim=0.5), 0.0)
+        self.assertEqual(self.jw.get_sim_score('ABCDEF', 'UVWXYZ', min_sim=0.5), 0.0)
+        self.assertEqual(self.jw.get_sim_score('MARTHA' * 20, 'MARHTA' * 20, min_sim=0.96),
+                         self.jw.get_sim_score('MARTHA' * 20, 'MARHTA' * 20))
+        self.assertEqual(self.jw.get_sim_score('MARTHA' * 20, 'MARHTA' * 20, min_sim=0.97), 0.0)
+        self.assertEqual(self.jw.get_sim_score('', 'MARHTA', min_sim=0.5), 0)
+
+    def test_valid_input_sim_score_min_sim_matches_unbounded(self):
+        strings = ['MARTHA', 'MARHTA', 'DWAYNE', 'DUANE', 'DIXON', 'DICKSONX', 'JOHN', 'JON', 'JONATHAN',
+                   'L\xe1szl\xf3', 'Ls\xe1l\xf3', 'D\U0001f600XON', 'ab' * 40, 'ba' * 40]
+        for string1 in strings:
+            for string2 in strings:
+                score = self.jw.get_sim_score(string1, string2)
+                for min_sim in (0.0, 0.5, 0.8, 0.9, score):
+                    self.assertEqual(self.jw.get_sim_score(string1, string2, min_sim=min_sim),
+                                     score if score >= min_sim else 0.0)
+
+    @raises(TypeError)
+    def test_invalid_input_sim_score_min_sim(self):
+        self.jw.get_sim_score('MARTHA', None, min_sim=0.5)
+
+    def test_valid_input_sim_scores(self):
+        candidates = ['MARHTA', 'DUANE', 'MARTHA', '', 'MARTA', 'M\u0100RHT\u0100', 'MARHTA' * 20]
+        scores = self.jw.get_sim_scores('MARTHA', candidates)
+        self.assertEqual(scores.dtype, 'float64')
+        self.assertEqual(list(scores), [self.jw.get_sim_score('MARTHA', candidate) for candidate in candidates])
+        for min_sim in (0.5, 0.9, 0.97):
+            self.assertEqual(list(self.jw.get_sim_scores('MARTHA', candidates, min_sim=min_sim)),
+                             [self.jw.get_sim_score('MARTHA', candidate, min_sim=min_sim)
+                              for candidate in candidates])
+        self.assertEqual(list(self.jw.get_sim_scores('', ['MARTHA', ''])), [0.0, 0.0])
+
+    @raises(TypeError)
+    def test_invalid_input1_sim_scores(self):
+        self.jw.get_sim_scores(None, ['MARTHA'])
+
+    @raises(TypeError)
+    def test_invalid_input2_sim_scores(self):
+        self.jw.get_sim_scores('MARTHA', ['MARHTA', None])
+
     @raises(TypeError)
     def test_invalid_input1_raw_score(self):
         self.jw.get_raw_score(None, 'MARHTA')
@@ -624,10 +945,154 @@ class LevenshteinTestCases(unittest.TestCase):
         self.assertEqual(self.lev.get_sim_score('java was neat', 'scala is great'),
                          1.0 - (7.0/14.0))
 
+    def test_valid_input_max_dist_raw_score(self):
+        self.assertEqual(self.lev.get_raw_score('levenshtein', 'frankenstein', max_dist=6), 6)
+        self.assertEqual(self.lev.get_raw_score('levenshtein', 'frankenstein', max_dist=10), 6)
+        self.assertEqual(self.lev.get_raw_score('levenshtein', 'frankenstein', max_dist=5), 6)
+        self.assertEqual(self.lev.get_raw_score('levenshtein', 'frankenstein', max_dist=2), 3)
+        self.assertEqual(self.lev.get_raw_score('abc', 'abc', max_dist=0), 0)
+        self.assertEqual(self.lev.get_raw_score('abc', 'abd', max_dist=0), 1)
+        self.assertEqual(self.lev.get_raw_score('a', 'abcdef', max_dist=2), 3)
+        self.assertEqual(self.lev.get_raw_score('', 'ab', max_dist=2), 2)
+        self.assertEqual(self.lev.get_raw_score('ab' * 500, 'ba' * 500, max_dist=3), 2)
+        self.assertEqual(self.lev.get_raw_score('a' * 1000, 'b' * 1000, max_dist=3), 4)
+
+    def test_valid_input_min_sim_sim_score(self):
+        self.assertEqual(self.lev.get_sim_score('example', 'samples', min_sim=0.5), 1.0 - (3.0/7.0))
+        self.assertEqual(self.lev.get_sim_score('example', 'samples', min_sim=0.6), 0.0)
+        self.assertEqual(self.lev.get_sim_score('distance', 'difference', min_sim=0.5), 0.5)
+        self.assertEqual(self.lev.get_sim_score('abcdefghij', 'abcdefghkl', min_sim=0.8), 0.8)
+        self.assertEqual(self.lev.get_sim_score('', '', min_sim=0.9), 1.0)
+        self.assertEqual(self.lev.get_sim_score('a', '', min_sim=0.0), 0.0)
+
+    def test_valid_input_float_max_dist(self):
+        self.assertEqual(self.lev.get_raw_score('levenshtein', 'frankenstein', max_dist=2.0), 3)
+        self.assertEqual(list(self.lev.get_raw_scores('example', ['samples', 'examples'], max_dist=2.0)), [3, 1])
+        lev = Levenshtein(sub_cost=1.5)
+        self.assertEqual(lev.get_raw_score('abc', 'abd', max_dist=1.5), 1.5)
+        self.assertEqual(lev.get_raw_score('abc', 'add', max_dist=1.5), 2.5)
+        self.assertEqual(list(lev.get_raw_scores('abc', ['abd', 'add'], max_dist=1.5)), [1.5, 2.5])
+
+    @raises(ValueError)
+    def test_invalid_max_dist_raw_score(self):
+        self.lev.get_raw_score('a', 'b', max_dist=-1)
+
+    @raises(ValueError)
+    def test_invalid_fractional_max_dist_raw_score(self):
+        self.lev.get_raw_score('abc', 'abc', max_dist=1.5)
+
+    @raises(ValueError)
+    def test_invalid_fractional_max_dist_raw_scores(self):
+        self.lev.get_raw_scores('abc', ['add'], max_dist=1.5)
+
+    @raises(ValueError)
+    def test_invalid_fractional_max_dist_int_costs(self):
+        Levenshtein(ins_cost=2, del_cost=2, sub_cost=3).get_raw_score('abcdef', 'uvwxyz', max_dist=2.5)
+
+    def test_valid_input_min_sim_int_costs(self):
+        lev = Levenshtein(ins_cost=2, del_cost=2, sub_cost=3)
+        self.assertEqual(lev.get_raw_score('abcdef', 'uvwxyz', max_dist=2.0), 3)
+        self.assertEqual(lev.get_sim_score('example', 'samples', min_sim=0.5),
+                         lev.get_sim_score('example', 'samples'))
+        self.assertEqual(lev.get_sim_score('example', 'samples', min_sim=0.9), 0.0)
+
+    def test_valid_input_raw_scores(self):
+        candidates = ['', 'a', 'samples', 'example', 'ab' * 100, b'\xc3\xa1c', 'levenshtein' * 10]
+        expected = [self.lev.get_raw_score('example', candidate) for candidate in candidates]
+        self.assertEqual(list(self.lev.get_raw_scores('example', candidates)), expected)
+        self.assertEqual(list(self.lev.get_raw_scores('example', iter(candidates))), expected)
+        self.assertEqual(list(self.lev.get_raw_scores('levenshtein' * 10, ['frankenstein' * 10, ''])), [60, 110])
+        self.assertEqual(list(self.lev.get_raw_scores('', ['', 'abc'])), [0, 3])
+        self.assertEqual(list(self.lev.get_raw_scores('example', ['samples', 'examples', 'a'], max_dist=2)),
+                         [3, 1, 3])
+        self.assertEqual(len(self.lev.get_raw_scores('example', [])), 0)
+
+    def test_valid_input_sim_scores(self):
+        candidates = ['', 'a', 'samples', 'example', 'ab' * 100, b'\xc3\xa1c', 'levenshtein' * 10]
+        expected = [self.lev.get_sim_score('example', candidate) for candidate in candidates]
+        for score, expected_score in zip(self.lev.get_sim_scores('example', candidates), expected):
+            self.assertAlmostEqual(score, expected_score)
+        self.assertEqual(list(self.lev.get_sim_scores('', ['', 'abc'])), [1.0, 0.0])
+        self.assertEqual(list(self.lev.get_sim_scores('distance', ['difference', 'distances'], min_sim=0.6)),
+                         [0.0, 1.0 - (1.0/9.0)])
+
+    @raises(TypeError)
+    def test_invalid_query_raw_scores(self):
+        self.lev.get_raw_scores(None, ['a'])
+
+    @raises(TypeError)
+    def test_invalid_candidates_raw_scores(self):
+        self.lev.get_raw_scores('a', ['b', None])
+
+    @raises(TypeError)
+    def test_invalid_candidates_sim_scores(self):
+        self.lev.get_sim_scores('a', ['b', 12.90])
+
     def test_valid_input_non_ascii_raw_score(self):
         self.assertEqual(self.lev.get_raw_score('ác', 'áóc'), 1)
         self.assertEqual(self.lev.get_raw_score(u'ác', u'áóc'), 1)
         self.assertEqual(self.lev.get_raw_score(b'\xc3\xa1c', b'\xc3\xa1\xc3\xb3c'), 1)
+        self.assertEqual(self.lev.get_raw_score('aāb', 'aȁb'), 1)
+        self.assertEqual(self.lev.get_raw_score('東京都', '京都府'), 2)
+
+    def test_valid_input_long_strings_raw_score(self):
+        # patterns longer than one machine word are handled in blocks
+        self.assertEqual(self.lev.get_raw_score('a' * 64, 'a' * 63 + 'b'), 1)
+        self.assertEqual(self.lev.get_raw_score('a' * 65, 'b' * 65), 65)
+        self.assertEqual(self.lev.get_raw_score('ab' * 100, 'ba' * 100), 2)
+        self.assertEqual(self.lev.get_raw_score('abcdefg' * 20, 'xabxcdxxefxgx' * 20), 120)
+        self.assertEqual(self.lev.get_raw_score('levenshtein' * 10, 'frankenstein' * 10), 60)
+        self.assertEqual(self.lev.get_raw_score('x' + 'ab' * 70, 'ab' * 70 + 'x'), 2)
+
+    def test_valid_input_costs_raw_score(self):
+        lev = Levenshtein(sub_cost=2)
+        self.assertEqual(lev.get_raw_score('example', 'samples'), 4)
+        self.assertEqual(lev.get_raw_score('a', 'b'), 2)
+        self.assertEqual(lev.get_raw_score('abc', ''), 3)
+        lev = Levenshtein(ins_cost=2, del_cost=3)
+        self.assertEqual(lev.get_raw_score('ab', 'abc'), 2)
+        self.assertEqual(lev.get_raw_score('abc', 'ab'), 3)
+        self.assertEqual(lev.get_raw_score('', 'abc'), 6)
+        lev = Levenshtein(ins_cost=0.5, del_cost=0.5, sub_cost=1.5)
+        self.assertEqual(lev.get_raw_score('a', 'b'), 1.0)
+        self.assertEqual(lev.get_raw_score('東京都', '京都府'), 1.0)
+        self.assertEqual(lev.get_raw_score('levenshtein', 'frankenstein', max_dist=2.0), 3.0)
+        self.assertEqual(lev.get_raw_scores('a', ['b', 'a', 'ab']).tolist(), [1.0, 0.0, 0.5])
+        self.assertEqual(Levenshtein(sub_cost=2).get_raw_scores('ab', ['ac', 'ab']).tolist(), [2, 0])
+
+    def test_valid_input_costs_sim_score(self):
+        lev = Levenshtein(sub_cost=2)
+        self.assertEqual(lev.get_sim_score('a', 'b'), 0.0)
+        self.assertEqual(lev.get_sim_score('example', 'samples'), 1.0 - (4.0/14.0))
+        self.assertEqual(lev.get_sim_score('ab', 'ac'), 0.5)
+        self.assertEqual(lev.get_sim_score('ab', 'ac', min_sim=0.6), 0.0)
+        self.assertEqual(lev.get_sim_score('', ''), 1.0)
+        self.assertEqual(lev.get_sim_scores('ab', ['ac', 'ab']).tolist(), [0.5, 1.0])
+        self.assertEqual(Levenshtein(1, 1, 0.5).get_sim_score('abcd', 'abxy'), 0.5)
+
+    def test_get_costs(self):
+        lev = Levenshtein(ins_cost=2, del_cost=3, sub_cost=4)
+        self.assertEqual(lev.get_ins_cost(), 2)
+        self.assertEqual(lev.get_del_cost(), 3)
+        self.assertEqual(lev.get_sub_cost(), 4)
+
+    def test_set_costs(self):
+        lev = Levenshtein()
+        self.assertEqual(lev.get_raw_score('a', 'b'), 1)
+        self.assertEqual(lev.set_sub_cost(3), True)
+        self.assertEqual(lev.get_raw_score('a', 'b'), 2)
+        self.assertEqual(lev.set_ins_cost(0.5), True)
+        self.assertEqual(lev.get_raw_score('a', 'b'), 1.5)
+        self.assertEqual(lev.set_del_cost(0), True)
+        self.assertEqual(lev.get_raw_score('a', 'b'), 0.5)
+
+    @raises(ValueError)
+    def test_invalid_costs(self):
+        Levenshtein(sub_cost=-1)
+
+    @raises(ValueError)
+    def test_invalid_set_costs(self):
+        Levenshtein().set_ins_cost(-0.5)
 
     def test_valid_input_non_ascii_sim_score(self):
         self.assertEqual(self.lev.get_sim_score('ác', 'áóc'), 1.0 - (1.0/3.0))
@@ -685,6 +1150,107 @@ class LevenshteinTestCases(unittest.TestCase):
         self.lev.get_sim_score(12.90, 12.90)
 
 
+class DamerauLevenshteinTestCases(unittest.TestCase):
+    def setUp(self):
+        self.dl = DamerauLevenshtein()
+        self.osa = DamerauLevenshtein(restricted=True)
+
+    def test_valid_input_raw_score(self):
+        self.assertEqual(self.dl.get_raw_score('a', ''), 1)
+        self.assertEqual(self.dl.get_raw_score('', 'abc'), 3)
+        self.assertEqual(self.dl.get_raw_score('', ''), 0)
+        self.assertEqual(self.dl.get_raw_score('abc', 'abc'), 0)
+        self.assertEqual(self.dl.get_raw_score('ab', 'ba'), 1)
+        self.assertEqual(self.dl.get_raw_score('ca', 'abc'), 2)
+        self.assertEqual(self.dl.get_raw_score('example', 'exmaple'), 1)
+        self.assertEqual(self.dl.get_raw_score('example', 'samples'), 3)
+        self.assertEqual(self.dl.get_raw_score('levenshtein', 'frankenstein'), 6)
+        self.assertEqual(self.dl.get_raw_score('abcdef', 'badcfe'), 3)
+        self.assertEqual(self.dl.get_raw_score('ab' * 50, 'ba' * 50), 2)
+
+    def test_valid_input_restricted_raw_score(self):
+        self.assertEqual(self.osa.get_raw_score('a', ''), 1)
+        self.assertEqual(self.osa.get_raw_score('', 'abc'), 3)
+        self.assertEqual(self.osa.get_raw_score('', ''), 0)
+        self.assertEqual(self.osa.get_raw_score('ab', 'ba'), 1)
+        self.assertEqual(self.osa.get_raw_score('ca', 'abc'), 3)
+        self.assertEqual(self.osa.get_raw_score('example', 'exmaple'), 1)
+        self.assertEqual(self.osa.get_raw_score('abcdef', 'badcfe'), 3)
+        self.assertEqual(self.osa.get_raw_score('ab' * 50, 'ba' * 50), 2)
+        self.assertEqual(self.osa.get_raw_score('ab' * 40, 'xba' * 40), 41)
+
+    def test_valid_input_costs_raw_score(self):
+        dl = DamerauLevenshtein(trans_cost=1.5)
+        self.assertEqual(dl.get_raw_score('ab', 'ba'), 1.5)
+        self.assertEqual(dl.get_raw_score('ca', 'abc'), 2.5)
+        dl = DamerauLevenshtein(trans_cost=3)
+        self.assertEqual(dl.get_raw_score('ab', 'ba'), 2)
+        osa = DamerauLevenshtein(ins_cost=2, del_cost=2, sub_cost=3, trans_cost=1, restricted=True)
+        self.assertEqual(osa.get_raw_score('ab', 'ba'), 1)
+        self.assertEqual(osa.get_raw_score('ca', 'abc'), 6)
+        self.assertEqual(osa.get_raw_score('abc', ''), 6)
+
+    def test_valid_input_sim_score(self):
+        self.assertEqual(self.dl.get_sim_score('', ''), 1.0)
+        self.assertEqual(self.dl.get_sim_score('a', ''), 0.0)
+        self.assertEqual(self.dl.get_sim_score('ab', 'ba'), 0.5)
+        self.assertEqual(self.dl.get_sim_score('ca', 'abc'), 1.0 - (2.0/3.0))
+        self.assertEqual(self.osa.get_sim_score('ca', 'abc'), 0.0)
+        self.assertEqual(DamerauLevenshtein(trans_cost=1.5).get_sim_score('ab', 'ba'), 0.25)
+
+    def test_valid_input_non_ascii_raw_score(self):
+        self.assertEqual(self.dl.get_raw_score('ác', 'cá'), 1)
+        self.assertEqual(self.dl.get_raw_score(b'\xc3\xa1c', b'c\xc3\xa1'), 1)
+        self.assertEqual(self.dl.get_raw_score('東京都', '京東都'), 1)
+        self.assertEqual(self.osa.get_raw_score('東京都', '京東都'), 1)
+        self.assertEqual(self.osa.get_raw_score('aāȁb', 'aȁāb'), 1)
+
+    def test_get_costs(self):
+        dl = DamerauLevenshtein(2, 3, 4, 5, True)
+        self.assertEqual(dl.get_ins_cost(), 2)
+        self.assertEqual(dl.get_del_cost(), 3)
+        self.assertEqual(dl.get_sub_cost(), 4)
+        self.assertEqual(dl.get_trans_cost(), 5)
+        self.assertEqual(dl.get_restricted(), True)
+
+    def test_set_costs(self):
+        dl = DamerauLevenshtein()
+        self.assertEqual(dl.get_raw_score('ca', 'abc'), 2)
+        self.assertEqual(dl.set_restricted(True), True)
+        self.assertEqual(dl.get_raw_score('ca', 'abc'), 3)
+        self.assertEqual(dl.set_trans_cost(2), True)
+        self.assertEqual(dl.get_raw_score('ab', 'ba'), 2)
+        self.assertEqual(dl.set_sub_cost(3), True)
+        self.assertEqual(dl.get_raw_score('ab', 'ba'), 2)
+        self.assertEqual(dl.set_ins_cost(0.5), True)
+        self.assertEqual(dl.set_del_cost(0.5), True)
+        self.assertEqual(dl.get_raw_score('ab', 'ba'), 1.0)
+
+    @raises(ValueError)
+    def test_invalid_costs(self):
+        DamerauLevenshtein(trans_cost=-1)
+
+    @raises(ValueError)
+    def test_invalid_trans_cost_raw_score(self):
+        DamerauLevenshtein(trans_cost=0.5).get_raw_score('ab', 'ba')
+
+    @raises(TypeError)
+    def test_invalid_input1_raw_score(self):
+        self.dl.get_raw_score('a', None)
+
+    @raises(TypeError)
+    def test_invalid_input2_raw_score(self):
+        self.dl.get_raw_score(12.90, 'MARTHA')
+
+    @raises(TypeError)
+    def test_invalid_input1_sim_score(self):
+        self.dl.get_sim_score(None, 'b')
+
+    @raises(TypeError)
+    def test_invalid_input2_sim_score(self):
+        self.osa.get_sim_score('MARHTA', 12.90)
+
+
 class HammingDistanceTestCases(unittest.TestCase):
     def setUp(self):
         self.hd = HammingDistance()
@@ -753,6 +1319,71 @@ class HammingDistanceTestCases(unittest.TestCase):
     def test_invalid_input5_raw_score(self):
         self.hd.get_raw_score('', 'This is a long string')
 
+    def test_valid_input_raw_scores(self):
+        self.assertEqual(list(self.hd.get_raw_scores(['karolin', 'KARI', '', b'\xc3\xa1b\xc3\xb3'],
+                                                     ['kathrin', 'kari', '', u'áóó'])), [3, 4, 0, 1])
+        self.assertEqual(list(self.hd.get_raw_scores(['ab', 'abcd', ''], ['ax', 'abcc', ''])), [1, 1, 0])
+        self.assertEqual(list(self.hd.get_raw_scores('10110', ['10011', '10110', '01001'])), [2, 0, 5])
+        self.assertEqual(list(self.hd.get_raw_scores(['10011', '10110'], '10110')), [2, 0])
+        self.assertEqual(len(self.hd.get_raw_scores([], [])), 0)
+
+    def test_valid_input_raw_scores_match_raw_score(self):
+        strings1 = ['karolin', 'kathrin', '0110', u'ábó', '', '01' * 40]
+        strings2 = ['kerstin', 'karolin', '1111', u'áóó', '', '10' * 40]
+        raw_scores = [self.hd.get_raw_score(string1, string2) for string1, string2 in zip(strings1, strings2)]
+        self.assertEqual(list(self.hd.get_raw_scores(strings1, strings2)), raw_scores)
+        self.assertEqual(list(self.hd.get_raw_scores(strings1, [string.encode('utf-8') for string in strings2])),
+                         raw_scores)
+
+    def test_valid_input_raw_score_matrix(self):
+        self.assertEqual(self.hd.get_raw_score_matrix(['karolin', 'kathrin'],
+                                                      ['kerstin', 'karolin', 'kathrin']).tolist(),
+                         [[3, 0, 3], [4, 3, 0]])
+        self.assertEqual(self.hd.get_raw_score_matrix([b'0110', b'1111'], ['0000', '0110']).tolist(),
+                         [[2, 0], [4, 2]])
+        self.assertEqual(self.hd.get_raw_score_matrix(['1' * 70], ['0' * 70, '1' * 69 + '0']).tolist(), [[70, 1]])
+        self.assertEqual(self.hd.get_raw_score_matrix([], ['ab']).shape, (0, 1))
+
+    def test_valid_input_raw_score_matrix_match_raw_score(self):
+        for strings in (['0110' * 20, '1' * 80, '0' * 80, '01' * 40], [u'ábóc', u'áóóc', 'abcd', 'dcba']):
+            self.assertEqual(self.hd.get_raw_score_matrix(strings, strings[::-1]).tolist(),
+                             [[self.hd.get_raw_score(string1, string2) for string2 in strings[::-1]]
+                              for string1 in strings])
+
+    def test_valid_input_trailing_null_characters(self):
+        self.assertEqual(list(self.hd.get_raw_scores('a\x00', ['ab', 'a\x00', '\x00\x00'])), [1, 0, 1])
+        self.assertEqual(self.hd.get_raw_scores('a\x00', ['ab'])[0], self.hd.get_raw_score('a\x00', 'ab'))
+        self.assertEqual(self.hd.get_raw_score_matrix(['a\x00', b'\x00\x00'], ['ab', '\x00a']).tolist(),
+                         [[1, 2], [2, 1]])
+
+    @raises(ValueError)
+    def test_invalid_input_trailing_null_character_raw_scores(self):
+        self.hd.get_raw_scores(['a\x00'], ['a'])
+
+    @raises(TypeError)
+    def test_invalid_input1_raw_scores(self):
+        self.hd.get_raw_scores(None, ['a'])
+
+    @raises(TypeError)
+    def test_invalid_input2_raw_scores(self):
+        self.hd.get_raw_scores(['a'], ['b', None])
+
+    @raises(ValueError)
+    def test_invalid_input3_raw_scores(self):
+        self.hd.get_raw_scores(['ab', 'cd'], ['ab', 'cd', 'ef'])
+
+    @raises(ValueError)
+    def test_invalid_input4_raw_scores(self):
+        self.hd.get_raw_scores(['ab', 'cd'], ['ab', 'c'])
+
+    @raises(TypeError)
+    def test_invalid_input1_raw_score_matrix(self):
+        self.hd.get_raw_score_matrix(['a'], None)
+
+    @raises(ValueError)
+    def test_invalid_input2_raw_score_matrix(self):
+        self.hd.get_raw_score_matrix(['ab', 'cd'], ['abc'])
+
     @raises(ValueError)
     def test_invalid_input6_raw_score(self):
         self.hd.get_raw_score('ali', 'alex')
@@ -850,6 +1481,113 @@ class NeedlemanWunschTestCases(unittest.TestCase):
         self.assertEqual(self.nw.get_raw_score('dva', 'dáóva'), 1.0)
         self.assertEqual(self.nw.get_raw_score('dva', b'd\xc3\xa1\xc3\xb3va'), 1.0)
 
+    def test_valid_input_wide_chars(self):
+        # 2- and 4-byte code units are compared as code points
+        self.assertEqual(self.nw.get_raw_score('dĀa', 'dĀĀĀa'), 1.0)
+        self.assertEqual(self.nw.get_raw_score('d😀a', 'd😀😁😁a'), 1.0)
+        self.assertEqual(self.nw.get_raw_score('aāb', 'aȁb'), 2.0)
+        self.assertEqual(self.nw_with_params3.get_raw_score('GCĀTGCUĀ', 'GĀTTĀCĀ'), 2.5)
+
+    def test_valid_input_long_strings(self):
+        # the DP rows span the shorter string, whichever argument it is
+        self.assertEqual(self.nw.get_raw_score('ACGT' * 1500, 'ACGT' * 500), -2000.0)
+        self.assertEqual(self.nw.get_raw_score('ACGT' * 500, 'ACGT' * 1500), -2000.0)
+
+    def test_valid_input_substitution_matrix(self):
+        matrix = SubstitutionMatrix({(c, c): 1 for c in 'ACGTU'}, default=-1)
+        nw = NeedlemanWunsch(gap_cost=0.5, sim_func=matrix)
+        self.assertEqual(nw.get_raw_score('GCATGCUA', 'GATTACA'), 2.5)
+        matrix = SubstitutionMatrix([[1, -1], [-1, 1]], {'a': 0, 'A': 0, 'b': 1, 'B': 1}, default=-2)
+        nw = NeedlemanWunsch(sim_func=matrix)
+        self.assertEqual(nw.get_raw_score('abba', 'ABBA'), 4.0)
+        self.assertEqual(nw.get_raw_score('abxa', 'ABBA'), 1.0)
+        # characters outside of the alphabet score the default, even with themselves
+        self.assertEqual(nw.get_raw_score('ĀĂb', 'ĀĂB'), -3.0)
+
+    def test_valid_input_long_strings_sim_func(self):
+        nw = NeedlemanWunsch(sim_func=SubstitutionMatrix([[1, 0], [0, 1]], 'AC'))
+        self.assertEqual(nw.get_raw_score('AC' * 1500, 'AC' * 500), -1000.0)
+        self.assertEqual(NeedlemanWunsch(sim_func=self.sim_func).get_raw_score('AC' * 1500, 'AC' * 500),
+                         -1000.0)
+
+    def test_valid_input_sim_func_called_once_per_pair(self):
+        pairs = []
+        def sim_func(s1, s2):
+            pairs.append((s1, s2))
+            return 1 if s1 == s2 else -1
+        self.assertEqual(NeedlemanWunsch(gap_cost=0.5, sim_func=sim_func).get_raw_score('GCATGCUA', 'GATTACA'), 2.5)
+        self.assertEqual(sorted(pairs), sorted((c1, c2) for c1 in 'GCATU' for c2 in 'GATC'))
+
+    def test_banded_raw_score(self):
+        self.assertEqual(self.nw.get_banded_raw_score('dva', 'deeva', band=0), (1.0, True))
+        self.assertEqual(self.nw.get_banded_raw_score('', 'deeva', band=0), (-5.0, True))
+        self.assertEqual(self.nw.get_banded_raw_score('dva', 'deeva'), (1.0, True))
+        self.assertEqual(self.nw_with_params3.get_banded_raw_score('GCATGCUA', 'GATTACA', band=0), (2.5, False))
+        # the score within the band ties the bound on the alignments leaving it
+        self.assertEqual(self.nw_with_params3.get_banded_raw_score('GCATGCUA', 'GATTACA', band=1), (2.5, False))
+        self.assertEqual(self.nw_with_params3.get_banded_raw_score('GCATGCUA', 'GATTACA', band=2), (2.5, True))
+        self.assertEqual(self.nw_with_params3.get_banded_raw_score('GCATGCUA', 'GATTACA', min_score=2), (2.5, True))
+        # the band can not hold the best alignment, which is reported
+        nw = NeedlemanWunsch(gap_cost=0.25)
+        self.assertEqual(nw.get_raw_score('abcdefgh', 'ghabcdef'), 5.0)
+        self.assertEqual(nw.get_banded_raw_score('abcdefgh', 'ghabcdef', band=1), (0.0, False))
+        self.assertEqual(nw.get_banded_raw_score('abcdefgh', 'ghabcdef', band=2), (5.0, True))
+        self.assertEqual(nw.get_banded_raw_score('abcdefgh', 'ghabcdef', min_score=5), (5.0, True))
+        # no alignment scores min_score, the derived band does not hold the best one
+        self.assertEqual(nw.get_banded_raw_score('abcdefgh', 'ghabcdef', min_score=5.5), (0.0, False))
+        self.assertEqual(nw.get_banded_raw_score('abcdefgh', 'ghabcdef', band=100), (5.0, True))
+
+    def test_banded_raw_score_rounding(self):
+        # an alignment leaving the band scores the bound, which the score
+        # within the band ties up to rounding errors
+        matrix = SubstitutionMatrix([[0.3, 1.1, -0.1], [-0.3, -0.3, 0.3], [-0.3, 0.1, 0.7]], 'ACG', default=-0.3)
+        nw = NeedlemanWunsch(gap_cost=0.1, sim_func=matrix)
+        self.assertNotEqual(nw.get_banded_raw_score('C', 'CCACCAC', band=0)[0], nw.get_raw_score('C', 'CCACCAC'))
+        self.assertEqual(nw.get_banded_raw_score('C', 'CCACCAC', band=0)[1], False)
+        self.assertEqual(nw.get_banded_raw_score('C', 'CCACCAC', band=1), (nw.get_raw_score('C', 'CCACCAC'), True))
+
+    def test_banded_raw_score_long_strings(self):
+        string1 = 'ACGTTGCA' * 500
+        string2 = string1[:1000] + string1[1003:3000] + 'T' + string1[3000:]
+        self.assertEqual(self.nw.get_banded_raw_score(string1, string2, band=5), (3993.0, True))
+        self.assertEqual(self.nw.get_raw_score(string1, string2), 3993.0)
+        self.assertEqual(NeedlemanWunsch(sim_func=SubstitutionMatrix({(c, c): 1 for c in 'ACGT'}))
+                         .get_banded_raw_score(string1, string2, min_score=3900), (3993.0, True))
+
+    def test_raw_score_min_score(self):
+        self.assertEqual(self.nw.get_raw_score('dva', 'deeva', min_score=1), 1.0)
+        self.assertEqual(self.nw.get_raw_score('dva', 'deeva', min_score=1.5), float('-inf'))
+        self.assertEqual(self.nw.get_raw_score('', 'deeva', min_score=-5), -5.0)
+        self.assertEqual(self.nw.get_raw_score('', 'deeva', min_score=-4), float('-inf'))
+        self.assertEqual(self.nw_with_params3.get_raw_score('GCATGCUA', 'GATTACA', min_score=2.5), 2.5)
+        self.assertEqual(self.nw_with_params3.get_raw_score('GCATGCUA', 'GATTACA', min_score=3), float('-inf'))
+        for nw in [self.nw_with_params1, self.nw_with_params2, NeedlemanWunsch(gap_cost=0.25)]:
+            for string1, string2 in [('abcdefgh', 'ghabcdef'), ('dva', 'deeve'), ('GCATGCUA', 'GATTACA')]:
+                score = nw.get_raw_score(string1, string2)
+                self.assertEqual(nw.get_raw_score(string1, string2, min_score=score), score)
+                self.assertEqual(nw.get_raw_score(string1, string2, min_score=score + 0.01), float('-inf'))
+
+    def test_raw_score_min_score_long_strings(self):
+        string1 = 'ACGTTGCA' * 500
+        string2 = string1[:1000] + string1[1003:3000] + 'T' + string1[3000:]
+        self.assertEqual(self.nw.get_raw_score(string1, string2, min_score=3993), 3993.0)
+        self.assertEqual(self.nw.get_raw_score(string1, string2, min_score=3994), float('-inf'))
+        self.assertEqual(self.nw.get_raw_score(string1, 'GGCC' * 1000, min_score=3000), float('-inf'))
+        self.assertEqual(NeedlemanWunsch(sim_func=SubstitutionMatrix({(c, c): 1 for c in 'ACGT'}))
+                         .get_raw_score(string1, string2, min_score=3900), 3993.0)
+
+    @raises(ValueError)
+    def test_banded_raw_score_invalid_band(self):
+        self.nw.get_banded_raw_score('dva', 'deeva', band=-1)
+
+    @raises(ValueError)
+    def test_banded_raw_score_invalid_band_and_min_score(self):
+        self.nw.get_banded_raw_score('dva', 'deeva', band=1, min_score=1)
+
+    @raises(TypeError)
+    def test_banded_raw_score_invalid_input(self):
+        self.nw.get_banded_raw_score(None, 'deeva', band=1)
+
     @raises(TypeError)
     def test_invalid_input1_raw_score(self):
         self.nw.get_raw_score('a', None)
@@ -923,6 +1661,88 @@ class SmithWatermanTestCases(unittest.TestCase):
         self.assertEqual(self.sw.get_raw_score(b'\xc3\xb3\xc3\xa1t', b'c\xc3\xa1t'), 
                          2.0)
 
+    def test_valid_input_wide_chars(self):
+        # 2- and 4-byte code units are compared as code points
+        self.assertEqual(self.sw.get_raw_score('ĀĂt', 'cĂt'), 2.0)
+        self.assertEqual(self.sw.get_raw_score('😀😁t', 'c😁t'), 2.0)
+        self.assertEqual(self.sw.get_raw_score('aāb', 'aȁb'), 2.0)
+        self.assertEqual(self.sw_with_params4.get_raw_score('GCĀTĀGCU', 'GĀTTĀCĀ'), 6.5)
+
+    def test_valid_input_long_strings(self):
+        # the DP rows span the shorter string, whichever argument it is
+        self.assertEqual(self.sw.get_raw_score('ACGT' * 1500, 'ACGT' * 500), 2000.0)
+        self.assertEqual(self.sw.get_raw_score('ACGT' * 500, 'ACGT' * 1500), 2000.0)
+
+    def test_valid_input_diagonal_kernel(self):
+        # strings above the length cutoff are aligned by anti-diagonals, with
+        # exactly the same scores as the row by row DP
+        def smith_waterman(string1, string2, gap_cost, sim_func):
+            prev_row = [0] * (len(string2) + 1)
+            max_value = 0
+            for char1 in string1:
+                curr_row = [0]
+                for j, char2 in enumerate(string2):
+                    curr_row.append(max(0, prev_row[j] + sim_func(char1, char2), prev_row[j + 1] - gap_cost,
+                                        curr_row[j] - gap_cost))
+                    max_value = max(max_value, curr_row[-1])
+                prev_row = curr_row
+            return max_value
+        sim_func = lambda s1, s2: 0.3 if s1 == s2 else (0.7 if s1 < s2 else -1.1)
+        strings = ['ACGTTGCA' * 2, 'ACGTTGCAA' * 2, 'GATTACA' * 2 + 'CC', 'dĀĂva' * 20, 'd😀😁va' * 25]
+        for string1 in strings:
+            for string2 in strings + ['ACGT', 'aĀ😀']:
+                self.assertEqual(self.sw.get_raw_score(string1, string2),
+                                 smith_waterman(string1, string2, 1.0, lambda s1, s2: 1 if s1 == s2 else 0))
+                self.assertEqual(SmithWaterman(gap_cost=1.5, sim_func=self.sim_func).get_raw_score(string1, string2),
+                                 smith_waterman(string1, string2, 1.5, self.sim_func))
+                self.assertEqual(SmithWaterman(gap_cost=0.125, sim_func=sim_func).get_raw_score(string1, string2),
+                                 smith_waterman(string1, string2, 0.125, sim_func))
+
+    def test_valid_input_sim_func_argument_order(self):
+        sw = SmithWaterman(sim_func=lambda s1, s2: 2 if s1 == s2 else (1 if s1 == 'a' else -1))
+        self.assertEqual(sw.get_raw_score('ab', 'bbb'), 3.0)
+        self.assertEqual(sw.get_raw_score('bbb', 'ab'), 2.0)
+
+    def test_valid_input_substitution_matrix(self):
+        matrix = SubstitutionMatrix([[1.5 if i == j else 0.5 for j in range(5)] for i in range(5)], 'ACGTU',
+                                    default=0.5)
+        sw = SmithWaterman(gap_cost=1.4, sim_func=matrix)
+        self.assertEqual(sw.get_raw_score('GCATAGCU', 'GATTACA'), 6.5)
+        matrix = SubstitutionMatrix({('a', 'a'): 2, ('b', 'b'): 2, ('a', 'b'): 1}, default=-1)
+        self.assertEqual(SmithWaterman(sim_func=matrix).get_raw_score('ab', 'bbb'), 3.0)
+        self.assertEqual(SmithWaterman(sim_func=matrix).get_raw_score('bbb', 'ab'), 2.0)
+
+    def test_valid_input_sim_func_called_once_per_pair(self):
+        pairs = []
+        def sim_func(s1, s2):
+            pairs.append((s1, s2))
+            return 1.5 if s1 == s2 else 0.5
+        self.assertEqual(SmithWaterman(gap_cost=1.4, sim_func=sim_func).get_raw_score('GCATAGCU', 'GATTACA'), 6.5)
+        self.assertEqual(sorted(pairs), sorted((c1, c2) for c1 in 'GCATU' for c2 in 'GATC'))
+
+    def test_raw_score_min_score(self):
+        self.assertEqual(self.sw.get_raw_score('cat', 'hat', min_score=2), 2.0)
+        self.assertEqual(self.sw.get_raw_score('cat', 'hat', min_score=2.5), float('-inf'))
+        self.assertEqual(self.sw.get_raw_score('', 'hat', min_score=0), 0)
+        self.assertEqual(self.sw_with_params4.get_raw_score('GCATAGCU', 'GATTACA', min_score=6.5), 6.5)
+        self.assertEqual(self.sw_with_params4.get_raw_score('GCATAGCU', 'GATTACA', min_score=7), float('-inf'))
+        strings = ['ACGTTGCA' * 2, 'GATTACA' * 2 + 'CC', 'dva', 'dĀĂva' * 20]
+        for sw in [self.sw_with_params1, self.sw_with_params2, self.sw_with_params3]:
+            for string1 in strings:
+                for string2 in strings:
+                    score = sw.get_raw_score(string1, string2)
+                    self.assertEqual(sw.get_raw_score(string1, string2, min_score=score), score)
+                    self.assertEqual(sw.get_raw_score(string1, string2, min_score=score + 0.01), float('-inf'))
+
+    def test_raw_score_min_score_long_strings(self):
+        string1 = 'ACGTTGCA' * 500
+        string2 = 'TTTT' + string1[:1000] + string1[1003:3000] + 'T' + string1[3000:]
+        self.assertEqual(self.sw.get_raw_score(string1, string2, min_score=3993), 3993.0)
+        self.assertEqual(self.sw.get_raw_score(string1, string2, min_score=3994), float('-inf'))
+        self.assertEqual(self.sw.get_raw_score(string1, 'GGCC' * 1000, min_score=1000), 1000.0)
+        self.assertEqual(self.sw.get_raw_score(string1, 'GGCC' * 1000, min_score=1500), float('-inf'))
+        self.assertEqual(self.sw.get_raw_score(string1[:10], string2, min_score=10), 10.0)
+
     @raises(TypeError)
     def test_invalid_input1_raw_score(self):
         self.sw.get_raw_score('a', None)
@@ -948,6 +1768,59 @@ class SmithWatermanTestCases(unittest.TestCase):
         self.sw.get_raw_score(12, 12)
 
 
+class SubstitutionMatrixTestCases(unittest.TestCase):
+    def setUp(self):
+        self.dict_matrix = SubstitutionMatrix({('A', 'A'): 4, ('A', 'R'): -1, ('R', 'A'): -2, ('R', 'R'): 5},
+                                              default=-4)
+        self.array_matrix = SubstitutionMatrix([[4, -1], [-2, 5]], 'AR')
+
+    def test_get_score(self):
+        self.assertEqual(self.dict_matrix.get_score('A', 'A'), 4)
+        self.assertEqual(self.dict_matrix.get_score('A', 'R'), -1)
+        self.assertEqual(self.dict_matrix.get_score('R', 'A'), -2)
+        self.assertEqual(self.dict_matrix.get_score('A', 'W'), -4)
+        self.assertEqual(self.dict_matrix.get_score('W', 'W'), -4)
+        self.assertEqual(self.array_matrix.get_score('R', 'A'), -2)
+        self.assertEqual(self.array_matrix.get_score('R', 'R'), 5)
+        self.assertEqual(self.array_matrix.get_score('R', 'W'), 0)
+        self.assertEqual(self.array_matrix('A', 'R'), -1)
+        self.assertEqual(SubstitutionMatrix({(b'\xc3\xa1', 'a'): 1}).get_score('á', b'a'), 1)
+
+    def test_get_score_alphabet_mapping(self):
+        matrix = SubstitutionMatrix([[1, -1], [-1, 1]], {'a': 0, 'A': 0, 'b': 1}, default=-2)
+        self.assertEqual(matrix.get_score('a', 'A'), 1)
+        self.assertEqual(matrix.get_score('A', 'b'), -1)
+        self.assertEqual(matrix.get_score('B', 'b'), -2)
+
+    def test_get_default(self):
+        self.assertEqual(self.dict_matrix.get_default(), -4)
+        self.assertEqual(self.array_matrix.get_default(), 0)
+
+    @raises(ValueError)
+    def test_invalid_dict_key(self):
+        SubstitutionMatrix({'A': 1})
+
+    @raises(ValueError)
+    def test_invalid_dict_key_chars(self):
+        SubstitutionMatrix({('AR', 'A'): 1})
+
+    @raises(ValueError)
+    def test_invalid_array_shape(self):
+        SubstitutionMatrix([[1, 0, 0], [0, 1, 0]], 'AR')
+
+    @raises(ValueError)
+    def test_invalid_missing_alphabet(self):
+        SubstitutionMatrix([[1, 0], [0, 1]])
+
+    @raises(ValueError)
+    def test_invalid_alphabet_size(self):
+        SubstitutionMatrix([[1, 0], [0, 1]], 'ARN')
+
+    @raises(ValueError)
+    def test_invalid_alphabet_mapping(self):
+        SubstitutionMatrix([[1, 0], [0, 1]], {'A': 0, 'R': 2})
+
+
 class SoundexTestCases(unittest.TestCase):
     def setUp(self):
         self.sdx = Soundex()
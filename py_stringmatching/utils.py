@@ -51,6 +51,33 @@ def sim_check_tversky_parameters(alpha, beta):
             raise ValueError('Tversky parameters should be greater than or equal to zero')
 
 
+def sim_check_max_dist(max_dist):
+    if max_dist is not None and max_dist < 0:
+        raise ValueError('max_dist should be greater than or equal to zero')
+
+
+def sim_check_band(band, min_score):
+    if band is not None and min_score is not None:
+        raise ValueError('band and min_score should not be given together')
+    if band is not None and band < 0:
+        raise ValueError('band should be greater than or equal to zero')
+
+
+def sim_check_edit_costs(*costs):
+    for cost in costs:
+        if cost < 0:
+            raise ValueError('Edit operation costs should be greater than or equal to zero')
+
+
+def get_max_edit_cost(len1, len2, ins_cost, del_cost, sub_cost):
+    # cost of the cheapest of the two trivial edit scripts: deleting string1 and
+    # inserting string2, or substituting the shorter string and deleting or
+    # inserting the rest. No edit distance between the two strings exceeds it.
+    common_len = min(len1, len2)
+    return min(len1 * del_cost + len2 * ins_cost,
+               common_len * sub_cost + (len1 - common_len) * del_cost + (len2 - common_len) * ins_cost)
+
+
 def sim_check_for_exact_match(*args):
     if args[0] == args[1]:
         return True
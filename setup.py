@@ -87,6 +87,18 @@ if __name__ == "__main__":
                                        include_dirs=[]),
                   setuptools.Extension("py_stringmatching.similarity_measure.cython.cython_affine",
                                        ["py_stringmatching/similarity_measure/cython/cython_affine.c"],
+                                       include_dirs=[]),
+                  setuptools.Extension("py_stringmatching.similarity_measure.cython.cython_damerau_levenshtein",
+                                       ["py_stringmatching/similarity_measure/cython/cython_damerau_levenshtein.c"],
+                                       include_dirs=[]),
+                  setuptools.Extension("py_stringmatching.similarity_measure.cython.cython_substitution",
+                                       ["py_stringmatching/similarity_measure/cython/cython_substitution.c"],
+                                       include_dirs=[]),
+                  setuptools.Extension("py_stringmatching.similarity_measure.cython.cython_trie",
+                                       ["py_stringmatching/similarity_measure/cython/cython_trie.c"],
+                                       include_dirs=[]),
+                  setuptools.Extension("py_stringmatching.similarity_measure.cython.cython_editex",
+                                       ["py_stringmatching/similarity_measure/cython/cython_editex.c"],
                                        include_dirs=[])
 
                   ]
@@ -118,9 +130,7 @@ if __name__ == "__main__":
             'Operating System :: MacOS',
             'Operating System :: Microsoft :: Windows',
             'Programming Language :: Python',
-            'Programming Language :: Python :: 2',
             'Programming Language :: Python :: 3',
-            'Programming Language :: Python :: 2.7',
             'Programming Language :: Python :: 3.4',
             'Programming Language :: Python :: 3.5',
             'Programming Language :: Python :: 3.6',
@@ -130,6 +140,7 @@ if __name__ == "__main__":
             'Topic :: Software Development :: Libraries',
         ],
         packages=packages,
+        python_requires='>=3.4',
         install_requires=[
             'numpy >= 1.7.0',
             'six'